@@ -1,28 +1,349 @@
-"""In-memory cache with TTL (10 minutes). Thread-safe for single process."""
+"""
+TTL cache with pluggable backends.
+
+- 모든 캐시(연구 응답, 소스 단위 결과, 뉴스/유튜브 서비스 캐시)가 CACHE_BACKEND로 고른 백엔드 하나를 키 prefix로 나눠 쓴다.
+- memory: 프로세스 단위 TTLCache (바이트 예산 + LRU). Thread-safe for single process.
+- sqlite / redis: 여러 uvicorn 워커와 Streamlit 앱이 공유 (app.cache_backends).
+- async 경로는 aget / aset_ / arun을 쓴다. sqlite/redis 호출은 디스크·소켓 왕복이라 이벤트 루프 밖(스레드)에서 돈다.
+- memory 백엔드는 save_snapshot / load_snapshot으로 재시작·배포 사이에 내용을 이어간다 (warm start).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
 import time
-from typing import Any
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Protocol, TypeVar
+
+from app.config import (
+    CACHE_BACKEND,
+    CACHE_MAX_BYTES,
+    CACHE_PATH,
+    CACHE_PREFIX,
+    CACHE_SNAPSHOT_PATH,
+    CACHE_SWEEP_SECONDS,
+    CACHE_URL,
+)
+from app.utils import write_atomic
+
+logger = logging.getLogger(__name__)
 
 TTL_SECONDS = 600  # 10 minutes
+T = TypeVar("T")
+SNAPSHOT_MAGIC = b"ACRCACHE1\n"
+
+
+def approx_size(obj: Any) -> int:
+    """payload 크기 근사치(bytes). dict/list/tuple/set은 내부 원소까지 합산."""
+    seen: set[int] = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        oid = id(o)
+        if oid in seen:
+            continue
+        seen.add(oid)
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+    return total
+
+
+class CacheBackend(Protocol):
+    """캐시 백엔드 인터페이스. 값은 JSON 직렬화 가능한 payload."""
+
+    def get(self, key: str) -> Any | None: ...
+
+    def set_(self, key: str, value: Any, ttl_seconds: float) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def incr(self, key: str, ttl_seconds: float) -> int | None: ...
+
+    def clear(self) -> None: ...
+
+    def sweep(self) -> int: ...
+
+    def stats(self) -> dict[str, Any]: ...
+
+
+class TTLCache:
+    """
+    In-memory TTL + 최대 바이트 예산을 갖는 LRU 캐시. 예산을 넘으면 가장 오래 안 쓰인 항목부터 내보낸다.
+    항목 크기는 payload를 재귀적으로 훑어 근사하며(sys.getsizeof 합), 만료 항목은 sweep_interval마다
+    읽기/쓰기/stats 호출에서 한꺼번에 제거되므로 읽기만 많은 프로세스에서도 바이트 예산을 차지하고 남지 않는다.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES, sweep_interval: float = CACHE_SWEEP_SECONDS) -> None:
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._lock = threading.RLock()
+        # key -> (value, expires_monotonic, size)
+        self._data: OrderedDict[str, tuple[Any, float, int]] = OrderedDict()
+        self._bytes = 0
+        self._last_sweep = time.monotonic()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: str) -> Any | None:
+        """Return value if key exists and not expired; else None."""
+        now = time.monotonic()
+        with self._lock:
+            self._maybe_sweep(now)
+            item = self._data.get(key)
+            if item is None:
+                self._misses += 1
+                return None
+            val, expires, _ = item
+            if now > expires:
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return val
+
+    def set_(self, key: str, value: Any, ttl_seconds: float = TTL_SECONDS) -> None:
+        """Store value with TTL. 예산보다 큰 항목은 저장하지 않는다."""
+        size = approx_size(value) + sys.getsizeof(key)
+        now = time.monotonic()
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._data[key] = (value, now + ttl_seconds, size)
+            self._bytes += size
+            self._maybe_sweep(now)
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        """Remove key."""
+        with self._lock:
+            self._remove(key)
+
+    def incr(self, key: str, ttl_seconds: float) -> int | None:
+        """정수 카운터 +1. 키가 없거나 만료됐으면 1부터 시작하고 TTL은 처음 만들 때만 정한다."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or now > item[1] or not isinstance(item[0], int):
+                self._remove(key)
+                size = approx_size(1) + sys.getsizeof(key)
+                self._data[key] = (1, now + ttl_seconds, size)
+                self._bytes += size
+                self._evict()
+                return 1
+            value, expires, size = item
+            self._data[key] = (value + 1, expires, size)
+            return value + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def sweep(self) -> int:
+        """만료 항목을 모두 제거하고 제거 개수를 반환."""
+        with self._lock:
+            return self._sweep(time.monotonic())
+
+    def snapshot(self) -> list[tuple[str, Any, float]]:
+        """살아 있는 항목을 LRU 순서(오래된 것부터)로 (key, value, 남은 TTL 초) 목록으로 반환."""
+        now = time.monotonic()
+        with self._lock:
+            return [(k, v, expires - now) for k, (v, expires, _) in self._data.items() if expires > now]
+
+    def restore(self, entries: list[tuple[str, Any, float]]) -> int:
+        """snapshot() 목록을 다시 채운다. 이미 있는 키는 덮어쓰지 않는다."""
+        restored = 0
+        for key, value, remaining in entries:
+            if remaining <= 0:
+                continue
+            with self._lock:
+                if key in self._data:
+                    continue
+            self.set_(key, value, remaining)
+            restored += 1
+        return restored
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            self._maybe_sweep(time.monotonic())
+            return {
+                "backend": "memory",
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    def _remove(self, key: str) -> None:
+        item = self._data.pop(key, None)
+        if item is not None:
+            self._bytes -= item[2]
+
+    def _evict(self) -> None:
+        """바이트 예산을 넘는 만큼 가장 오래 안 쓰인 항목부터 내보낸다."""
+        while self._bytes > self.max_bytes and self._data:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self._evictions += 1
+
+    def _maybe_sweep(self, now: float) -> None:
+        if now - self._last_sweep >= self.sweep_interval:
+            self._sweep(now)
 
-_cache: dict[str, tuple[Any, float]] = {}
+    def _sweep(self, now: float) -> int:
+        expired = [k for k, (_, expires, _) in self._data.items() if now > expires]
+        for k in expired:
+            self._remove(k)
+        self._expirations += len(expired)
+        self._last_sweep = now
+        return len(expired)
+
+
+def make_backend(kind: str = CACHE_BACKEND) -> CacheBackend:
+    """CACHE_BACKEND 설정에 맞는 백엔드 생성."""
+    if kind == "sqlite":
+        from app.cache_backends import SQLiteCache
+
+        return SQLiteCache(CACHE_PATH, CACHE_MAX_BYTES, CACHE_SWEEP_SECONDS)
+    if kind == "redis":
+        from app.cache_backends import RedisCache
+
+        return RedisCache(CACHE_URL, prefix=CACHE_PREFIX)
+    return TTLCache()
+
+
+_cache: CacheBackend = make_backend()
 
 
 def get(key: str) -> Any | None:
     """Return value if key exists and not expired; else None."""
-    if key not in _cache:
-        return None
-    val, expires = _cache[key]
-    if time.monotonic() > expires:
-        del _cache[key]
-        return None
-    return val
+    return _cache.get(key)
 
 
-def set_(key: str, value: Any, ttl_seconds: int = TTL_SECONDS) -> None:
+def set_(key: str, value: Any, ttl_seconds: float = TTL_SECONDS) -> None:
     """Store value with TTL."""
-    _cache[key] = (value, time.monotonic() + ttl_seconds)
+    _cache.set_(key, value, ttl_seconds)
 
 
 def delete(key: str) -> None:
     """Remove key."""
-    _cache.pop(key, None)
+    _cache.delete(key)
+
+
+def incr(key: str, ttl_seconds: float) -> int | None:
+    """원자적 카운터 +1 (워커 공용 백엔드면 워커 간에도). 백엔드 장애면 None."""
+    return _cache.incr(key, ttl_seconds)
+
+
+def is_local() -> bool:
+    """프로세스 메모리 백엔드면 True (호출이 블로킹 I/O 없이 끝난다)."""
+    return isinstance(_cache, TTLCache)
+
+
+async def arun(fn: Callable[..., T], *args: Any) -> T:
+    """
+    캐시를 읽고 쓰는 동기 함수를 async 경로에서 호출. memory 백엔드면 그대로 부르고,
+    sqlite/redis면 스레드에서 돌려 백엔드 지연·장애(연결 timeout + 재연결)가 이벤트 루프를 멈추지 않게 한다.
+    """
+    if is_local():
+        return fn(*args)
+    return await asyncio.to_thread(fn, *args)
+
+
+async def aget(key: str) -> Any | None:
+    """get의 async 버전."""
+    return await arun(get, key)
+
+
+async def aset_(key: str, value: Any, ttl_seconds: float = TTL_SECONDS) -> None:
+    """set_의 async 버전."""
+    await arun(set_, key, value, ttl_seconds)
+
+
+def sweep() -> int:
+    """만료 항목 제거."""
+    return _cache.sweep()
+
+
+def stats() -> dict[str, Any]:
+    """hits / misses / evictions / expirations / bytes."""
+    return _cache.stats()
+
+
+def save_snapshot(path: str = CACHE_SNAPSHOT_PATH) -> int:
+    """
+    memory 백엔드 내용을 파일로 저장하고 저장한 항목 수를 반환.
+    포맷: SNAPSHOT_MAGIC + zlib(JSON). 만료 시각은 wall clock으로 적어 재시작 후에도 남은 TTL을 지킨다.
+    임시 파일에 쓴 뒤 os.replace로 바꾸므로 중간에 죽어도 이전 스냅샷은 남는다.
+    """
+    snapshot = getattr(_cache, "snapshot", None)
+    if snapshot is None or not path or path == "off":
+        return 0
+    from app.cache_backends import dumps
+
+    now = time.time()
+    entries = [[key, now + remaining, value] for key, value, remaining in snapshot()]
+    try:
+        body = dumps({"saved_at": now, "entries": entries})
+    except (TypeError, ValueError):
+        # JSON으로 표현할 수 없는 값이 섞여 있으면 그 항목만 빼고 저장한다. 로그는 저장마다 한 줄
+        kept: list[list[Any]] = []
+        skipped: list[str] = []
+        for entry in entries:
+            if _serializable(entry):
+                kept.append(entry)
+            else:
+                skipped.append(entry[0])
+        entries = kept
+        logger.warning(
+            "cache snapshot: JSON으로 저장할 수 없는 항목 %d개 건너뜀 (예: %s)", len(skipped), ", ".join(skipped[:3])
+        )
+        body = dumps({"saved_at": now, "entries": entries})
+    # 실패하면 쓰다 만 임시 파일은 지우고 OSError를 호출자에게 올린다 (이전 스냅샷은 그대로)
+    write_atomic(path, SNAPSHOT_MAGIC + body)
+    return len(entries)
+
+
+def _serializable(entry: list[Any]) -> bool:
+    from app.cache_backends import dumps
+
+    try:
+        dumps(entry)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def load_snapshot(path: str = CACHE_SNAPSHOT_PATH) -> int:
+    """save_snapshot 파일을 읽어 아직 만료되지 않은 항목만 복원. 파일이 없거나 깨졌으면 0."""
+    restore = getattr(_cache, "restore", None)
+    if restore is None or not path or path == "off":
+        return 0
+    from app.cache_backends import loads
+
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+        if not blob.startswith(SNAPSHOT_MAGIC):
+            return 0
+        payload = loads(blob[len(SNAPSHOT_MAGIC):])
+    except (OSError, ValueError, zlib.error):
+        return 0
+    now = time.time()
+    return restore([(key, value, expires - now) for key, expires, value in payload.get("entries") or []])
@@ -0,0 +1,393 @@
+"""
+Shared cache backends (프로세스 간 공유).
+
+- SQLiteCache: 로컬 파일 하나를 여러 uvicorn 워커/Streamlit이 함께 쓰는 diskcache 스타일 저장소
+- RedisCache : Redis 프로토콜(RESP) 클라이언트. 외부 의존성 없이 소켓으로 직접 통신하며
+               app.resp_standin(로컬 stand-in 서버)이나 실제 Redis 모두에 붙는다.
+
+두 백엔드 모두 값은 JSON + zlib으로 직렬화하며, 백엔드 장애는 예외 대신 캐시 miss로 처리한다.
+JSON으로 표현할 수 없는 값(datetime, numpy 스칼라, DataFrame 등)은 문자열로 바꾸지 않고 저장을 건너뛴다
+(읽을 때 타입이 바뀌어 돌아오지 않도록). 건너뛴 항목은 errors 카운터와 경고 로그로 남는다.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+def dumps(value: Any) -> bytes:
+    """JSON + zlib. JSON으로 표현할 수 없는 값이면 TypeError/ValueError."""
+    return zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+
+def loads(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def _skip_unserializable(key: str, error: Exception) -> None:
+    logger.warning("cache: %s 값을 JSON으로 저장할 수 없어 건너뜀 (%s)", key, error)
+
+
+class _Counters:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def hit(self) -> None:
+        with self.lock:
+            self.hits += 1
+
+    def miss(self) -> None:
+        with self.lock:
+            self.misses += 1
+
+    def error(self) -> None:
+        with self.lock:
+            self.errors += 1
+            self.misses += 1
+
+
+class SQLiteCache:
+    """
+    SQLite 파일 캐시. WAL 모드라 여러 프로세스가 동시에 읽고 쓸 수 있다.
+    바이트 예산을 넘으면 가장 오래 안 읽힌 항목부터 지운다 (accessed 컬럼 기준 LRU).
+    """
+
+    def __init__(self, path: str, max_bytes: int, sweep_interval: float = 60.0) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._local = threading.local()
+        self._counters = _Counters()
+        self._evictions = 0
+        self._last_sweep = 0.0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL,"
+                " size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Any | None:
+        try:
+            conn = self._conn()
+            row = conn.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None or row[1] < now:
+                self._counters.miss()
+                return None
+            conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+            self._counters.hit()
+            return loads(row[0])
+        except (sqlite3.Error, ValueError, zlib.error):
+            self._counters.error()
+            return None
+
+    def set_(self, key: str, value: Any, ttl_seconds: float) -> None:
+        try:
+            blob = dumps(value)
+        except (TypeError, ValueError) as e:
+            _skip_unserializable(key, e)
+            self._counters.error()
+            return
+        if len(blob) > self.max_bytes:
+            return
+        try:
+            now = time.time()
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires, size, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, now + ttl_seconds, len(blob), now),
+            )
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(conn, now)
+                self._evict(conn)
+        except sqlite3.Error:
+            self._counters.error()
+
+    def delete(self, key: str) -> None:
+        try:
+            self._conn().execute("DELETE FROM cache WHERE key = ?", (key,))
+        except sqlite3.Error:
+            self._counters.error()
+
+    def incr(self, key: str, ttl_seconds: float) -> int | None:
+        """카운터 +1. BEGIN IMMEDIATE로 쓰기 락을 잡아 여러 프로세스가 동시에 올려도 값이 빠지지 않는다."""
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = conn.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+                if row is None or row[1] < now:
+                    count, expires = 1, now + ttl_seconds
+                else:
+                    count, expires = int(loads(row[0])) + 1, row[1]
+                blob = dumps(count)
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires, size, accessed) VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, expires, len(blob), now),
+                )
+                conn.execute("COMMIT")
+                return count
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except (sqlite3.Error, ValueError, TypeError, zlib.error):
+            self._counters.error()
+            return None
+
+    def clear(self) -> None:
+        try:
+            self._conn().execute("DELETE FROM cache")
+        except sqlite3.Error:
+            self._counters.error()
+
+    def sweep(self) -> int:
+        try:
+            return self._sweep(self._conn(), time.time())
+        except sqlite3.Error:
+            self._counters.error()
+            return 0
+
+    def stats(self) -> dict[str, Any]:
+        try:
+            entries, total = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        except sqlite3.Error:
+            self._counters.error()
+            entries = total = None
+        return {
+            "backend": "sqlite",
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self._counters.hits,
+            "misses": self._counters.misses,
+            "evictions": self._evictions,
+            "errors": self._counters.errors,
+        }
+
+    def _sweep(self, conn: sqlite3.Connection, now: float) -> int:
+        self._last_sweep = now
+        return conn.execute("DELETE FROM cache WHERE expires < ?", (now,)).rowcount
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        victims: list[str] = []
+        for key, size in conn.execute("SELECT key, size FROM cache ORDER BY accessed ASC"):
+            victims.append(key)
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM cache WHERE key = ?", [(k,) for k in victims])
+        self._evictions += len(victims)
+
+
+class RespError(Exception):
+    """Redis 서버가 돌려준 에러 응답."""
+
+
+class _RespConnection:
+    """RESP2 소켓 연결 하나. 스레드마다 따로 쓴다."""
+
+    def __init__(self, host: str, port: int, password: str | None, db: int, timeout: float) -> None:
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+        if password:
+            self.command("AUTH", password)
+        if db:
+            self.command("SELECT", str(db))
+
+    def close(self) -> None:
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+    def command(self, *parts: str | bytes) -> Any:
+        return self.pipeline(parts)[0]
+
+    def pipeline(self, *commands: tuple[str | bytes, ...]) -> list[Any]:
+        """명령 여러 개를 한 번에 보내고 응답을 순서대로 읽는다 (왕복 한 번)."""
+        out: list[bytes] = []
+        for parts in commands:
+            out.append(b"*%d\r\n" % len(parts))
+            for p in parts:
+                b = p.encode("utf-8") if isinstance(p, str) else p
+                out.append(b"$%d\r\n%s\r\n" % (len(b), b))
+        self.sock.sendall(b"".join(out))
+        return [self._read() for _ in commands]
+
+    def _read(self) -> Any:
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode("utf-8")
+        if kind == b"-":
+            raise RespError(rest.decode("utf-8"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            n = int(rest)
+            if n < 0:
+                return None
+            data = self.reader.read(n + 2)
+            return data[:-2]
+        if kind == b"*":
+            n = int(rest)
+            if n < 0:
+                return None
+            return [self._read() for _ in range(n)]
+        raise ConnectionError(f"unexpected RESP reply: {line!r}")
+
+
+class RedisCache:
+    """
+    Redis 프로토콜 캐시. TTL은 SET ... PX로 서버가 관리하고,
+    메모리 예산/eviction은 서버 설정(maxmemory, maxmemory-policy allkeys-lru)에 맡긴다.
+    """
+
+    def __init__(self, url: str, prefix: str = "acr:", timeout: float = 2.0) -> None:
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int((parsed.path or "/0").lstrip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self._local = threading.local()
+        self._counters = _Counters()
+
+    def _conn(self) -> _RespConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _RespConnection(self.host, self.port, self.password, self.db, self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _command(self, *parts: str | bytes) -> Any:
+        """한 번 재연결 후 재시도 (멱등 명령만). 그래도 실패하면 예외."""
+        try:
+            return self._conn().command(*parts)
+        except (OSError, ConnectionError):
+            self._reset()
+            return self._conn().command(*parts)
+
+    def _reset(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
+    def get(self, key: str) -> Any | None:
+        try:
+            blob = self._command("GET", self.prefix + key)
+        except (OSError, ConnectionError, RespError):
+            self._reset()
+            self._counters.error()
+            return None
+        if blob is None:
+            self._counters.miss()
+            return None
+        try:
+            value = loads(blob)
+        except (ValueError, zlib.error):
+            self._counters.error()
+            return None
+        self._counters.hit()
+        return value
+
+    def set_(self, key: str, value: Any, ttl_seconds: float) -> None:
+        try:
+            blob = dumps(value)
+        except (TypeError, ValueError) as e:
+            _skip_unserializable(key, e)
+            self._counters.error()
+            return
+        try:
+            self._command("SET", self.prefix + key, blob, "PX", str(max(1, int(ttl_seconds * 1000))))
+        except (OSError, ConnectionError, RespError):
+            self._reset()
+            self._counters.error()
+
+    def delete(self, key: str) -> None:
+        try:
+            self._command("DEL", self.prefix + key)
+        except (OSError, ConnectionError, RespError):
+            self._reset()
+            self._counters.error()
+
+    def incr(self, key: str, ttl_seconds: float) -> int | None:
+        """
+        MULTI / SET NX PX / INCR / EXEC를 한 번에 보낸다. 만료는 키를 처음 만들 때만 걸리고, 만료 없는 카운터가
+        남을 틈이 없다. 응답을 못 받았을 때 두 번 세지 않도록 재연결·재시도는 하지 않는다.
+        """
+        name = self.prefix + key
+        try:
+            replies = self._conn().pipeline(
+                ("MULTI",),
+                ("SET", name, "0", "NX", "PX", str(max(1, int(ttl_seconds * 1000)))),
+                ("INCR", name),
+                ("EXEC",),
+            )
+            return int(replies[-1][1])
+        except (OSError, ConnectionError, RespError, TypeError, ValueError, IndexError):
+            self._reset()
+            self._counters.error()
+            return None
+
+    def clear(self) -> None:
+        try:
+            self._command("FLUSHDB")
+        except (OSError, ConnectionError, RespError):
+            self._reset()
+            self._counters.error()
+
+    def sweep(self) -> int:
+        # 만료는 서버가 처리
+        return 0
+
+    def stats(self) -> dict[str, Any]:
+        try:
+            entries = self._command("DBSIZE")
+        except (OSError, ConnectionError, RespError):
+            self._reset()
+            entries = None
+        return {
+            "backend": "redis",
+            "entries": entries,
+            "hits": self._counters.hits,
+            "misses": self._counters.misses,
+            "errors": self._counters.errors,
+        }
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+import tempfile
 from typing import Optional
 
 
@@ -23,3 +24,142 @@ NEWS_API_KEY = _get_env("NEWS_API_KEY")
 # NAVER 뉴스 검색 API (한글 뉴스)
 NAVER_CLIENT_ID = _get_env("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = _get_env("NAVER_CLIENT_SECRET")
+
+
+def _get_float_env(name: str, default: float) -> float:
+    value = _get_env(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _get_int_env(name: str, default: int) -> int:
+    value = _get_env(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def _get_bool_env(name: str, default: bool = False) -> bool:
+    value = _get_env(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+# 소스별 응답 대기 한도(초). 초과한 소스는 meta.errors에 timeout으로 기록하고 나머지 결과만 반환.
+SOURCE_TIMEOUT_SECONDS = _get_float_env("SOURCE_TIMEOUT_SECONDS", 20.0)
+SOURCE_TIMEOUTS: dict[str, float] = {
+    source: _get_float_env(f"{source.upper()}_TIMEOUT_SECONDS", SOURCE_TIMEOUT_SECONDS)
+    for source in ("dart", "sec", "financials", "dart_financials", "youtube", "papers", "news")
+}
+
+# 공용 HTTP 커넥션 풀 (httpx.AsyncClient, 이벤트 루프 단위)
+HTTP_MAX_CONNECTIONS = _get_int_env("HTTP_MAX_CONNECTIONS", 200)
+HTTP_MAX_KEEPALIVE = _get_int_env("HTTP_MAX_KEEPALIVE", 40)
+
+# /api/research/multi: 한 요청 안에서 동시에 실행할 검색어 수
+MULTI_MAX_CONCURRENT_QUERIES = _get_int_env("MULTI_MAX_CONCURRENT_QUERIES", 4)
+# /api/research/multi daily_only: DART 종목이 이 수 이상이면 시장 전체 공시목록을 한 번 받아 종목별로 나눠 쓴다
+DART_DAILY_MARKET_MIN_COMPANIES = _get_int_env("DART_DAILY_MARKET_MIN_COMPANIES", 3)
+
+
+def _parse_host_limits(raw: Optional[str]) -> dict[str, int]:
+    """"data.sec.gov=4,openapi.naver.com=2" 형식을 {host: limit}로 변환."""
+    limits: dict[str, int] = {}
+    for part in (raw or "").split(","):
+        host, sep, value = part.partition("=")
+        if not sep:
+            continue
+        try:
+            limits[host.strip().lower()] = int(value)
+        except ValueError:
+            continue
+    return limits
+
+
+# upstream host당 동시 요청 수 (프로세스 단위). HOST_INFLIGHT_LIMITS로 host별 개별 지정.
+MAX_INFLIGHT_PER_HOST = _get_int_env("MAX_INFLIGHT_PER_HOST", 8)
+HOST_INFLIGHT_LIMITS = {
+    "www.sec.gov": 4,
+    "data.sec.gov": 4,
+    **_parse_host_limits(_get_env("HOST_INFLIGHT_LIMITS")),
+}
+
+# SEC company_tickers.json 로컬 인덱스: 디스크 사본 경로("off"면 메모리만)와 조건부 GET 갱신 주기(초)
+SEC_TICKERS_PATH = _get_env("SEC_TICKERS_PATH") or os.path.join(tempfile.gettempdir(), "ac-research-sec-tickers.json")
+SEC_TICKERS_REFRESH_SECONDS = _get_float_env("SEC_TICKERS_REFRESH_SECONDS", 24 * 60 * 60)
+
+# DART 공시대상회사(corpCode.xml) 인덱스 디스크 사본 경로("off"면 메모리만)와 갱신 주기(초)
+DART_CORPS_PATH = _get_env("DART_CORPS_PATH") or os.path.join(tempfile.gettempdir(), "ac-research-dart-corps.json")
+DART_CORPS_REFRESH_SECONDS = _get_float_env("DART_CORPS_REFRESH_SECONDS", 24 * 60 * 60)
+
+# CIK별 EDGAR submissions 컬럼 캐시 TTL(초). 10-K/10-Q/8-K 선택과 daily_only 요청이 같은 payload를 재사용
+SEC_SUBMISSIONS_TTL_SECONDS = _get_int_env("SEC_SUBMISSIONS_TTL_SECONDS", 15 * 60)
+# daily_only용 EDGAR latest filings 피드 갱신 주기(초). daily index가 아직 없을 때의 재확인 주기도 같다
+SEC_CURRENT_FEED_TTL_SECONDS = _get_int_env("SEC_CURRENT_FEED_TTL_SECONDS", 5 * 60)
+# EDGAR bulk submissions.zip 로컬 저장소(app.services.sec_bulk)와, SEC 조회를 저장소만으로 하는 오프라인 모드
+SEC_BULK_PATH = _get_env("SEC_BULK_PATH") or os.path.join(tempfile.gettempdir(), "ac-research-sec-bulk")
+SEC_OFFLINE = _get_bool_env("SEC_OFFLINE")
+# submissions overflow 페이지(filings.files)는 과거 구간이라 바뀌지 않으므로 길게 캐시
+SEC_OVERFLOW_TTL_SECONDS = _get_int_env("SEC_OVERFLOW_TTL_SECONDS", 30 * 24 * 60 * 60)
+# XBRL companyfacts(재무 수치) 캐시. 분기 보고 때만 바뀌므로 submissions보다 길게
+SEC_FACTS_TTL_SECONDS = _get_int_env("SEC_FACTS_TTL_SECONDS", 6 * 60 * 60)
+# XBRL frames(전 제출사 개념·기간별 값) 캐시. 늦게 제출하는 회사가 붙으므로 하루 단위로 갱신
+SEC_FRAMES_TTL_SECONDS = _get_int_env("SEC_FRAMES_TTL_SECONDS", 24 * 60 * 60)
+# DART 주요계정/전체 재무제표 캐시 ((회사, 사업연도, 보고서) 단위). 제출 후 거의 바뀌지 않는다
+DART_FINANCIALS_TTL_SECONDS = _get_int_env("DART_FINANCIALS_TTL_SECONDS", 24 * 60 * 60)
+# SEC 문서 로컬 저장소(gzip, 내용 해시 주소). filing 문서는 바뀌지 않으므로 만료 없이 보관
+SEC_DOCS_PATH = _get_env("SEC_DOCS_PATH") or os.path.join(tempfile.gettempdir(), "ac-research-sec-docs")
+# SEC fair access 정책: 초당 10건 이하. 프로세스의 모든 SEC 요청이 이 token bucket 하나를 쓴다.
+# SEC_RATE_LIMIT_SHARED=1이면 캐시 백엔드(sqlite/redis) 카운터로 워커 전체 합계도 제한
+SEC_MAX_REQUESTS_PER_SECOND = _get_float_env("SEC_MAX_REQUESTS_PER_SECOND", 10.0)
+SEC_RATE_LIMIT_SHARED = _get_bool_env("SEC_RATE_LIMIT_SHARED")
+# 429/5xx/연결 오류 재시도 횟수와 지수 backoff(초). Retry-After가 있으면 그 값을 따른다 (상한 SEC_BACKOFF_MAX_SECONDS)
+SEC_MAX_RETRIES = _get_int_env("SEC_MAX_RETRIES", 3)
+SEC_BACKOFF_BASE_SECONDS = _get_float_env("SEC_BACKOFF_BASE_SECONDS", 0.5)
+SEC_BACKOFF_MAX_SECONDS = _get_float_env("SEC_BACKOFF_MAX_SECONDS", 30.0)
+SEC_DOWNLOAD_CONCURRENCY = _get_int_env("SEC_DOWNLOAD_CONCURRENCY", 4)
+
+# 소스 단위 결과 캐시 TTL(초). 공시는 수 시간, 뉴스는 수 분. <SOURCE>_CACHE_TTL_SECONDS로 개별 지정.
+SOURCE_CACHE_TTL_SECONDS = _get_int_env("SOURCE_CACHE_TTL_SECONDS", 600)
+_DEFAULT_SOURCE_CACHE_TTLS = {
+    "sec": 3 * 60 * 60,
+    "dart": 3 * 60 * 60,
+    "financials": 6 * 60 * 60,
+    "dart_financials": 6 * 60 * 60,
+    "youtube": 6 * 60 * 60,
+    "papers": 24 * 60 * 60,
+    "news": 10 * 60,
+}
+SOURCE_CACHE_TTLS: dict[str, int] = {
+    source: _get_int_env(f"{source.upper()}_CACHE_TTL_SECONDS", ttl)
+    for source, ttl in _DEFAULT_SOURCE_CACHE_TTLS.items()
+}
+# daily_only=True 요청의 소스 캐시 TTL 상한
+DAILY_CACHE_TTL_SECONDS = _get_int_env("DAILY_CACHE_TTL_SECONDS", 30 * 60)
+# TTL이 지난 소스 결과를 즉시 돌려주고 백그라운드에서 갱신하는 구간(초, stale-while-revalidate)
+SOURCE_STALE_SECONDS = _get_int_env("SOURCE_STALE_SECONDS", 60 * 60)
+# upstream 실패/timeout 시 대신 돌려줄 수 있는 오래된 결과의 보관 구간(초, stale-if-error)
+SOURCE_STALE_IF_ERROR_SECONDS = _get_int_env("SOURCE_STALE_IF_ERROR_SECONDS", 24 * 60 * 60)
+
+# 프로세스 캐시 메모리 예산(bytes, 근사치)과 만료 항목 sweep 주기(초)
+CACHE_MAX_BYTES = _get_int_env("CACHE_MAX_BYTES", 256 * 1024 * 1024)
+CACHE_SWEEP_SECONDS = _get_float_env("CACHE_SWEEP_SECONDS", 60.0)
+
+# 캐시 백엔드: memory(프로세스 단위, 기본) | sqlite(로컬 파일 공유) | redis(Redis 프로토콜 서버 공유)
+CACHE_BACKEND = (_get_env("CACHE_BACKEND") or "memory").lower()
+CACHE_PATH = _get_env("CACHE_PATH") or os.path.join(tempfile.gettempdir(), "ac-research-cache.sqlite3")
+CACHE_URL = _get_env("CACHE_URL") or "redis://127.0.0.1:6379/0"
+CACHE_PREFIX = _get_env("CACHE_PREFIX") or "acr:"
+
+# memory 백엔드 warm-start 스냅샷: 종료 시(그리고 주기적으로) 저장하고 시작 시 남은 TTL대로 복원.
+# Render 등에서는 영구 디스크 경로를 지정. "off"면 사용 안 함, 주기 0이면 종료 시에만 저장.
+CACHE_SNAPSHOT_PATH = _get_env("CACHE_SNAPSHOT_PATH") or os.path.join(tempfile.gettempdir(), "ac-research-cache.snapshot")
+CACHE_SNAPSHOT_SECONDS = _get_float_env("CACHE_SNAPSHOT_SECONDS", 300.0)
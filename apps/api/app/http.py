@@ -0,0 +1,171 @@
+"""
+Outbound HTTP helpers shared by services.
+
+- 동기: 프로세스 공용 requests.Session (keep-alive 커넥션 풀) + host별 동시 요청 제한
+- 비동기: 이벤트 루프당 하나의 httpx.AsyncClient (keep-alive, HTTP/2 가능 시 사용) + host별 동시 요청 제한
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator
+from urllib.parse import urlparse
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.config import (
+    HOST_INFLIGHT_LIMITS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+    MAX_INFLIGHT_PER_HOST,
+)
+
+try:
+    import h2  # noqa: F401  (httpx[http2])
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_slots: dict[str, threading.BoundedSemaphore] = {}
+_slots_lock = threading.Lock()
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def host_of(url_or_host: str) -> str:
+    """URL이면 netloc을, host 문자열이면 그대로 소문자로 반환."""
+    value = (url_or_host or "").strip()
+    if "://" in value:
+        value = urlparse(value).netloc
+    return value.lower()
+
+
+def _host_limit(host: str) -> int:
+    return max(1, HOST_INFLIGHT_LIMITS.get(host, MAX_INFLIGHT_PER_HOST))
+
+
+def _slot(host: str) -> threading.BoundedSemaphore:
+    with _slots_lock:
+        sem = _slots.get(host)
+        if sem is None:
+            sem = threading.BoundedSemaphore(_host_limit(host))
+            _slots[host] = sem
+        return sem
+
+
+@contextmanager
+def host_slot(url_or_host: str) -> Iterator[None]:
+    """
+    같은 upstream host로 나가는 동시 요청 수를 제한한다.
+    다중 검색어를 병렬로 돌려도 host별 in-flight 요청은 설정값을 넘지 않는다.
+    """
+    sem = _slot(host_of(url_or_host))
+    sem.acquire()
+    try:
+        yield
+    finally:
+        sem.release()
+
+
+def get_session() -> requests.Session:
+    """프로세스 공용 requests.Session. 요청마다 TCP+TLS를 새로 맺지 않고 커넥션을 재사용한다."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=MAX_INFLIGHT_PER_HOST * 2)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+class UpstreamError(RuntimeError):
+    """
+    upstream 응답 에러 (소스 이름 + 상태 코드).
+    httpx/requests의 HTTP 에러는 메시지에 요청 URL을 쿼리스트링째 담는데, DART처럼 API 키를 쿼리로만 받는 곳이 있어
+    응답(meta.errors)·캐시로 나갈 수 있는 에러는 이 예외로 바꿔 올린다.
+    """
+
+    def __init__(self, source: str, status_code: int | None = None, detail: str = "") -> None:
+        self.source = source
+        self.status_code = status_code
+        message = f"{source} returned HTTP {status_code}" if status_code is not None else f"{source} request failed"
+        super().__init__(f"{message}: {detail}" if detail else message)
+
+
+def raise_for_status(resp: httpx.Response | requests.Response, source: str) -> None:
+    """resp.raise_for_status() 대신. 4xx/5xx면 URL 없는 UpstreamError."""
+    if resp.status_code >= 400:
+        raise UpstreamError(source, resp.status_code)
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """공용 세션으로 GET (host별 동시 요청 제한 포함). raise_for_status는 호출자가 판단."""
+    with host_slot(url):
+        return get_session().get(url, **kwargs)
+
+
+class _LoopState:
+    """이벤트 루프마다 AsyncClient와 host 세마포어를 따로 둔다 (루프 간 공유 불가)."""
+
+    def __init__(self) -> None:
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            ),
+            follow_redirects=True,
+        )
+        self.slots: dict[str, asyncio.Semaphore] = {}
+
+
+_loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+
+def _loop_state() -> _LoopState:
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        state = _LoopState()
+        _loop_states[loop] = state
+    return state
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프의 공용 httpx.AsyncClient."""
+    return _loop_state().client
+
+
+@asynccontextmanager
+async def async_host_slot(url_or_host: str) -> AsyncIterator[None]:
+    """host_slot의 asyncio 버전."""
+    state = _loop_state()
+    host = host_of(url_or_host)
+    sem = state.slots.get(host)
+    if sem is None:
+        sem = asyncio.Semaphore(_host_limit(host))
+        state.slots[host] = sem
+    async with sem:
+        yield
+
+
+async def aget(url: str, **kwargs: Any) -> httpx.Response:
+    """공용 AsyncClient로 GET (host별 동시 요청 제한 포함). raise_for_status는 호출자가 판단."""
+    async with async_host_slot(url):
+        return await get_async_client().get(url, **kwargs)
+
+
+async def aclose() -> None:
+    """현재 루프의 AsyncClient를 닫는다 (앱 종료 시)."""
+    loop = asyncio.get_running_loop()
+    state = _loop_states.pop(loop, None)
+    if state is not None:
+        await state.client.aclose()
@@ -1,27 +1,63 @@
 """
 AC-research API. FastAPI app.
-Endpoints: GET /health, POST /api/research, GET /api/research/{slug}/excel
+Endpoints: GET /health, GET /api/metrics, POST /api/research, POST /api/research/multi,
+POST /api/research/stream, POST /api/research/multi/stream, GET /api/research/{slug}/excel
 Production: Render (port from PORT env, default 10000). CORS via ALLOWED_ORIGINS.
 """
 from __future__ import annotations
 
+import asyncio
 import io
+import logging
 import os
 import time
-from typing import Any
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Literal
+from urllib.parse import quote
 
+import httpx
 import pandas as pd
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from pydantic import BaseModel
 
-from app.cache import get as cache_get, set_ as cache_set
-from app.schemas import ErrorItem, MultiResearchRequest, ResearchMeta, ResearchRequest, ResearchResponse, ResearchResults
-from app.utils import is_korea_stock, slugify
+from app import http, ratelimit
+from app.cache import aget as acache_get, aset_ as acache_set, get as cache_get, load_snapshot, save_snapshot
+from app.cache import stats as cache_stats
+from app.config import (
+    CACHE_SNAPSHOT_SECONDS,
+    DAILY_CACHE_TTL_SECONDS,
+    DART_API_KEY,
+    DART_CORPS_REFRESH_SECONDS,
+    DART_DAILY_MARKET_MIN_COMPANIES,
+    MULTI_MAX_CONCURRENT_QUERIES,
+    SOURCE_CACHE_TTL_SECONDS,
+    SOURCE_CACHE_TTLS,
+    SOURCE_STALE_IF_ERROR_SECONDS,
+    SOURCE_STALE_SECONDS,
+    SOURCE_TIMEOUT_SECONDS,
+    SOURCE_TIMEOUTS,
+)
+from app.schemas import (
+    ErrorItem,
+    MultiResearchRequest,
+    ResearchDoneEvent,
+    ResearchMeta,
+    ResearchRequest,
+    ResearchResponse,
+    ResearchResults,
+    ResearchSourceEvent,
+)
+from app.singleflight import AsyncSingleFlight
+from app.utils import has_hangul, is_korea_stock, slugify
 
 # 리포트 스크리닝
 from app.services.reports import screen_reports
 
+logger = logging.getLogger(__name__)
+
 # CORS: 배포 테스트용 "*" 허용. Production에서 ALLOWED_ORIGINS로 제한 권장.
 _origins_str = os.getenv("ALLOWED_ORIGINS", "").strip()
 if _origins_str:
@@ -29,7 +65,50 @@ if _origins_str:
 else:
     _allow_origins = ["*"]  # 임시 허용 (배포 테스트용)
 
-app = FastAPI(title="AC-research API", version="1.0.0", debug=os.getenv("ENV") != "production")
+
+async def _save_snapshot() -> None:
+    """캐시 스냅샷 저장. 실패(디스크, 직렬화)는 로그만 남기고 다음 주기/종료 처리를 계속한다."""
+    try:
+        await asyncio.to_thread(save_snapshot)
+    except Exception:
+        logger.exception("cache snapshot save failed")
+
+
+async def _snapshot_loop() -> None:
+    while True:
+        await asyncio.sleep(CACHE_SNAPSHOT_SECONDS)
+        await _save_snapshot()
+
+
+async def _dart_corps_loop() -> None:
+    """DART 회사 인덱스를 시작 시 채우고, 이후 DART_CORPS_REFRESH_SECONDS가 지날 때마다 갱신 (요청 경로에서 zip을 받지 않도록)."""
+    from app.services.dart import arefresh_corp_index
+
+    while True:
+        try:
+            await arefresh_corp_index()
+        except Exception:
+            logger.warning("DART corpCode refresh failed", exc_info=True)
+        await asyncio.sleep(min(DART_CORPS_REFRESH_SECONDS, 60 * 60))
+
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # 이전 프로세스가 남긴 캐시 스냅샷으로 warm start (memory 백엔드만)
+    await asyncio.to_thread(load_snapshot)
+    snapshots = asyncio.ensure_future(_snapshot_loop()) if CACHE_SNAPSHOT_SECONDS > 0 else None
+    corps = asyncio.ensure_future(_dart_corps_loop()) if DART_API_KEY else None
+    yield
+    if snapshots is not None:
+        snapshots.cancel()
+    if corps is not None:
+        corps.cancel()
+    await _save_snapshot()
+    # 공용 AsyncClient(keep-alive 커넥션 풀) 정리
+    await http.aclose()
+
+
+app = FastAPI(title="AC-research API", version="1.0.0", debug=os.getenv("ENV") != "production", lifespan=_lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=_allow_origins,
@@ -38,6 +117,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 같은 캐시 키의 동시 요청 합치기 (서비스 함수 단위 합치기는 app.singleflight의 데코레이터)
+_research_flight = AsyncSingleFlight()
+
 
 def _normalize_item(source: str, raw: dict[str, Any]) -> dict[str, Any]:
     """Add title, url, date, snippet for frontend. Keep raw fields."""
@@ -76,94 +158,422 @@ def health():
     return {"ok": True}
 
 
-def _run_research(
+@app.get("/api/metrics")
+def metrics():
+    """프로세스 캐시 통계 (hits, misses, evictions, bytes 등)와 upstream 속도 제한 카운터."""
+    return {"cache": cache_stats(), "rate_limits": ratelimit.stats()}
+
+
+async def _fetch_dart(query: str, daily_only: bool) -> dict[str, Any]:
+    from app.services.dart import acollect_dart_reports
+    rows = await acollect_dart_reports(query, daily_only=daily_only)
+    return {"items": [_normalize_item("dart", r) for r in rows], "raw": rows}
+
+
+async def _fetch_sec(query: str, daily_only: bool, deep_history: bool = False) -> dict[str, Any]:
+    from app.services.sec import acollect_sec_links
+    rows = await acollect_sec_links(query.upper(), daily_only=daily_only, deep_history=deep_history)
+    return {"items": [_normalize_item("sec", r) for r in rows], "raw": rows}
+
+
+async def _fetch_financials(query: str) -> dict[str, list[Any]] | None:
+    from app.services.sec_financials import acollect_sec_financials
+    try:
+        series = await acollect_sec_financials(query.upper())
+    except ValueError:
+        # 티커가 아닌 키워드 검색. CIK를 못 찾은 에러는 sec 소스가 이미 알려준다.
+        return None
+    return series if series.get("period") else None
+
+
+async def _fetch_dart_financials(code: str) -> dict[str, list[Any]] | None:
+    from app.services.dart_financials import acollect_dart_financials
+    table = await acollect_dart_financials(code)
+    return table if table.get("period") else None
+
+
+async def _fetch_youtube(query: str, max_results: int, daily_only: bool) -> list[dict[str, Any]]:
+    from app.services.youtube import asearch_youtube_videos
+    rows = await asearch_youtube_videos(query, max_results=max_results, daily_only=daily_only)
+    return [_normalize_item("youtube", r) for r in rows]
+
+
+async def _fetch_papers(query: str, max_results: int) -> list[dict[str, Any]]:
+    from app.services.papers import asearch_papers
+    rows = await asearch_papers(query, max_results=max_results)
+    return [_normalize_item("papers", r) for r in rows]
+
+
+async def _fetch_news(query: str, max_results: int, daily_only: bool) -> list[dict[str, Any]]:
+    from app.services.news import asearch_news_articles
+    rows = await asearch_news_articles(query, max_results=max_results, daily_only=daily_only)
+    return [_normalize_item("news", r) for r in rows]
+
+
+# 스트리밍 이벤트/에러 정렬 순서
+_SOURCE_ORDER = ("sec", "dart", "financials", "dart_financials", "youtube", "papers", "news", "reports")
+
+# (source, value, error, elapsed_ms, cache) — cache: "hit" | "stale" | "miss"
+SourceOutcome = tuple[str, Any, ErrorItem | None, float, str]
+
+# (fresh TTL, stale-while-revalidate 구간, stale-if-error 구간) 초 단위
+CachePolicy = tuple[int, int, int]
+
+# (results, errors, stale 소스 목록)
+Assembled = tuple[ResearchResults, list[ErrorItem], list[str]]
+
+# (공시 소스 "sec" | "dart", 그 소스에 넘길 티커/종목코드)
+Route = tuple[str, str]
+
+# 백그라운드 갱신 task 참조 보관 (GC 방지) + 같은 키 갱신 합치기
+_background_tasks: set[asyncio.Task] = set()
+_refresh_flight = AsyncSingleFlight()
+
+
+def _source_cache_key(source: str, query: str, **params: Any) -> str:
+    """
+    소스 단위 캐시 키: (source, 정규화된 query, 파라미터).
+    단일/다중 검색, 스트리밍이 같은 키를 쓰므로 겹치는 검색어는 서로의 결과를 재사용한다.
+    """
+    q = " ".join((query or "").strip().lower().split())
+    extra = ":".join(f"{k}={params[k]}" for k in sorted(params))
+    return f"source:{source}:{q}:{extra}" if extra else f"source:{source}:{q}"
+
+
+def _source_policy(source: str, daily_only: bool) -> CachePolicy:
+    ttl = SOURCE_CACHE_TTLS.get(source, SOURCE_CACHE_TTL_SECONDS)
+    swr = SOURCE_STALE_SECONDS
+    if daily_only:
+        # 최근 24시간 모드는 신선도가 목적이므로 TTL/stale 구간에 상한을 둔다.
+        ttl = min(ttl, DAILY_CACHE_TTL_SECONDS)
+        swr = min(swr, DAILY_CACHE_TTL_SECONDS)
+    return ttl, swr, max(swr, SOURCE_STALE_IF_ERROR_SECONDS)
+
+
+def _is_empty(value: Any) -> bool:
+    if isinstance(value, dict):
+        if "items" in value:
+            return not value["items"]
+        return not any(value.values())
+    return not value
+
+
+async def _store_source(key: str, value: Any, policy: CachePolicy) -> None:
+    """
+    값과 저장 시각을 함께 넣고, 물리 TTL은 stale 구간까지 늘린다.
+    신선도(fresh/stale)는 읽을 때 저장 시각으로 판단한다.
+    """
+    ttl, _, stale_if_error = policy
+    await acache_set(key, {"v": value, "at": time.time()}, ttl + stale_if_error)
+
+
+def _error_message(e: Exception) -> str:
+    """
+    meta.errors에 실을 에러 메시지. 응답·research 캐시·엑셀로 그대로 나가므로 upstream 예외 문자열은 쓰지 않는다
+    (httpx 에러는 요청 URL을 쿼리스트링의 API 키째 담는다). 서비스가 직접 만든 UpstreamError/ValueError만 원문.
+    """
+    if isinstance(e, (http.UpstreamError, ValueError)):
+        return str(e)
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"upstream returned HTTP {e.response.status_code}"
+    if isinstance(e, httpx.RequestError):
+        return f"upstream request failed ({type(e).__name__})"
+    return f"internal error ({type(e).__name__})"
+
+
+async def _call_source(source: str, fn: Callable[..., Awaitable[Any]], *args: Any) -> tuple[Any, ErrorItem | None]:
+    """async 서비스 함수를 소스별 deadline까지만 기다린다."""
+    timeout = SOURCE_TIMEOUTS.get(source, SOURCE_TIMEOUT_SECONDS)
+    try:
+        return await asyncio.wait_for(fn(*args), timeout), None
+    except asyncio.TimeoutError:
+        return None, ErrorItem(source=source, message=f"timeout after {timeout:g}s")
+    except Exception as e:
+        return None, ErrorItem(source=source, message=_error_message(e))
+
+
+async def _refresh_source(
+    source: str, key: str, policy: CachePolicy, fn: Callable[..., Awaitable[Any]], *args: Any
+) -> None:
+    value, error = await _call_source(source, fn, *args)
+    if error is None and not _is_empty(value):
+        await _store_source(key, value, policy)
+
+
+def _schedule_refresh(
+    source: str, key: str, policy: CachePolicy, fn: Callable[..., Awaitable[Any]], *args: Any
+) -> None:
+    """stale 항목 백그라운드 갱신. 같은 키에 대한 갱신은 하나로 합친다."""
+    task = asyncio.ensure_future(_refresh_flight.do(key, partial(_refresh_source, source, key, policy, fn, *args)))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _run_source(
+    source: str, key: str, policy: CachePolicy, fn: Callable[..., Awaitable[Any]], *args: Any
+) -> SourceOutcome:
+    """
+    소스 단위 캐시를 먼저 보고, 없으면 async 서비스 함수를 소스별 deadline까지만 기다린다.
+
+    - fresh: 캐시 값 그대로 ("hit")
+    - stale-while-revalidate 구간: 캐시 값을 즉시 돌려주고 백그라운드에서 갱신 ("stale")
+    - 그보다 오래된 항목: upstream을 먼저 시도하고, 실패/timeout이면 stale 값으로 대신 응답 ("stale")
+    에러와 빈 결과는 캐시하지 않으므로, 한 소스의 실패가 이후 응답에 남지 않는다.
+    """
+    ttl, swr, _ = policy
+    entry = await acache_get(key)
+    age = time.time() - entry["at"] if entry is not None else None
+    if entry is not None and age <= ttl:
+        return source, entry["v"], None, 0.0, "hit"
+    if entry is not None and age <= ttl + swr:
+        _schedule_refresh(source, key, policy, fn, *args)
+        return source, entry["v"], None, 0.0, "stale"
+
+    start = time.perf_counter()
+    value, error = await _call_source(source, fn, *args)
+    elapsed = round((time.perf_counter() - start) * 1000, 2)
+    if error is None and not _is_empty(value):
+        await _store_source(key, value, policy)
+    elif error is not None and entry is not None:
+        # serve-stale-on-error: upstream 장애 시 오래된 결과라도 돌려준다.
+        return source, entry["v"], None, elapsed, "stale"
+    return source, value, error, elapsed, "miss"
+
+
+def _screen(query: str, candidates: list[dict[str, Any]], max_report: int) -> list[dict[str, Any]]:
+    screened = screen_reports(query=query, candidates=candidates, max_items=max_report)
+    reports_list = []
+    for it in screened:
+        out = dict(it)
+        if "published_date" in out and "date" not in out:
+            out["date"] = out.get("published_date", "")
+        if "source" in out and "source_type" not in out:
+            out["source_type"] = out.get("source", "")
+        reports_list.append(out)
+    return reports_list
+
+
+def _run_reports(query: str, values: dict[str, Any], max_report: int) -> SourceOutcome:
+    """논문 + SEC/DART 결과로 리포트 스크리닝."""
+    start = time.perf_counter()
+    try:
+        candidates: list[dict[str, Any]] = []
+        if values.get("papers"):
+            candidates.extend(values["papers"])
+        for key in ("sec", "dart"):
+            data = values.get(key)
+            if data and data.get("items"):
+                candidates.extend(data["items"])
+        reports_list = _screen(query, candidates, max_report)
+        return "reports", reports_list, None, round((time.perf_counter() - start) * 1000, 2), "miss"
+    except Exception as e:
+        error = ErrorItem(source="reports", message=_error_message(e))
+        return "reports", [], error, round((time.perf_counter() - start) * 1000, 2), "miss"
+
+
+async def _route_filings(query: str, resolve_names: bool = False) -> Route:
+    """
+    공시 소스와 그 소스에 넘길 코드. 키워드 검색을 회사로 바꿔 읽지 않도록 식별자가 분명할 때만 resolver를 쓴다.
+    - 6자리 이상 숫자: DART 종목코드
+    - 한글 검색어: DART 상장사명과 정확히 같으면 그 종목 (SEC 티커일 수 없으므로 다른 해석이 없다)
+    - 그 외: 티커로 보고 SEC. resolve_names=True일 때만 영문 회사명도 찾는다 ("Apple" → AAPL)
+    """
+    if is_korea_stock(query):
+        return "dart", query
+    if not (resolve_names or has_hangul(query)):
+        return "sec", query
+    from app.services.companies import aresolve
+
+    try:
+        company = await aresolve(query)
+    except Exception:
+        logger.warning("company resolver failed for %r", query, exc_info=True)
+        return "sec", query
+    if company is None:
+        return "sec", query
+    return ("dart" if company.market == "KR" else "sec"), company.code
+
+
+async def _prefetch_dart(routes: list[Awaitable[Route]], daily_only: bool) -> None:
+    """
+    관심종목 검색에서 DART 종목이 여럿이면 종목별 조회 전에 한꺼번에 받아 둔다 (실패하면 종목별 조회로 진행).
+    - daily_only: DART_DAILY_MARKET_MIN_COMPANIES개 이상이면 시장 전체 최근 공시목록 한 번
+    - 그 외: 2개 이상이면 주요계정을 다중회사 API로 기간별 한 번씩 ((회사, 기간) 캐시를 채움)
+    """
+    if not DART_API_KEY:
+        return
+    routes = await asyncio.gather(*routes)
+    codes = list(dict.fromkeys(code for source, code in routes if source == "dart"))
+    try:
+        if daily_only:
+            if len(codes) >= DART_DAILY_MARKET_MIN_COMPANIES:
+                from app.services.dart import aprefetch_daily_market
+
+                await aprefetch_daily_market()
+        elif len(codes) >= 2:
+            from app.services.dart_financials import acollect_dart_financials
+
+            await acollect_dart_financials(*codes)
+    except Exception:
+        # prefetch는 최적화일 뿐이라 실패해도 검색어별 조회가 이어서 처리한다
+        logger.warning("DART prefetch failed (%d companies)", len(codes), exc_info=True)
+
+
+def _plan_multi(
+    queries: list[str], daily_only: bool, resolve_names: bool
+) -> tuple[list[Callable[[], Awaitable[Route]]], list[asyncio.Future]]:
+    """
+    다중 검색의 공시 라우팅을 검색어마다 한 번만 하고 (prefetch와 검색어별 실행이 같은 결과를 공유),
+    검색어별 공시 소스는 DART prefetch가 끝난 뒤 시작하게 한다. 키워드 소스는 둘 다 기다리지 않는다.
+    반환: (검색어 순서의 라우팅 awaitable 팩토리, 끝나면 취소할 공유 future)
+    """
+    routes = {q: asyncio.ensure_future(_route_filings(q, resolve_names)) for q in dict.fromkeys(queries)}
+    prefetch = asyncio.ensure_future(_prefetch_dart(list(routes.values()), daily_only))
+
+    async def _routed(q: str) -> Route:
+        # 한 검색어가 취소돼도 공유 future는 다른 검색어가 계속 쓴다
+        route = await asyncio.shield(routes[q])
+        await asyncio.shield(prefetch)
+        return route
+
+    return [partial(_routed, q) for q in queries], [*routes.values(), prefetch]
+
+
+async def _iter_research(
     query: str,
     daily_only: bool = False,
     max_yt: int = 30,
     max_paper: int = 30,
     max_news: int = 40,
     max_report: int = 30,
-) -> tuple[ResearchResults, list[ErrorItem]]:
-    """단일 쿼리에 대해 모든 소스를 검색하고 ResearchResults를 반환."""
-    errors: list[ErrorItem] = []
-    dart_data: dict[str, Any] | None = None
-    sec_data: dict[str, Any] | None = None
-    youtube_list: list[dict[str, Any]] = []
-    papers_list: list[dict[str, Any]] = []
-    reports_list: list[dict[str, Any]] = []
-    news_list: list[dict[str, Any]] = []
-
-    # DART (국내 종목코드 6자리+)
-    if is_korea_stock(query):
-        try:
-            from app.services.dart import collect_dart_reports
-            rows = collect_dart_reports(query, daily_only=daily_only)
-            dart_data = {"items": [_normalize_item("dart", r) for r in rows], "raw": rows}
-        except Exception as e:
-            errors.append(ErrorItem(source="dart", message=str(e)))
-    else:
-        # SEC (US ticker)
-        try:
-            from app.services.sec import collect_sec_links
-            rows = collect_sec_links(query.upper(), daily_only=daily_only)
-            sec_data = {"items": [_normalize_item("sec", r) for r in rows], "raw": rows}
-        except Exception as e:
-            errors.append(ErrorItem(source="sec", message=str(e)))
+    deep_history: bool = False,
+    resolve_names: bool = False,
+    route: Awaitable[Route] | None = None,
+) -> AsyncIterator[SourceOutcome]:
+    """
+    단일 쿼리의 모든 소스를 동시에 실행하고, 끝나는 순서대로 (source, value, error, elapsed_ms, cache)를 내보낸다.
+    소스별 결과는 소스 단위 캐시에서 먼저 찾는다. 리포트 스크리닝은 입력(논문 + SEC/DART)이 모두 도착하는 즉시 실행된다.
+    공시 라우팅(route, 없으면 _route_filings)은 키워드 소스와 동시에 돌고, 끝나면 공시/재무 소스를 시작한다.
+    """
+    daily = 1 if daily_only else 0
 
-    # YouTube
-    try:
-        from app.services.youtube import search_youtube_videos
-        rows = search_youtube_videos(query, max_results=max_yt, daily_only=daily_only)
-        youtube_list = [_normalize_item("youtube", r) for r in rows]
-    except Exception as e:
-        errors.append(ErrorItem(source="youtube", message=str(e)))
+    def _job(
+        source: str, fn: Callable[..., Awaitable[Any]], *args: Any, key_query: str | None = None, **params: Any
+    ) -> asyncio.Future:
+        key = _source_cache_key(source, key_query or query, **params)
+        return asyncio.ensure_future(_run_source(source, key, _source_policy(source, daily_only), fn, *args))
 
-    # Papers
-    try:
-        from app.services.papers import search_papers
-        rows = search_papers(query, max_results=max_paper)
-        papers_list = [_normalize_item("papers", r) for r in rows]
-    except Exception as e:
-        errors.append(ErrorItem(source="papers", message=str(e)))
+    def _filings_jobs(filings_source: str, code: str) -> set[asyncio.Future]:
+        # DART (국내 종목코드 / 상장사명) / SEC (US ticker)
+        if filings_source == "dart":
+            jobs = {_job("dart", _fetch_dart, code, daily_only, key_query=code, daily=daily)}
+        else:
+            deep = 1 if deep_history and not daily_only else 0
+            jobs = {_job("sec", _fetch_sec, code, daily_only, bool(deep), key_query=code, daily=daily, deep=deep)}
+        # 재무 수치는 분기 단위로만 바뀌므로 최근 24시간 모드에서는 생략
+        if filings_source == "sec" and not daily_only:
+            jobs.add(_job("financials", _fetch_financials, code, key_query=code))
+        if filings_source == "dart" and not daily_only:
+            jobs.add(_job("dart_financials", _fetch_dart_financials, code, key_query=code))
+        return jobs
 
-    # News
+    route_job = asyncio.ensure_future(route if route is not None else _route_filings(query, resolve_names))
+    pending: set[asyncio.Future] = {
+        route_job,
+        _job("youtube", _fetch_youtube, query, max_yt, daily_only, max=max_yt, daily=daily),
+        _job("papers", _fetch_papers, query, max_paper, max=max_paper),
+        _job("news", _fetch_news, query, max_news, daily_only, max=max_news, daily=daily),
+    }
+    started = set(pending)
+    filings_source: str | None = None
+    values: dict[str, Any] = {}
+    reports_done = False
     try:
-        from app.services.news import search_news_articles
-        rows = search_news_articles(query, max_results=max_news, daily_only=daily_only)
-        news_list = [_normalize_item("news", r) for r in rows]
-    except Exception as e:
-        errors.append(ErrorItem(source="news", message=str(e)))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                if fut is route_job:
+                    filings_source, code = fut.result()
+                    jobs = _filings_jobs(filings_source, code)
+                    pending |= jobs
+                    started |= jobs
+                    continue
+                outcome = fut.result()
+                values[outcome[0]] = outcome[1]
+                yield outcome
+                if not reports_done and filings_source in values and "papers" in values:
+                    reports_done = True
+                    yield _run_reports(query, values, max_report)
+    finally:
+        # 클라이언트가 스트림을 끊으면 남은 소스 대기를 취소한다.
+        for fut in started:
+            fut.cancel()
 
-    # Reports screening
-    try:
-        candidates: list[dict[str, Any]] = []
-        if papers_list:
-            candidates.extend(papers_list)
-        if sec_data and sec_data.get("items"):
-            candidates.extend(sec_data["items"])
-        if dart_data and dart_data.get("items"):
-            candidates.extend(dart_data["items"])
-        screened = screen_reports(query=query, candidates=candidates, max_items=max_report)
-        reports_list = []
-        for it in screened:
-            out = dict(it)
-            if "published_date" in out and "date" not in out:
-                out["date"] = out.get("published_date", "")
-            if "source" in out and "source_type" not in out:
-                out["source_type"] = out.get("source", "")
-            reports_list.append(out)
-    except Exception as e:
-        errors.append(ErrorItem(source="reports", message=str(e)))
 
+def _source_rank(source: str) -> int:
+    return _SOURCE_ORDER.index(source) if source in _SOURCE_ORDER else len(_SOURCE_ORDER)
+
+
+def _assemble(outcomes: list[SourceOutcome]) -> Assembled:
+    """
+    소스별 결과를 ResearchResults로 조립. 에러와 stale 소스 목록은 소스 순서(_SOURCE_ORDER)로 정렬.
+    """
+    values = {outcome[0]: outcome[1] for outcome in outcomes}
+    errors = [outcome[2] for outcome in outcomes if outcome[2] is not None]
+    errors.sort(key=lambda e: _source_rank(e.source))
+    stale = sorted({outcome[0] for outcome in outcomes if outcome[4] == "stale"}, key=_source_rank)
     results = ResearchResults(
-        dart=dart_data,
-        sec=sec_data,
-        youtube=youtube_list,
-        papers=papers_list,
-        reports=reports_list,
-        news=news_list,
+        dart=values.get("dart"),
+        sec=values.get("sec"),
+        financials=values.get("financials"),
+        dart_financials=values.get("dart_financials"),
+        youtube=values.get("youtube") or [],
+        papers=values.get("papers") or [],
+        reports=values.get("reports") or [],
+        news=values.get("news") or [],
+    )
+    return results, errors, stale
+
+
+def _meta(elapsed_ms: float, errors: list[ErrorItem], stale_sources: list[str]) -> ResearchMeta:
+    return ResearchMeta(
+        elapsed_ms=round(elapsed_ms, 2),
+        errors=errors,
+        stale=bool(stale_sources),
+        stale_sources=stale_sources,
     )
-    return results, errors
+
+
+async def _run_research(
+    query: str,
+    daily_only: bool = False,
+    max_yt: int = 30,
+    max_paper: int = 30,
+    max_news: int = 40,
+    max_report: int = 30,
+    deep_history: bool = False,
+    resolve_names: bool = False,
+    route: Awaitable[Route] | None = None,
+) -> Assembled:
+    """
+    단일 쿼리에 대해 모든 소스를 동시에 검색하고 ResearchResults를 반환.
+    전체 소요 시간은 가장 느린 소스(최대 deadline) 수준이며, 리포트 스크리닝은 입력 소스가 모두 도착한 뒤 수행.
+    """
+    outcomes = [
+        outcome
+        async for outcome in _iter_research(
+            query,
+            daily_only=daily_only,
+            max_yt=max_yt,
+            max_paper=max_paper,
+            max_news=max_news,
+            max_report=max_report,
+            deep_history=deep_history,
+            resolve_names=resolve_names,
+            route=route,
+        )
+    ]
+    return _assemble(outcomes)
 
 
 def _add_query_col(results: ResearchResults, query: str) -> ResearchResults:
@@ -178,9 +588,16 @@ def _add_query_col(results: ResearchResults, query: str) -> ResearchResults:
         tagged_raw = [{**r, "query": query} for r in (obj.get("raw") or [])]
         return {**obj, "items": tagged_items, "raw": tagged_raw}
 
+    def _tag_columns(cols: dict[str, list[Any]] | None) -> dict[str, list[Any]] | None:
+        if cols is None:
+            return None
+        return {"query": [query] * len(cols.get("period") or []), **cols}
+
     return ResearchResults(
         dart=_tag_keyed(results.dart),
         sec=_tag_keyed(results.sec),
+        financials=_tag_columns(results.financials),
+        dart_financials=_tag_columns(results.dart_financials),
         youtube=_tag(results.youtube),
         papers=_tag(results.papers),
         reports=_tag(results.reports),
@@ -192,6 +609,8 @@ def _merge_results(all_results: list[ResearchResults]) -> ResearchResults:
     """여러 쿼리 결과를 하나의 ResearchResults로 병합."""
     dart_items, dart_raw = [], []
     sec_items, sec_raw = [], []
+    financials: dict[str, list[Any]] = {}
+    dart_financials: dict[str, list[Any]] = {}
     youtube, papers, reports, news = [], [], [], []
 
     for r in all_results:
@@ -201,6 +620,12 @@ def _merge_results(all_results: list[ResearchResults]) -> ResearchResults:
         if r.sec:
             sec_items.extend(r.sec.get("items") or [])
             sec_raw.extend(r.sec.get("raw") or [])
+        if r.financials:
+            for col, values in r.financials.items():
+                financials.setdefault(col, []).extend(values)
+        if r.dart_financials:
+            for col, values in r.dart_financials.items():
+                dart_financials.setdefault(col, []).extend(values)
         youtube.extend(r.youtube)
         papers.extend(r.papers)
         reports.extend(r.reports)
@@ -209,6 +634,8 @@ def _merge_results(all_results: list[ResearchResults]) -> ResearchResults:
     return ResearchResults(
         dart={"items": dart_items, "raw": dart_raw} if dart_items else None,
         sec={"items": sec_items, "raw": sec_raw} if sec_items else None,
+        financials=financials or None,
+        dart_financials=dart_financials or None,
         youtube=youtube,
         papers=papers,
         reports=reports,
@@ -216,36 +643,99 @@ def _merge_results(all_results: list[ResearchResults]) -> ResearchResults:
     )
 
 
+def _flags_suffix(deep_history: bool, resolve_names: bool = False) -> str:
+    # 기본 검색의 응답 캐시 키(엑셀 조회용)는 그대로 두고, 옵션을 켰을 때만 구분자를 붙인다.
+    return (":deep=1" if deep_history else "") + (":names=1" if resolve_names else "")
+
+
+def _single_cache_key(
+    query: str, daily_only: bool, deep_history: bool = False, resolve_names: bool = False
+) -> tuple[str, str]:
+    slug = slugify(query)
+    daily_flag = 1 if daily_only else 0
+    return slug, f"research:{slug}:daily={daily_flag}{_flags_suffix(deep_history, resolve_names)}"
+
+
+def _multi_cache_key(
+    queries: list[str], max_results: int, daily_only: bool, deep_history: bool = False, resolve_names: bool = False
+) -> tuple[str, str]:
+    slug = slugify("_".join(queries[:3]))
+    daily_flag = 1 if daily_only else 0
+    flags = _flags_suffix(deep_history, resolve_names)
+    return slug, f"research:multi:{slug}:max={max_results}:daily={daily_flag}{flags}"
+
+
+def _parse_queries(body: MultiResearchRequest) -> list[str]:
+    queries = [q.strip() for q in (body.queries or []) if q.strip()]
+    if not queries:
+        raise HTTPException(status_code=400, detail="queries must not be empty")
+    return queries
+
+
+def _multi_response(
+    queries: list[str],
+    slug: str,
+    per_query: list[Assembled],
+    elapsed_ms: float,
+) -> ResearchResponse:
+    """검색어별 결과에 query 컬럼을 붙여 queries 순서대로 병합."""
+    all_results: list[ResearchResults] = []
+    all_errors: list[ErrorItem] = []
+    all_stale: list[str] = []
+    for q, (results, errors, stale) in zip(queries, per_query):
+        tagged = _add_query_col(results, q)
+        all_results.append(tagged)
+        all_errors.extend(errors)
+        all_stale.extend(s for s in stale if s not in all_stale)
+
+    merged = _merge_results(all_results)
+    meta = _meta(elapsed_ms, all_errors, sorted(all_stale, key=_source_rank))
+    combined_query = " | ".join(queries)
+    return ResearchResponse(query=combined_query, slug=slug, results=merged, meta=meta)
+
+
 @app.post("/api/research", response_model=ResearchResponse)
-def research(body: ResearchRequest, daily_only: bool = False):
+async def research(
+    body: ResearchRequest, daily_only: bool = False, deep_history: bool = False, resolve_names: bool = False
+):
     """
     단일 쿼리 검색.
     daily_only=True: SEC/DART/YouTube/News를 최근 24시간 이내 자료로 제한.
+    deep_history=True: SEC filing 목록을 EDGAR overflow 페이지까지 읽어 5년 10-K 구간이 잘리지 않게 한다.
+    resolve_names=True: 영문 회사명도 회사로 찾아 공시를 붙인다 ("Apple" → AAPL). 기본은 티커/종목코드/한글 상장사명만.
     """
     query = (body.query or "").strip()
     if not query:
         raise HTTPException(status_code=400, detail="query is required")
 
-    slug = slugify(query)
-    daily_flag = 1 if daily_only else 0
-    cache_key = f"research:{slug}:daily={daily_flag}"
+    slug, cache_key = _single_cache_key(query, daily_only, deep_history, resolve_names)
 
-    cached = cache_get(cache_key)
-    if cached is not None:
-        return ResearchResponse(**cached)
+    # 응답은 항상 소스 단위 캐시에서 조립한다 (캐시된 소스는 upstream 호출 없음).
+    # 같은 캐시 키로 동시에 들어온 요청은 한 번의 실행 결과를 공유
+    return await _research_flight.do(
+        cache_key, partial(_compute_research, query, slug, cache_key, daily_only, deep_history, resolve_names)
+    )
 
+
+async def _compute_research(
+    query: str, slug: str, cache_key: str, daily_only: bool, deep_history: bool = False, resolve_names: bool = False
+) -> ResearchResponse:
     start = time.perf_counter()
-    results, errors = _run_research(query, daily_only=daily_only)
+    results, errors, stale = await _run_research(
+        query, daily_only=daily_only, deep_history=deep_history, resolve_names=resolve_names
+    )
     elapsed_ms = (time.perf_counter() - start) * 1000
 
-    meta = ResearchMeta(elapsed_ms=round(elapsed_ms, 2), errors=errors)
+    meta = _meta(elapsed_ms, errors, stale)
     resp = ResearchResponse(query=query, slug=slug, results=results, meta=meta)
-    cache_set(cache_key, resp.model_dump())
+    await acache_set(cache_key, resp.model_dump())
     return resp
 
 
 @app.post("/api/research/multi", response_model=ResearchResponse)
-def research_multi(body: MultiResearchRequest, daily_only: bool = False):
+async def research_multi(
+    body: MultiResearchRequest, daily_only: bool = False, deep_history: bool = False, resolve_names: bool = False
+):
     """
     다중 쿼리 검색.
     - 유튜브/논문/뉴스/리포트는 검색어당 body.max_results(기본 10)개로 제한.
@@ -253,57 +743,192 @@ def research_multi(body: MultiResearchRequest, daily_only: bool = False):
     - 각 결과에 query 컬럼을 추가해 어느 검색어에서 나온 결과인지 구분 가능.
     - 모든 쿼리 결과를 합쳐서 하나의 ResearchResponse로 반환.
     """
-    queries = [q.strip() for q in (body.queries or []) if q.strip()]
-    if not queries:
-        raise HTTPException(status_code=400, detail="queries must not be empty")
-
+    queries = _parse_queries(body)
     mr = body.max_results
-    slug = slugify("_".join(queries[:3]))
-    daily_flag = 1 if daily_only else 0
-    cache_key = f"research:multi:{slug}:max={mr}:daily={daily_flag}"
+    slug, cache_key = _multi_cache_key(queries, mr, daily_only, deep_history, resolve_names)
+
+    return await _research_flight.do(
+        cache_key, partial(_compute_multi, queries, mr, slug, cache_key, daily_only, deep_history, resolve_names)
+    )
 
-    cached = cache_get(cache_key)
-    if cached is not None:
-        return ResearchResponse(**cached)
 
+async def _compute_multi(
+    queries: list[str],
+    mr: int,
+    slug: str,
+    cache_key: str,
+    daily_only: bool,
+    deep_history: bool = False,
+    resolve_names: bool = False,
+) -> ResearchResponse:
     start = time.perf_counter()
-    all_results: list[ResearchResults] = []
-    all_errors: list[ErrorItem] = []
+    routes, shared = _plan_multi(queries, daily_only, resolve_names)
 
-    for q in queries:
-        results, errors = _run_research(
-            q,
-            daily_only=daily_only,
-            max_yt=mr,
-            max_paper=mr,
-            max_news=mr,
-            max_report=mr,
-        )
-        tagged = _add_query_col(results, q)
-        all_results.append(tagged)
-        all_errors.extend(errors)
+    # 검색어 단위 동시 실행 (최대 MULTI_MAX_CONCURRENT_QUERIES개). host별 동시 요청 수는 app.http가 제한.
+    slots = asyncio.Semaphore(max(1, MULTI_MAX_CONCURRENT_QUERIES))
 
-    merged = _merge_results(all_results)
+    async def _one(idx: int, q: str) -> Assembled:
+        async with slots:
+            return await _run_research(
+                q,
+                daily_only=daily_only,
+                max_yt=mr,
+                max_paper=mr,
+                max_news=mr,
+                max_report=mr,
+                deep_history=deep_history,
+                route=routes[idx](),
+            )
+
+    # gather는 입력 순서대로 결과를 돌려주므로 병합 순서는 queries 순서와 같다.
+    try:
+        per_query = await asyncio.gather(*(_one(i, q) for i, q in enumerate(queries)))
+    finally:
+        for fut in shared:
+            fut.cancel()
     elapsed_ms = (time.perf_counter() - start) * 1000
 
-    meta = ResearchMeta(elapsed_ms=round(elapsed_ms, 2), errors=all_errors)
-    combined_query = " | ".join(queries)
-    resp = ResearchResponse(query=combined_query, slug=slug, results=merged, meta=meta)
-    cache_set(cache_key, resp.model_dump())
+    resp = _multi_response(queries, slug, list(per_query), elapsed_ms)
+    await acache_set(cache_key, resp.model_dump())
     return resp
 
 
+# 스트리밍 응답 형식. 그 외 값은 FastAPI가 422로 거절한다
+StreamFormat = Literal["ndjson", "sse"]
+
+
+def _format_event(event: BaseModel, fmt: StreamFormat) -> str:
+    payload = event.model_dump_json()
+    if fmt == "sse":
+        return f"event: {event.event}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+
+def _stream_response(events: AsyncIterator[BaseModel], fmt: StreamFormat) -> StreamingResponse:
+    async def _body() -> AsyncIterator[str]:
+        async for event in events:
+            yield _format_event(event, fmt)
+
+    media_type = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return StreamingResponse(_body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+def _source_event(query: str, outcome: SourceOutcome) -> ResearchSourceEvent:
+    source, value, error, elapsed, cache = outcome
+    return ResearchSourceEvent(query=query, source=source, elapsed_ms=elapsed, data=value, error=error, cache=cache)
+
+
+@app.post("/api/research/stream")
+async def research_stream(
+    body: ResearchRequest,
+    daily_only: bool = False,
+    deep_history: bool = False,
+    resolve_names: bool = False,
+    format: StreamFormat = "ndjson",
+):
+    """
+    /api/research의 스트리밍 버전 (NDJSON 기본, format=sse면 Server-Sent Events).
+    소스가 끝나는 순서대로 {"event": "source", ...}를 보내고 (소스 단위 캐시에 있으면 즉시),
+    마지막에 /api/research와 같은 응답을 {"event": "done", "response": ...}로 보낸다 (엑셀용 응답 캐시도 동일 키로 저장).
+    """
+    query = (body.query or "").strip()
+    if not query:
+        raise HTTPException(status_code=400, detail="query is required")
+
+    slug, cache_key = _single_cache_key(query, daily_only, deep_history, resolve_names)
+
+    async def _events() -> AsyncIterator[BaseModel]:
+        start = time.perf_counter()
+        outcomes: list[SourceOutcome] = []
+        async for outcome in _iter_research(
+            query, daily_only=daily_only, deep_history=deep_history, resolve_names=resolve_names
+        ):
+            outcomes.append(outcome)
+            yield _source_event(query, outcome)
+
+        results, errors, stale = _assemble(outcomes)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        meta = _meta(elapsed_ms, errors, stale)
+        resp = ResearchResponse(query=query, slug=slug, results=results, meta=meta)
+        await acache_set(cache_key, resp.model_dump())
+        yield ResearchDoneEvent(response=resp)
+
+    return _stream_response(_events(), format)
+
+
+@app.post("/api/research/multi/stream")
+async def research_multi_stream(
+    body: MultiResearchRequest,
+    daily_only: bool = False,
+    deep_history: bool = False,
+    resolve_names: bool = False,
+    format: StreamFormat = "ndjson",
+):
+    """
+    /api/research/multi의 스트리밍 버전. (검색어, 소스) 쌍이 끝날 때마다 이벤트를 보내고
+    마지막 done 이벤트에 /api/research/multi와 같은 병합 응답을 담는다.
+    """
+    queries = _parse_queries(body)
+    mr = body.max_results
+    slug, cache_key = _multi_cache_key(queries, mr, daily_only, deep_history, resolve_names)
+
+    async def _events() -> AsyncIterator[BaseModel]:
+        start = time.perf_counter()
+        routes, shared = _plan_multi(queries, daily_only, resolve_names)
+        slots = asyncio.Semaphore(max(1, MULTI_MAX_CONCURRENT_QUERIES))
+        queue: asyncio.Queue[tuple[int, SourceOutcome | None]] = asyncio.Queue()
+        per_query: list[list[SourceOutcome]] = [[] for _ in queries]
+
+        async def _pump(idx: int, q: str) -> None:
+            try:
+                async with slots:
+                    async for outcome in _iter_research(
+                        q,
+                        daily_only=daily_only,
+                        max_yt=mr,
+                        max_paper=mr,
+                        max_news=mr,
+                        max_report=mr,
+                        deep_history=deep_history,
+                        route=routes[idx](),
+                    ):
+                        await queue.put((idx, outcome))
+            finally:
+                await queue.put((idx, None))
+
+        workers = [asyncio.ensure_future(_pump(i, q)) for i, q in enumerate(queries)]
+        try:
+            remaining = len(queries)
+            while remaining:
+                idx, outcome = await queue.get()
+                if outcome is None:
+                    remaining -= 1
+                    continue
+                per_query[idx].append(outcome)
+                yield _source_event(queries[idx], outcome)
+        finally:
+            for w in [*workers, *shared]:
+                w.cancel()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        resp = _multi_response(queries, slug, [_assemble(o) for o in per_query], elapsed_ms)
+        await acache_set(cache_key, resp.model_dump())
+        yield ResearchDoneEvent(response=resp)
+
+    return _stream_response(_events(), format)
+
+
 @app.get("/api/research/{slug}/excel")
-def research_excel(slug: str, daily_only: bool = False):
+def research_excel(slug: str, daily_only: bool = False, deep_history: bool = False, resolve_names: bool = False):
     """
     Return Excel file for cached research result.
     Filename: research_{slug}.xlsx
 
-    daily_only는 /api/research 호출 시와 동일하게 맞춰야
+    daily_only / deep_history / resolve_names는 /api/research 호출 시와 동일하게 맞춰야
     대응되는 캐시를 찾을 수 있다.
     """
     daily_flag = 1 if daily_only else 0
-    cache_key = f"research:{slug}:daily={daily_flag}"
+    cache_key = f"research:{slug}:daily={daily_flag}{_flags_suffix(deep_history, resolve_names)}"
 
     cached = cache_get(cache_key)
     if not cached:
@@ -324,6 +949,17 @@ def research_excel(slug: str, daily_only: bool = False):
             df = pd.DataFrame(results["sec"]["raw"])
             df.to_excel(writer, sheet_name="SEC", index=False)
 
+        if results.get("financials") and results["financials"].get("period"):
+            df = pd.DataFrame(results["financials"])
+            df.to_excel(writer, sheet_name="Financials", index=False)
+
+        if results.get("dart_financials") and results["dart_financials"].get("period"):
+            from app.services.dart_financials import comparison_table
+
+            pd.DataFrame(results["dart_financials"]).to_excel(writer, sheet_name="DART_Financials", index=False)
+            df = pd.DataFrame(comparison_table(results["dart_financials"]))
+            df.to_excel(writer, sheet_name="DART_Compare", index=False)
+
         if results.get("youtube"):
             rows: list[dict[str, Any]] = []
             for it in results["youtube"]:
@@ -389,5 +1025,164 @@ def research_excel(slug: str, daily_only: bool = False):
     return StreamingResponse(
         buffer,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        # 한글 검색어(회사명) slug는 RFC 5987 filename*로, 구형 클라이언트용 filename은 ASCII로
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{filename.encode("ascii", "replace").decode()}"; '
+                f"filename*=UTF-8''{quote(filename)}"
+            )
+        },
     )
+
+
+@app.get("/api/companies/autocomplete")
+async def companies_autocomplete(q: str = "", limit: int = 10, market: str | None = None):
+    """
+    회사명 / 종목코드 / 티커 접두어 자동완성 (DART 상장사 + SEC 티커). 키 입력마다 호출해도 되도록 메모리 인덱스만 본다.
+    "삼성 전자", "(주)삼성", "0059", "appl" 모두 동작. market: KR / US로 제한.
+    """
+    from app.services.companies import asuggest
+
+    market = (market or "").upper() or None
+    if market not in (None, "KR", "US"):
+        raise HTTPException(status_code=400, detail="market must be KR or US")
+    items = await asuggest(q, limit, market)
+    return {"query": q, "items": [c._asdict() for c in items]}
+
+
+@app.get("/api/dart/financials")
+async def dart_financials(codes: str):
+    """
+    여러 국내 종목(쉼표 구분 종목코드 또는 회사명)의 주요계정 시계열 (연간 5개 + 분기 4개)과 기간 비교표.
+    다중회사 API로 (사업연도, 보고서)마다 최대 100개 회사를 한 번에 받고, (회사, 기간) 단위로 캐시한다.
+    """
+    from app.services.companies import aresolve
+    from app.services.dart_financials import acollect_dart_financials, comparison_table
+
+    stock_codes: list[str] = []
+    for raw in (c.strip() for c in codes.split(",")):
+        if not raw:
+            continue
+        company = None if is_korea_stock(raw) else await aresolve(raw)
+        if company is not None and company.market != "KR":
+            raise HTTPException(status_code=400, detail=f"not a Korean company: {raw}")
+        stock_codes.append(company.code if company is not None else raw)
+    if not stock_codes:
+        raise HTTPException(status_code=400, detail="codes is required")
+    try:
+        table = await acollect_dart_financials(*dict.fromkeys(stock_codes))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (httpx.HTTPError, RuntimeError) as e:
+        raise HTTPException(status_code=502, detail=f"DART request failed: {_error_message(e)}")
+    return {"financials": table, "comparison": comparison_table(table)}
+
+
+@app.get("/api/dart/{stock_code}/statements")
+async def dart_statements(stock_code: str, year: str, report: str = "annual", fs_div: str | None = None):
+    """
+    단일회사 전체 재무제표(재무상태표·손익계산서·현금흐름표 등 전 계정, 당기/전기/전전기 금액)를 컬럼형으로.
+    report: annual / q1 / h1 / q3, fs_div: CFS(연결) / OFS(별도), 없으면 연결 → 별도 순.
+    """
+    from app.services.dart_financials import FS_DIVS, astatement, resolve_report
+
+    try:
+        resolve_report(report)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fs_div and fs_div.upper() not in FS_DIVS:
+        raise HTTPException(status_code=400, detail="fs_div must be CFS or OFS")
+    try:
+        return await astatement(stock_code, year, report, fs_div)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (httpx.HTTPError, RuntimeError) as e:
+        raise HTTPException(status_code=502, detail=f"DART request failed: {_error_message(e)}")
+
+
+@app.get("/api/sec/{ticker}/peers")
+async def sec_peers(
+    ticker: str,
+    metric: str = "revenue",
+    period: str | None = None,
+    peers: str | None = None,
+    limit: int = 50,
+):
+    """
+    XBRL frames로 ticker의 metric을 같은 기간 동종업계와 비교 (순위, 백분위, 분포).
+    period: CY2023 / CY2023Q2 (기본 직전 연도). peers: 쉼표 구분 티커 목록 (없으면 같은 SIC 또는 전체 제출사).
+    """
+    from app.services.sec_frames import apeer_comparison
+
+    peer_list = [p.strip().upper() for p in (peers or "").split(",") if p.strip()]
+    try:
+        return await apeer_comparison(ticker.upper(), metric, period, peer_list or None, max(1, min(limit, 500)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"SEC frames request failed: {_error_message(e)}")
+
+
+@app.post("/api/sec/{ticker}/documents")
+async def sec_documents(ticker: str, daily_only: bool = False, deep_history: bool = False):
+    """
+    ticker의 SEC filing 문서를 로컬 저장소로 받아 두고 목록을 돌려준다.
+    이미 받은 문서는 SEC에 다시 요청하지 않는다 (cached=true). local_url로 저장된 사본을 내려받는다.
+    """
+    from app.services.sec import acollect_sec_links
+    from app.services.sec_documents import adownload_documents
+
+    try:
+        rows = await acollect_sec_links(ticker.upper(), daily_only=daily_only, deep_history=deep_history)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    refs = {ref["url"]: ref for ref in await adownload_documents(r.get("url", "") for r in rows)}
+    documents = []
+    for row in rows:
+        ref = refs.get(row.get("url", ""), {})
+        doc = {**row, **ref}
+        if "sha256" in ref:
+            doc["local_url"] = f"/api/sec/documents/{ref['sha256']}"
+        documents.append(doc)
+    return {"ticker": ticker.upper(), "documents": documents}
+
+
+@app.get("/api/sec/{ticker}/sections")
+async def sec_sections(ticker: str, form: str = "10-K", limit: int = 2, include_text: bool = False):
+    """
+    최근 10-K/10-Q 본문을 Item 섹션(1A Risk Factors, 7 MD&A, ...)으로 나눈 결과.
+    섹션마다 sha256과 직전 filing 대비 unchanged, include_text=true면 텍스트 chunks.
+    """
+    from app.services.sec_sections import asec_sections
+
+    form = form.upper()
+    if form not in ("10-K", "10-Q"):
+        raise HTTPException(status_code=400, detail="form must be 10-K or 10-Q")
+    try:
+        return await asec_sections(ticker.upper(), form, max(1, min(limit, 10)), include_text)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"SEC request failed: {_error_message(e)}")
+
+
+@app.get("/api/sec/documents/{sha256}")
+def sec_document(sha256: str, request: Request):
+    """
+    저장된 SEC 문서. 내용 해시 주소라 바뀌지 않으므로 immutable로 캐시하게 한다.
+    클라이언트가 gzip을 받으면 저장된 압축 파일을 그대로 보낸다.
+    """
+    from app.services.sec_documents import get_store
+
+    store = get_store()
+    meta = store.blob_meta(sha256)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="document not found")
+    headers = {"ETag": f'"{sha256}"', "Cache-Control": "public, max-age=31536000, immutable"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return FileResponse(
+            store.blob_path(sha256),
+            media_type=meta["content_type"],
+            headers={**headers, "Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return Response(store.read(sha256), media_type=meta["content_type"], headers=headers)
@@ -0,0 +1,139 @@
+"""
+Outbound 요청 속도 제한 (token bucket).
+
+- 프로세스 안: 스레드/이벤트 루프 어디서 호출해도 같은 bucket을 쓴다. 락으로는 "다음 슬롯 시각" 예약만 하고,
+  대기는 호출자가 time.sleep / asyncio.sleep으로 하므로 이벤트 루프를 막지 않는다.
+- 워커 간(shared=True): 캐시 백엔드(sqlite/redis)의 1초 창 카운터로 전체 요청 수를 한 번 더 제한한다.
+  memory 백엔드거나 백엔드 장애면 프로세스 bucket만 적용된다.
+- upstream이 Retry-After 등으로 멈추라고 하면 block()으로 bucket 전체를 그 시각까지 미룬다.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+from app import cache
+
+# shared 창 카운터가 가득 찼을 때 다음 창까지 기다리는 최대 횟수 (이후에는 프로세스 bucket만 믿고 진행)
+SHARED_MAX_WAITS = 20
+
+
+class RateLimiter:
+    def __init__(self, name: str, rate: float, burst: float = 1.0, shared: bool = False) -> None:
+        self.name = name
+        self.rate = max(rate, 0.1)
+        self.burst = max(burst, 1.0)
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        # 카운터 (/api/metrics)
+        self.requests = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self.retries = 0
+        self.retry_after = 0
+        self.blocked_seconds = 0.0
+
+    def reserve(self) -> float:
+        """토큰 하나를 예약하고 기다려야 할 초를 반환. 토큰이 모자라면 음수로 빌려 순서대로 대기 시간을 늘린다."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate, self._blocked_until - now)
+            self.requests += 1
+            if wait > 0:
+                self.throttled += 1
+                self.throttled_seconds += wait
+            return wait
+
+    def block(self, seconds: float) -> None:
+        """
+        지금부터 seconds 동안 새 요청을 내보내지 않는다 (429 / Retry-After).
+        bucket을 그 시각으로 옮기고 비워 두므로, 밀린 요청은 풀린 뒤에도 1/rate 간격으로 나간다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            until = now + seconds
+            if until > self._blocked_until:
+                self.blocked_seconds += until - max(self._blocked_until, now)
+                self._blocked_until = until
+                # 이미 until 너머까지 예약된 몫(음수 토큰)은 그대로 남긴다
+                projected = self._tokens + (until - self._updated) * self.rate
+                self._tokens = min(0.0, projected)
+                self._updated = until
+
+    def note_retry(self, retry_after: bool) -> None:
+        with self._lock:
+            self.retries += 1
+            if retry_after:
+                self.retry_after += 1
+
+    def _shared_wait(self) -> float:
+        """워커 공용 1초 창에 자리가 있으면 0, 없으면 다음 창까지 남은 초."""
+        now = time.time()
+        window = int(now)
+        count = cache.incr(f"ratelimit:{self.name}:{window}", 2)
+        if count is None or count <= self.rate:
+            return 0.0
+        return window + 1 - now
+
+    def acquire(self) -> None:
+        """동기 호출자용: 슬롯이 올 때까지 잔다."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        for _ in range(SHARED_MAX_WAITS if self.shared else 0):
+            wait = self._shared_wait()
+            if not wait:
+                break
+            self._count_shared(wait)
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        for _ in range(SHARED_MAX_WAITS if self.shared else 0):
+            wait = await asyncio.to_thread(self._shared_wait)
+            if not wait:
+                break
+            self._count_shared(wait)
+            await asyncio.sleep(wait)
+
+    def _count_shared(self, wait: float) -> None:
+        with self._lock:
+            self.throttled += 1
+            self.throttled_seconds += wait
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "shared": self.shared,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "retries": self.retries,
+            "retry_after": self.retry_after,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+        }
+
+
+_limiters: dict[str, RateLimiter] = {}
+
+
+def limiter(name: str, rate: float, burst: float = 1.0, shared: bool = False) -> RateLimiter:
+    """이름별 프로세스 공용 limiter (처음 만들 때의 설정을 쓴다)."""
+    found = _limiters.get(name)
+    if found is None:
+        found = _limiters.setdefault(name, RateLimiter(name, rate, burst, shared))
+    return found
+
+
+def stats() -> dict[str, dict[str, Any]]:
+    return {name: lim.stats() for name, lim in _limiters.items()}
@@ -0,0 +1,164 @@
+"""
+Local Redis-protocol stand-in for development and tests.
+
+RedisCache가 쓰는 명령(PING, AUTH, SELECT, GET, SET [NX] [EX|PX], DEL, EXISTS, INCR, PEXPIRE, DBSIZE, FLUSHDB,
+MULTI/EXEC/DISCARD)만
+메모리에서 구현한 단일 프로세스 서버. 실제 Redis 없이 여러 워커가 캐시를 공유하는지 확인할 때 쓴다.
+
+    python -m app.resp_standin --port 6380
+    CACHE_BACKEND=redis CACHE_URL=redis://127.0.0.1:6380/0 uvicorn app.main:app --workers 2
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+
+class StandinStore:
+    def __init__(self) -> None:
+        # key -> (value, expires_monotonic | None)
+        self.data: dict[bytes, tuple[bytes, float | None]] = {}
+
+    def _live(self, key: bytes) -> bytes | None:
+        item = self.data.get(key)
+        if item is None:
+            return None
+        value, expires = item
+        if expires is not None and time.monotonic() > expires:
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, args: list[bytes]) -> Any:
+        cmd = args[0].upper()
+        if cmd == b"PING":
+            return "PONG"
+        if cmd in (b"AUTH", b"SELECT"):
+            return "OK"
+        if cmd == b"GET":
+            return self._live(args[1])
+        if cmd == b"SET":
+            expires = None
+            opts = [a.upper() for a in args[3:]]
+            if b"NX" in opts and self._live(args[1]) is not None:
+                return None
+            if b"PX" in opts:
+                expires = time.monotonic() + int(args[3 + opts.index(b"PX") + 1]) / 1000
+            elif b"EX" in opts:
+                expires = time.monotonic() + int(args[3 + opts.index(b"EX") + 1])
+            self.data[args[1]] = (args[2], expires)
+            return "OK"
+        if cmd == b"DEL":
+            return sum(1 for k in args[1:] if self.data.pop(k, None) is not None)
+        if cmd == b"INCR":
+            current = self._live(args[1])
+            expires = self.data[args[1]][1] if current is not None else None
+            try:
+                value = int(current or b"0") + 1
+            except ValueError:
+                return RuntimeError("ERR value is not an integer or out of range")
+            self.data[args[1]] = (str(value).encode("ascii"), expires)
+            return value
+        if cmd == b"PEXPIRE":
+            current = self._live(args[1])
+            if current is None:
+                return 0
+            self.data[args[1]] = (current, time.monotonic() + int(args[2]) / 1000)
+            return 1
+        if cmd == b"EXISTS":
+            return sum(1 for k in args[1:] if self._live(k) is not None)
+        if cmd == b"DBSIZE":
+            return sum(1 for k in list(self.data) if self._live(k) is not None)
+        if cmd == b"FLUSHDB":
+            self.data.clear()
+            return "OK"
+        return RuntimeError(f"ERR unknown command '{cmd.decode(errors='replace')}'")
+
+
+def _encode(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, Exception):
+        return b"-" + str(value).encode("utf-8") + b"\r\n"
+    if isinstance(value, str):
+        return b"+" + value.encode("utf-8") + b"\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(v) for v in value)
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+async def _read_command(reader: asyncio.StreamReader) -> list[bytes] | None:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # inline command (redis-cli/telnet)
+        return line.strip().split()
+    n = int(line[1:-2])
+    args: list[bytes] = []
+    for _ in range(n):
+        size = int((await reader.readline())[1:-2])
+        data = await reader.readexactly(size + 2)
+        args.append(data[:-2])
+    return args
+
+
+async def serve(host: str = "127.0.0.1", port: int = 6380, store: StandinStore | None = None) -> asyncio.AbstractServer:
+    store = store or StandinStore()
+
+    async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # MULTI 이후 EXEC까지 쌓아 둔 명령 (연결별). 루프 하나에서 돌므로 EXEC는 그대로 원자적이다
+        queued: list[list[bytes]] | None = None
+        try:
+            while True:
+                args = await _read_command(reader)
+                if not args:
+                    break
+                cmd = args[0].upper()
+                reply: Any
+                if cmd == b"MULTI":
+                    if queued is None:
+                        queued, reply = [], "OK"
+                    else:
+                        reply = RuntimeError("ERR MULTI calls can not be nested")
+                elif cmd in (b"EXEC", b"DISCARD"):
+                    if queued is None:
+                        reply = RuntimeError(f"ERR {cmd.decode()} without MULTI")
+                    else:
+                        reply = [store.execute(q) for q in queued] if cmd == b"EXEC" else "OK"
+                        queued = None
+                elif queued is not None:
+                    queued.append(args)
+                    reply = "QUEUED"
+                else:
+                    reply = store.execute(args)
+                writer.write(_encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(_handle, host, port)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Redis-protocol stand-in for the AC-research cache")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args()
+
+    async def _run() -> None:
+        server = await serve(args.host, args.port)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 # apps/api/app/schemas.py
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -23,11 +23,18 @@ class ErrorItem(BaseModel):
 class ResearchMeta(BaseModel):
     elapsed_ms: float
     errors: list[ErrorItem] = Field(default_factory=list)
+    # TTL이 지난 캐시 결과가 섞였는지 (갱신 중이거나 upstream 장애로 대신 응답)
+    stale: bool = False
+    stale_sources: list[str] = Field(default_factory=list)
 
 
 class ResearchResults(BaseModel):
     dart: Optional[dict[str, Any]] = None
     sec: Optional[dict[str, Any]] = None
+    # 컬럼형 재무 시계열 {"ticker": [...], "period": [...], "end": [...], "revenue": [...], ...}
+    financials: Optional[dict[str, list[Any]]] = None
+    # 컬럼형 DART 주요계정 {"stock_code": [...], "period": ["FY", ..., "Q3", ...], "end": [...], "revenue": [...], ...}
+    dart_financials: Optional[dict[str, list[Any]]] = None
     youtube: list[dict[str, Any]] = Field(default_factory=list)
     papers: list[dict[str, Any]] = Field(default_factory=list)
     reports: list[dict[str, Any]] = Field(default_factory=list)
@@ -39,3 +46,20 @@ class ResearchResponse(BaseModel):
     slug: str
     results: ResearchResults
     meta: ResearchMeta
+
+
+class ResearchSourceEvent(BaseModel):
+    """스트리밍 이벤트: (query, source) 하나가 끝났을 때."""
+    event: Literal["source"] = "source"
+    query: str
+    source: str
+    elapsed_ms: float
+    data: Any = None
+    error: Optional[ErrorItem] = None
+    cache: str = "miss"  # "hit": 소스 단위 캐시에서 바로 응답
+
+
+class ResearchDoneEvent(BaseModel):
+    """스트리밍 마지막 이벤트: 비스트리밍 엔드포인트와 같은 병합 응답."""
+    event: Literal["done"] = "done"
+    response: ResearchResponse
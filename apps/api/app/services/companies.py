@@ -0,0 +1,165 @@
+"""
+회사명 / 종목코드 / 티커 → 회사 resolver + 자동완성.
+
+DART 상장사(corp_index, 종목코드 있는 회사)와 SEC 티커 목록(ticker_index)을 합쳐
+정규화한 키의 정렬 배열 하나로 들고 있는다.
+- 정확히 일치: dict 조회 (O(1))
+- 접두어 검색: 정렬 배열에서 bisect로 범위를 찾고 앞쪽 MAX_SCAN개만 순위를 매긴다 (O(log n + k))
+- 정규화: NFKC(㈜ → (주)) 후 (주)/주식회사 같은 법인 표기와 Inc./Corp. 같은 영문 접미사, 공백/기호를 없애고 casefold
+원본 인덱스가 교체되면(generation이 바뀌면) 다음 조회 때 다시 만든다.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, NamedTuple
+
+from app.config import SEC_OFFLINE
+from app.services.dart_corps import corp_index
+from app.services.sec_tickers import ticker_index
+
+MAX_SCAN = 500
+MAX_LIMIT = 50
+# 원본 인덱스를 못 채웠을 때 다시 시도하기까지(초). 키 입력마다 upstream을 두드리지 않도록
+SOURCE_RETRY_SECONDS = 60
+
+_KR_CORP_MARKS = re.compile(r"\((?:주|유|사|재|합)\)|주식회사|유한회사|유한책임회사")
+_EN_SUFFIX = re.compile(
+    r"(?:[\s,]+(?:inc|incorporated|corp|corporation|co|company|ltd|limited|llc|plc|sa|ag|nv|se|/[a-z]{2}/?)\.?)+\s*$",
+    re.I,
+)
+_NON_WORD = re.compile(r"[\W_]+")
+_HANGUL = re.compile(r"[가-힣ㄱ-ㆎ]")
+
+
+class Company(NamedTuple):
+    market: str  # "KR" (DART) / "US" (SEC)
+    code: str  # 종목코드 6자리 / 티커
+    name: str
+    corp_id: str  # DART 고유번호 / SEC CIK
+
+
+def normalize(text: str) -> str:
+    """검색 키 정규화: "(주) 삼성 전자" → "삼성전자", "Apple Inc." → "apple"."""
+    s = unicodedata.normalize("NFKC", text or "")
+    s = _KR_CORP_MARKS.sub(" ", s)
+    s = _EN_SUFFIX.sub("", s.strip())
+    return _NON_WORD.sub("", s).casefold()
+
+
+class CompanyIndex:
+    """정렬된 (키, 회사) 배열 + 정확 일치 dict. 만든 뒤에는 읽기 전용."""
+
+    def __init__(self, companies: list[Company]) -> None:
+        pairs: list[tuple[str, int]] = []
+        self.companies = companies
+        self._exact: dict[str, list[int]] = {}
+        for i, company in enumerate(companies):
+            keys = {normalize(company.name), company.code.casefold()}
+            for key in keys:
+                if key:
+                    pairs.append((key, i))
+                    self._exact.setdefault(key, []).append(i)
+        pairs.sort()
+        self._keys = [k for k, _ in pairs]
+        self._ids = [i for _, i in pairs]
+
+    def __len__(self) -> int:
+        return len(self.companies)
+
+    def resolve(self, query: str) -> Company | None:
+        """정규화 키가 정확히 같은 회사. 여럿이면 질의 문자(한글/영문)에 맞는 시장을 우선."""
+        key = normalize(query)
+        ids = self._exact.get(key)
+        if not ids:
+            return None
+        prefer = _preferred_market(query)
+        return min((self.companies[i] for i in ids), key=lambda c: (c.market != prefer, len(c.name)))
+
+    def suggest(self, query: str, limit: int = 10, market: str | None = None) -> list[Company]:
+        """접두어 자동완성. 정확 일치 → 선호 시장 → 키가 짧은 순."""
+        key = normalize(query)
+        if not key:
+            return []
+        prefer = _preferred_market(query)
+        lo = bisect.bisect_left(self._keys, key)
+        hi = min(len(self._keys), lo + MAX_SCAN)
+        ranked: dict[int, tuple[Any, ...]] = {}
+        for pos in range(lo, hi):
+            found = self._keys[pos]
+            if not found.startswith(key):
+                break
+            i = self._ids[pos]
+            company = self.companies[i]
+            if market and company.market != market:
+                continue
+            rank = (found != key, company.market != prefer, len(found), found)
+            if i not in ranked or rank < ranked[i]:
+                ranked[i] = rank
+        ordered = sorted(ranked, key=ranked.__getitem__)
+        return [self.companies[i] for i in ordered[:limit]]
+
+
+def _preferred_market(query: str) -> str:
+    q = (query or "").strip()
+    return "KR" if _HANGUL.search(q) or q.isdigit() else "US"
+
+
+def _build() -> CompanyIndex:
+    companies = [Company("KR", e.stock_code, e.corp_name, e.corp_code) for e in corp_index.entries() if e.stock_code]
+    companies.extend(Company("US", e.ticker, e.name, e.cik) for e in ticker_index.entries())
+    return CompanyIndex(companies)
+
+
+_lock = threading.Lock()
+_state: dict[str, Any] = {"index": None, "sources": None}
+_failed_at: dict[str, float] = {}
+
+
+def get_index() -> CompanyIndex:
+    """원본 인덱스가 교체됐을 때만 다시 만든다."""
+    sources = (corp_index.generation, ticker_index.generation)
+    index = _state["index"]
+    if index is not None and _state["sources"] == sources:
+        return index
+    with _lock:
+        if _state["index"] is None or _state["sources"] != sources:
+            _state["index"], _state["sources"] = _build(), sources
+        return _state["index"]
+
+
+async def _aensure_sources() -> None:
+    """DART/SEC 원본 인덱스를 준비. 한쪽이 실패해도 나머지로 동작한다."""
+    from app.services.dart import aensure_corp_index
+    from app.services.sec import arefresh_ticker_index
+
+    jobs = {"dart": aensure_corp_index}
+    if not SEC_OFFLINE:
+        jobs["sec"] = arefresh_ticker_index
+    for name, ensure in jobs.items():
+        if time.monotonic() - _failed_at.get(name, -SOURCE_RETRY_SECONDS) < SOURCE_RETRY_SECONDS:
+            continue
+        try:
+            await ensure()
+        except Exception:
+            _failed_at[name] = time.monotonic()
+
+
+async def _aget_index() -> CompanyIndex:
+    await _aensure_sources()
+    if _state["index"] is not None and _state["sources"] == (corp_index.generation, ticker_index.generation):
+        return _state["index"]
+    # 재생성(수만 건 정규화/정렬)은 이벤트 루프 밖에서
+    return await asyncio.to_thread(get_index)
+
+
+async def aresolve(query: str) -> Company | None:
+    return (await _aget_index()).resolve(query)
+
+
+async def asuggest(query: str, limit: int = 10, market: str | None = None) -> list[Company]:
+    return (await _aget_index()).suggest(query, max(1, min(limit, MAX_LIMIT)), market)
@@ -1,76 +1,254 @@
 """DART Open API: domestic filings. Uses DART_API_KEY from env."""
 from __future__ import annotations
 
-import io
+import asyncio
 import re
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from xml.etree import ElementTree as ET
 
+import httpx
 import requests
 
+from app import cache, http
 from app.config import DART_API_KEY
+from app.services.dart_corps import corp_index, parse_corp_zip
+from app.singleflight import AsyncSingleFlight, async_single_flight, single_flight
 
 DART_LIST_URL = "https://opendart.fss.or.kr/api/list.json"
 DART_CORPCODE_URL = "https://opendart.fss.or.kr/api/corpCode.xml"
 DART_VIEW_URL = "https://dart.fss.or.kr/dsaf001/main.do?rcpNo={rcp_no}"
 TIMEOUT = 35
+CORPS_RETRY_SECONDS = 60
+PAGE_COUNT = 100
+# 공시목록 조회 창: (공시 상세유형, 기간(일)). 사업보고서 5년, 반기/분기 최근 4건이 들어갈 2년, 주요사항 1년
+LIST_WINDOWS = (("A001", 365 * 5), ("A002", 365 * 2), ("A003", 365 * 2), ("B001", 365))
+# 동기 경로에서 창/페이지를 동시에 받는 스레드 수
+LIST_WORKERS = 4
+NO_DATA_STATUS = "013"
+# daily_only 조회 창: 정기공시(A)·주요사항(B) 전체를 어제~오늘 두 날짜로만 조회
+DAILY_WINDOWS = (("A", 1), ("B", 1))
+DAILY_MARKET_TTL_SECONDS = 10 * 60
 
 ANNUAL_KEYWORDS = ("사업보고서",)
 QUARTERLY_KEYWORDS = ("반기보고서", "1분기보고서", "3분기보고서")
 MAJOR_EVENT_KEYWORDS = ("주요사항보고서",)
 
+_corps_flight = AsyncSingleFlight()
+_market_flight = AsyncSingleFlight()
+_background: set[asyncio.Future] = set()
 
-def _get_corp_code_from_stock_code(stock_code: str, api_key: str) -> tuple[str, str]:
+
+def _normalize_stock_code(stock_code: str) -> str:
     code = re.sub(r"\D", "", stock_code)
     if len(code) < 6:
         raise ValueError(f"종목번호는 6자리 이상이어야 합니다: {stock_code}")
-    code = code.zfill(6)
-    resp = requests.get(DART_CORPCODE_URL, params={"crtfc_key": api_key}, timeout=60)
-    resp.raise_for_status()
-    with zipfile.ZipFile(io.BytesIO(resp.content), "r") as z:
-        names = z.namelist()
-        xml_name = next((n for n in names if n.lower().endswith(".xml")), names[0])
-        with z.open(xml_name) as f:
-            tree = ET.parse(f)
-    root = tree.getroot()
-    for c in root.findall(".//list"):
-        sc = (c.findtext("stock_code") or "").strip()
-        if sc == code:
-            corp_code = (c.findtext("corp_code") or "").strip()
-            corp_name = (c.findtext("corp_name") or "").strip()
-            return corp_code, corp_name
-    raise ValueError(f"종목번호에 해당하는 회사를 찾을 수 없습니다: {stock_code}")
-
-
-def _fetch_list(corp_code: str, bgn_de: str, end_de: str, api_key: str) -> list[dict]:
-    all_items: list[dict] = []
-    page_no = 1
-    while True:
-        r = requests.get(
-            DART_LIST_URL,
-            params={
-                "crtfc_key": api_key,
-                "corp_code": corp_code,
-                "bgn_de": bgn_de,
-                "end_de": end_de,
-                "page_no": page_no,
-                "page_count": 100,
-            },
-            timeout=TIMEOUT,
-        )
-        r.raise_for_status()
-        data = r.json()
-        if data.get("status") != "000":
-            raise RuntimeError(data.get("message", "DART API 오류"))
-        lst = data.get("list") or []
-        if not lst:
-            break
-        all_items.extend(lst)
-        if len(lst) < 100:
-            break
-        page_no += 1
-    return all_items
+    return code.zfill(6)
+
+
+def _fetch_corp_rows(api_key: str) -> list[tuple[str, str, str, str]]:
+    resp = http.get(DART_CORPCODE_URL, params={"crtfc_key": api_key}, timeout=60)
+    http.raise_for_status(resp, "dart")
+    return parse_corp_zip(resp.content)
+
+
+def _refresh_corp_index(api_key: str) -> None:
+    """인덱스가 비었거나 오래됐으면 corpCode.xml을 다시 받아 반영 (스레드 간 한 번만)."""
+    with corp_index.lock:
+        if not corp_index.needs_refresh():
+            return
+        try:
+            corp_index.apply(_fetch_corp_rows(api_key))
+        except (requests.RequestException, http.UpstreamError, ValueError, zipfile.BadZipFile, ET.ParseError):
+            if not len(corp_index):
+                raise
+            corp_index.postpone(CORPS_RETRY_SECONDS)
+
+
+async def _afetch_corp_index(api_key: str) -> None:
+    try:
+        resp = await http.aget(DART_CORPCODE_URL, params={"crtfc_key": api_key}, timeout=60)
+        http.raise_for_status(resp, "dart")
+        # 압축 해제/XML 파싱과 인덱스 교체(lock 안)·디스크 저장은 이벤트 루프 밖에서
+        rows = await asyncio.to_thread(parse_corp_zip, resp.content)
+        await asyncio.to_thread(corp_index.apply, rows)
+    except (httpx.HTTPError, http.UpstreamError, ValueError, zipfile.BadZipFile, ET.ParseError):
+        if not len(corp_index):
+            raise
+        corp_index.postpone(CORPS_RETRY_SECONDS)
+
+
+async def arefresh_corp_index(api_key: str | None = DART_API_KEY) -> None:
+    """_refresh_corp_index의 async 버전. 동시에 들어온 갱신은 하나로 합친다."""
+    if api_key and corp_index.needs_refresh():
+        await _corps_flight.do(DART_CORPCODE_URL, partial(_afetch_corp_index, api_key))
+
+
+def _schedule_corp_refresh(api_key: str) -> None:
+    """오래된 인덱스는 그대로 쓰고 갱신은 백그라운드로 돌린다."""
+    task = asyncio.ensure_future(arefresh_corp_index(api_key))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    # 실패는 postpone으로 처리되므로 여기서는 예외만 회수
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+def _corp_from_index(code: str, stock_code: str) -> tuple[str, str]:
+    entry = corp_index.lookup_stock(code)
+    if entry is None:
+        raise ValueError(f"종목번호에 해당하는 회사를 찾을 수 없습니다: {stock_code}")
+    return entry.corp_code, entry.corp_name
+
+
+def _get_corp_code_from_stock_code(stock_code: str, api_key: str) -> tuple[str, str]:
+    code = _normalize_stock_code(stock_code)
+    _refresh_corp_index(api_key)
+    return _corp_from_index(code, stock_code)
+
+
+async def aensure_corp_index(api_key: str | None = DART_API_KEY) -> None:
+    """비어 있으면 채울 때까지 기다리고, 오래됐으면 기존 인덱스를 쓰면서 백그라운드로 갱신."""
+    if not api_key or not corp_index.needs_refresh():
+        return
+    if len(corp_index):
+        _schedule_corp_refresh(api_key)
+    else:
+        await arefresh_corp_index(api_key)
+
+
+async def _aget_corp_code_from_stock_code(stock_code: str, api_key: str) -> tuple[str, str]:
+    code = _normalize_stock_code(stock_code)
+    await aensure_corp_index(api_key)
+    return _corp_from_index(code, stock_code)
+
+
+def _list_params(
+    corp_code: str, bgn_de: str, end_de: str, api_key: str, page_no: int, detail_ty: str | None = None
+) -> dict:
+    params = {
+        "crtfc_key": api_key,
+        "bgn_de": bgn_de,
+        "end_de": end_de,
+        "page_no": page_no,
+        "page_count": PAGE_COUNT,
+    }
+    if corp_code:
+        # 없으면 시장 전체 (DART는 이때 조회 기간을 3개월로 제한)
+        params["corp_code"] = corp_code
+    if detail_ty:
+        # 공시유형(A 정기, B 주요사항)과 상세유형(A001 등)으로 서버에서 거른다
+        params["pblntf_ty"] = detail_ty[0]
+        if len(detail_ty) > 1:
+            params["pblntf_detail_ty"] = detail_ty
+    return params
+
+
+def _list_page(data: dict) -> tuple[list[dict], int]:
+    """list.json 응답 → (항목, 전체 페이지 수). 조회 결과 없음(013)은 빈 목록."""
+    status = data.get("status")
+    if status == NO_DATA_STATUS:
+        return [], 0
+    if status != "000":
+        raise http.UpstreamError("dart", detail=f"{status} {data.get('message', 'DART API 오류')}")
+    return data.get("list") or [], int(data.get("total_page") or 1)
+
+
+def _window_params(
+    corp_code: str, end_date: datetime, api_key: str, windows: tuple[tuple[str, int], ...]
+) -> list[dict]:
+    """조회 창마다 첫 페이지 요청 파라미터."""
+    end_de = end_date.strftime("%Y%m%d")
+    return [
+        _list_params(corp_code, (end_date - timedelta(days=days)).strftime("%Y%m%d"), end_de, api_key, 1, detail_ty)
+        for detail_ty, days in windows
+    ]
+
+
+def _rest_params(first_params: list[dict], firsts: list[tuple[list[dict], int]]) -> list[dict]:
+    """첫 페이지에서 알게 된 전체 페이지 수로 나머지 페이지 요청 파라미터를 만든다."""
+    return [
+        {**params, "page_no": page_no}
+        for params, (_, total_page) in zip(first_params, firsts)
+        for page_no in range(2, total_page + 1)
+    ]
+
+
+def _get_list_page(params: dict) -> tuple[list[dict], int]:
+    r = http.get(DART_LIST_URL, params=params, timeout=TIMEOUT)
+    http.raise_for_status(r, "dart")
+    return _list_page(r.json())
+
+
+async def _aget_list_page(params: dict) -> tuple[list[dict], int]:
+    r = await http.aget(DART_LIST_URL, params=params, timeout=TIMEOUT)
+    http.raise_for_status(r, "dart")
+    return _list_page(r.json())
+
+
+def _fetch_list(
+    corp_code: str, end_date: datetime, api_key: str, windows: tuple[tuple[str, int], ...] = LIST_WINDOWS
+) -> list[dict]:
+    """유형별 기간 창의 첫 페이지를 동시에 받고, 남은 페이지도 한 번에 동시에 받는다."""
+    first_params = _window_params(corp_code, end_date, api_key, windows)
+    with ThreadPoolExecutor(max_workers=LIST_WORKERS) as pool:
+        firsts = list(pool.map(_get_list_page, first_params))
+        rest = list(pool.map(_get_list_page, _rest_params(first_params, firsts)))
+    return [item for items, _ in firsts + rest for item in items]
+
+
+async def _afetch_list(
+    corp_code: str, end_date: datetime, api_key: str, windows: tuple[tuple[str, int], ...] = LIST_WINDOWS
+) -> list[dict]:
+    first_params = _window_params(corp_code, end_date, api_key, windows)
+    firsts = list(await asyncio.gather(*(_aget_list_page(p) for p in first_params)))
+    rest = await asyncio.gather(*(_aget_list_page(p) for p in _rest_params(first_params, firsts)))
+    return [item for items, _ in firsts + list(rest) for item in items]
+
+
+def _daily_market_key(end_date: datetime) -> str:
+    return f"dart:daily-market:{end_date:%Y%m%d}"
+
+
+def _market_items(market: list[dict], corp_code: str) -> list[dict]:
+    return [item for item in market if item.get("corp_code") == corp_code]
+
+
+async def aprefetch_daily_market(api_key: str | None = DART_API_KEY) -> int:
+    """
+    관심종목 여러 개를 daily_only로 조회하기 전에 시장 전체(corp_code 없이)의 최근 이틀치 정기/주요사항 공시를
+    한 번 받아 캐시한다. 이후 종목별 daily 조회는 이 목록에서 corp_code로 골라 쓴다. 받은 항목 수를 반환.
+    """
+    if not api_key:
+        return 0
+    end_date = datetime.now()
+    key = _daily_market_key(end_date)
+    cached = await cache.aget(key)
+    if cached is not None:
+        return len(cached)
+
+    async def _load() -> list[dict]:
+        items = await _afetch_list("", end_date, api_key, DAILY_WINDOWS)
+        await cache.aset_(key, items, DAILY_MARKET_TTL_SECONDS)
+        return items
+
+    return len(await _market_flight.do(key, _load))
+
+
+def _daily_list(corp_code: str, end_date: datetime, api_key: str) -> list[dict]:
+    """daily_only용: 시장 전체 목록이 캐시에 있으면 거기서, 없으면 이 회사의 최근 이틀치만 조회."""
+    market = cache.get(_daily_market_key(end_date))
+    if market is not None:
+        return _market_items(market, corp_code)
+    return _fetch_list(corp_code, end_date, api_key, DAILY_WINDOWS)
+
+
+async def _adaily_list(corp_code: str, end_date: datetime, api_key: str) -> list[dict]:
+    market = await cache.aget(_daily_market_key(end_date))
+    if market is not None:
+        return _market_items(market, corp_code)
+    return await _afetch_list(corp_code, end_date, api_key, DAILY_WINDOWS)
 
 
 def _parse_rcept_dt(dt_str: str) -> str:
@@ -110,6 +288,7 @@ def _filter_last_24h(records: list[dict]) -> list[dict]:
     return filtered
 
 
+@single_flight
 def collect_dart_reports(stock_code: str, daily_only: bool = False) -> list[dict]:
     """
     5y annual + 4 quarters + recent 1y major events(주요사항보고서).
@@ -122,18 +301,38 @@ def collect_dart_reports(stock_code: str, daily_only: bool = False) -> list[dict
       - url
 
     daily_only=False: 기존과 동일 동작.
-    daily_only=True : 전체 결과 중에서 제출일 기준 최근 24시간(UTC 기준) 이내만 반환.
+    daily_only=True : 어제~오늘 제출분만 조회해(시장 전체 목록이 캐시돼 있으면 거기서 골라)
+                      제출일 기준 최근 24시간(UTC 기준) 이내만 반환.
     """
     if not DART_API_KEY:
         raise ValueError("DART_API_KEY 환경변수가 설정되지 않았습니다.")
     corp_code, corp_name = _get_corp_code_from_stock_code(stock_code, DART_API_KEY)
 
     end_date = datetime.now()
-    bgn_date = end_date - timedelta(days=365 * 5)
-    bgn_de = bgn_date.strftime("%Y%m%d")
-    end_de = end_date.strftime("%Y%m%d")
+    if daily_only:
+        raw = _daily_list(corp_code, end_date, DART_API_KEY)
+    else:
+        raw = _fetch_list(corp_code, end_date, DART_API_KEY)
+    return _build_reports(raw, corp_name, end_date, daily_only)
+
+
+@async_single_flight
+async def acollect_dart_reports(stock_code: str, daily_only: bool = False) -> list[dict]:
+    """collect_dart_reports의 async 버전."""
+    if not DART_API_KEY:
+        raise ValueError("DART_API_KEY 환경변수가 설정되지 않았습니다.")
+    corp_code, corp_name = await _aget_corp_code_from_stock_code(stock_code, DART_API_KEY)
+
+    end_date = datetime.now()
+    if daily_only:
+        raw = await _adaily_list(corp_code, end_date, DART_API_KEY)
+    else:
+        raw = await _afetch_list(corp_code, end_date, DART_API_KEY)
+    return _build_reports(raw, corp_name, end_date, daily_only)
+
 
-    raw = _fetch_list(corp_code, bgn_de, end_de, DART_API_KEY)
+def _build_reports(raw: list[dict], corp_name: str, end_date: datetime, daily_only: bool) -> list[dict]:
+    """공시목록 원본에서 연간 5건 + 분기 4건 + 최근 1년 주요사항을 골라 정리."""
     results: list[dict] = []
 
     for item in raw:
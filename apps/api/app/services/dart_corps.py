@@ -0,0 +1,181 @@
+"""
+DART corpCode.xml 로컬 인덱스.
+
+공시대상회사 전체 목록(zip 안의 수십 MB XML)을 요청마다 받지 않고, 한 번 받아
+종목코드 / 고유번호(corp_code) / 회사명 → CorpEntry dict로 들고 O(1)로 조회한다.
+- XML은 iterparse로 <list> 단위로 읽고 바로 버려 DOM 전체를 메모리에 올리지 않는다
+- 처음 쓸 때 디스크 사본(DART_CORPS_PATH)이 있으면 그걸로 시작하고 DART_CORPS_REFRESH_SECONDS마다 다시 받는다
+- DART는 전체 zip만 제공하므로, 받은 목록을 modify_date로 비교해 바뀐 행이 없으면 인덱스/디스크를 그대로 둔다
+- 갱신이 실패해도 기존 인덱스가 있으면 그대로 쓴다
+- 조회용 dict 세 개는 하나의 _Tables로 묶어 한 번에 교체하므로 조회는 락 없이 해도 늘 같은 세대를 본다.
+  상태 교체(apply/디스크 적재)는 lock 안에서 한다
+네트워크 호출은 services.dart가 하고, 이 모듈은 인덱스 상태와 파싱/저장만 맡는다.
+"""
+from __future__ import annotations
+
+import io
+import json
+import re
+import threading
+import time
+import zipfile
+from typing import Any, NamedTuple
+from xml.etree import ElementTree as ET
+
+from app.config import DART_CORPS_PATH, DART_CORPS_REFRESH_SECONDS
+from app.utils import write_atomic
+
+_SPACES = re.compile(r"\s+")
+
+
+class CorpEntry(NamedTuple):
+    corp_code: str
+    corp_name: str
+    stock_code: str
+    modify_date: str
+
+
+class _Tables(NamedTuple):
+    by_corp: dict[str, CorpEntry]
+    by_stock: dict[str, CorpEntry]
+    by_name: dict[str, CorpEntry]
+
+
+def normalize_name(name: str) -> str:
+    """이름 조회 키: 공백 제거 + casefold."""
+    return _SPACES.sub("", name or "").casefold()
+
+
+def parse_corp_zip(content: bytes) -> list[tuple[str, str, str, str]]:
+    """corpCode.xml zip 본문 → [(corp_code, corp_name, stock_code, modify_date)]."""
+    if not content.startswith(b"PK"):
+        # 키 오류 등은 zip 대신 에러 XML/JSON이 온다
+        raise ValueError(f"DART corpCode 응답이 zip이 아닙니다: {content[:200].decode('utf-8', 'replace')}")
+    rows: list[tuple[str, str, str, str]] = []
+    with zipfile.ZipFile(io.BytesIO(content), "r") as z:
+        names = z.namelist()
+        xml_name = next((n for n in names if n.lower().endswith(".xml")), names[0])
+        with z.open(xml_name) as f:
+            for _, elem in ET.iterparse(f, events=("end",)):
+                if elem.tag != "list":
+                    continue
+                corp_code = (elem.findtext("corp_code") or "").strip()
+                if corp_code:
+                    rows.append(
+                        (
+                            corp_code,
+                            (elem.findtext("corp_name") or "").strip(),
+                            (elem.findtext("stock_code") or "").strip(),
+                            (elem.findtext("modify_date") or "").strip(),
+                        )
+                    )
+                elem.clear()
+    return rows
+
+
+class CorpIndex:
+    def __init__(self, path: str = DART_CORPS_PATH, refresh_seconds: float = DART_CORPS_REFRESH_SECONDS) -> None:
+        self.path = path if path and path != "off" else ""
+        self.refresh_seconds = refresh_seconds
+        # 동기 갱신은 lock을 잡은 채 apply를 부르므로 재진입 가능해야 한다
+        self.lock = threading.RLock()
+        self._tables = _Tables({}, {}, {})
+        self._checked_at = 0.0  # 마지막으로 upstream과 맞춰 본 시각 (wall clock)
+        self._disk_loaded = False
+        self.last_changes = 0
+        self.generation = 0  # _replace마다 +1 (파생 인덱스 재생성 판단용)
+
+    def __len__(self) -> int:
+        return len(self._tables.by_corp)
+
+    def entries(self) -> list[CorpEntry]:
+        return list(self._tables.by_corp.values())
+
+    def lookup_stock(self, stock_code: str) -> CorpEntry | None:
+        return self._tables.by_stock.get((stock_code or "").strip())
+
+    def lookup_corp(self, corp_code: str) -> CorpEntry | None:
+        return self._tables.by_corp.get((corp_code or "").strip())
+
+    def lookup_name(self, name: str) -> CorpEntry | None:
+        return self._tables.by_name.get(normalize_name(name))
+
+    def needs_refresh(self) -> bool:
+        """디스크 사본을 (한 번) 읽은 뒤에도 비었거나 refresh_seconds가 지났으면 True."""
+        if not self._disk_loaded:
+            with self.lock:
+                if not self._disk_loaded:
+                    self._load_disk()
+        return not self._tables.by_corp or time.time() - self._checked_at >= self.refresh_seconds
+
+    def postpone(self, seconds: float) -> None:
+        """갱신 실패 시 기존 인덱스로 버티면서 seconds 뒤에 다시 시도하도록 미룬다."""
+        # 값 하나만 바꾸므로 락 없이 (이벤트 루프에서도 불리며, 동기 갱신은 다운로드 중에도 lock을 잡고 있다)
+        self._checked_at = time.time() - self.refresh_seconds + seconds
+
+    def apply(self, rows: list[Any]) -> int:
+        """
+        새로 받은 전체 목록 반영. 추가/수정/삭제된 행 수를 반환하고, 0이면 인덱스는 그대로 둔다.
+        dict 생성과 디스크 저장이 있으므로 async 호출자는 스레드에서 부른다.
+        """
+        with self.lock:
+            self._checked_at = time.time()
+            current = self._tables.by_corp
+            seen = 0
+            changed = 0
+            for corp_code, _, _, modify_date in rows:
+                old = current.get(corp_code)
+                if old is None or old.modify_date != modify_date:
+                    changed += 1
+                else:
+                    seen += 1
+            changed += len(current) - seen
+            self.last_changes = changed
+            if changed:
+                self._replace(rows)
+            self._save_disk()
+            return changed
+
+    def _replace(self, rows: list[Any]) -> None:
+        by_corp: dict[str, CorpEntry] = {}
+        by_stock: dict[str, CorpEntry] = {}
+        by_name: dict[str, CorpEntry] = {}
+        for row in rows:
+            entry = CorpEntry(*row)
+            by_corp[entry.corp_code] = entry
+            if entry.stock_code:
+                by_stock[entry.stock_code] = entry
+            key = normalize_name(entry.corp_name)
+            # 같은 이름이 여럿이면 상장사를 우선
+            if key and (key not in by_name or (entry.stock_code and not by_name[key].stock_code)):
+                by_name[key] = entry
+        # 참조 하나만 바꾸므로 조회 쪽은 락 없이 읽어도 세 dict가 어긋나지 않는다
+        self._tables = _Tables(by_corp, by_stock, by_name)
+        self.generation += 1
+
+    def _load_disk(self) -> None:
+        self._disk_loaded = True
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._replace(data["rows"])
+            self._checked_at = float(data.get("checked_at") or 0)
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+
+    def _save_disk(self) -> None:
+        if not self.path:
+            return
+        data = {
+            "checked_at": self._checked_at,
+            "rows": [list(e) for e in self._tables.by_corp.values()],
+        }
+        try:
+            write_atomic(self.path, json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        except OSError:
+            return
+
+
+corp_index = CorpIndex()
@@ -0,0 +1,367 @@
+"""
+DART 재무제표 (국내 종목).
+
+- 주요계정: 다중회사 주요계정 API(fnlttMultiAcnt.json)에 corp_code를 쉼표로 묶어(최대 MULTI_BATCH개)
+  (사업연도, 보고서)마다 한 번씩 요청한다. 관심종목 30개도 기간 수만큼의 요청이면 된다.
+- 전체 재무제표: 단일회사 전체 재무제표 API(fnlttSinglAcntAll.json). 회사·기간 하나씩.
+- 캐시는 (회사, 사업연도, 보고서 코드) 단위라 관심종목 구성이 바뀌어도 받은 회사/기간은 다시 요청하지 않는다.
+
+주요계정 결과는 컬럼형으로 돌려준다 (연간 최신순, 이어서 분기 최신순).
+
+    {"stock_code": [...], "corp_name": [...], "period": ["FY", ..., "Q3", "Q2", ...], "end": ["2024-12-31", ...],
+     "end_nominal": [False, ...], "fiscal_year": [...], "fs_div": ["CFS", ...], "revenue": [...], ...}
+
+손익 항목의 분기 값은 해당 3개월 금액(당기금액), 재무상태표 항목은 기간 말 잔액이다.
+end는 응답의 당기일자(thstrm_dt)에서 읽은 실제 기간 말이다. 없으면 12월 결산을 가정한 명목 기간 말
+(REPORTS)이고 end_nominal이 True다.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from datetime import date
+from typing import Any, Iterable
+
+from app import cache, http
+from app.config import DART_API_KEY, DART_FINANCIALS_TTL_SECONDS
+from app.services.dart import TIMEOUT, _normalize_stock_code, _refresh_corp_index, aensure_corp_index
+from app.services.dart_corps import CorpEntry, corp_index
+from app.singleflight import async_single_flight, single_flight
+
+MULTI_ACCOUNT_URL = "https://opendart.fss.or.kr/api/fnlttMultiAcnt.json"
+FULL_STATEMENT_URL = "https://opendart.fss.or.kr/api/fnlttSinglAcntAll.json"
+# 다중회사 조회 한 번에 넣는 corp_code 수
+MULTI_BATCH = 100
+MAX_YEARS = 5
+MAX_QUARTERS = 4
+NO_DATA_STATUS = "013"
+# 아직 제출 전인 기간(013)은 짧게 캐시해 제출되면 곧 잡히게 한다
+NO_DATA_TTL_SECONDS = 60 * 60
+
+# 보고서 코드 -> (period, 12월 결산 기준 명목 기간 말 월-일)
+REPORTS: dict[str, tuple[str, str]] = {
+    "11011": ("FY", "12-31"),
+    "11014": ("Q3", "09-30"),
+    "11012": ("Q2", "06-30"),
+    "11013": ("Q1", "03-31"),
+}
+QUARTER_REPORTS = ("11014", "11012", "11013")
+REPORT_ALIASES = {
+    "annual": "11011", "fy": "11011", "q3": "11014", "h1": "11012", "half": "11012", "q2": "11012", "q1": "11013",
+}
+FS_DIVS = ("CFS", "OFS")  # 연결 우선, 없으면 별도
+
+# 주요계정 account_nm(공백/"(손실)" 제거) -> metric
+ACCOUNTS = {
+    "매출액": "revenue",
+    "영업이익": "operating_income",
+    "법인세차감전순이익": "pretax_income",
+    "당기순이익": "net_income",
+    "유동자산": "current_assets",
+    "자산총계": "total_assets",
+    "유동부채": "current_liabilities",
+    "부채총계": "total_liabilities",
+    "이익잉여금": "retained_earnings",
+    "자본총계": "equity",
+}
+METRICS = list(ACCOUNTS.values())
+STATEMENT_COLUMNS = (
+    "sj_div", "sj_nm", "account_id", "account_nm", "thstrm_nm", "thstrm_amount",
+    "frmtrm_nm", "frmtrm_amount", "bfefrmtrm_nm", "bfefrmtrm_amount", "currency",
+)
+_AMOUNT_FIELDS = ("thstrm_amount", "frmtrm_amount", "bfefrmtrm_amount", "thstrm_add_amount", "frmtrm_add_amount")
+_ACCOUNT_NOISE = re.compile(r"\s+|\(손실\)")
+_TERM_DATE = re.compile(r"(\d{4})\.\s*(\d{1,2})\.\s*(\d{1,2})")
+
+Period = tuple[str, str]  # (사업연도, 보고서 코드)
+
+
+def parse_amount(value: Any) -> int | None:
+    """"1,234,567" / "-1,234" → int. "-"나 빈 값은 None."""
+    s = str(value or "").replace(",", "").strip()
+    try:
+        return int(s)
+    except ValueError:
+        return None
+
+
+def resolve_report(report: str) -> str:
+    code = REPORT_ALIASES.get((report or "").strip().lower(), (report or "").strip())
+    if code not in REPORTS:
+        raise ValueError(f"report must be one of annual, q1, h1, q3 or a DART reprt_code: {report}")
+    return code
+
+
+def period_end(year: str, reprt_code: str) -> str:
+    """12월 결산 기준 명목 기간 말. 결산월이 다른 회사는 실제와 다르다 (term_end 참고)."""
+    return f"{year}-{REPORTS[reprt_code][1]}"
+
+
+def term_end(thstrm_dt: Any) -> str | None:
+    """당기일자("2024.12.31 현재" / "2024.01.01 ~ 2024.12.31")의 마지막 날짜 → YYYY-MM-DD."""
+    found = _TERM_DATE.findall(str(thstrm_dt or ""))
+    if not found:
+        return None
+    year, month, day = found[-1]
+    return f"{year}-{int(month):02d}-{int(day):02d}"
+
+
+def candidate_periods(today: date, max_years: int = MAX_YEARS, max_quarters: int = MAX_QUARTERS) -> list[Period]:
+    """
+    조회할 (사업연도, 보고서) 목록. 기간이 끝나지 않은 보고서는 빼고, 아직 제출 전일 수 있는 최근 것을 감안해
+    연간·분기 모두 한두 개 더 넣는다 (제출 전이면 013 → 빈 값으로 짧게 캐시).
+    """
+    annual = [(str(today.year - i), "11011") for i in range(1, max_years + 2)]
+    quarterly: list[Period] = []
+    for year in range(today.year, today.year - (max_quarters + 2) // 3 - 1, -1):
+        for code in QUARTER_REPORTS:
+            if period_end(str(year), code) < today.isoformat():
+                quarterly.append((str(year), code))
+    return annual + quarterly[: max_quarters + 2]
+
+
+def _multi_key(corp_code: str, period: Period) -> str:
+    return f"dart:fin:{corp_code}:{period[0]}:{period[1]}"
+
+
+def parse_multi(data: dict[str, Any], corps: Iterable[CorpEntry]) -> dict[str, dict[str, Any]]:
+    """
+    fnlttMultiAcnt 응답 → {corp_code: record}. 요청한 회사는 데이터가 없어도 빈 dict로 채운다.
+    응답 행에는 corp_code가 없고 종목코드(stock_code)만 있어 요청한 회사의 종목코드로 되짚는다.
+    record: {"fs_div", "currency", "end", metric: 당기금액, ...} (연결(CFS)이 있으면 연결 값만 쓴다).
+    end는 당기일자(thstrm_dt)가 있는 첫 행의 기간 말.
+    """
+    status = data.get("status")
+    if status not in ("000", NO_DATA_STATUS):
+        raise http.UpstreamError("dart", detail=f"{status} {data.get('message', 'DART API 오류')}")
+    by_stock: dict[str, dict[str, dict[str, Any]]] = {}
+    for row in data.get("list") or []:
+        metric = ACCOUNTS.get(_ACCOUNT_NOISE.sub("", row.get("account_nm") or ""))
+        fs_div = row.get("fs_div") or "OFS"
+        if metric is None or fs_div not in FS_DIVS:
+            continue
+        record = by_stock.setdefault((row.get("stock_code") or "").strip(), {}).setdefault(
+            fs_div, {"fs_div": fs_div, "currency": row.get("currency") or "KRW"}
+        )
+        record.setdefault(metric, parse_amount(row.get("thstrm_amount")))
+        if "end" not in record and (end := term_end(row.get("thstrm_dt"))):
+            record["end"] = end
+    out: dict[str, dict[str, Any]] = {}
+    for corp in corps:
+        divs = by_stock.get(corp.stock_code) or {}
+        out[corp.corp_code] = next((divs[d] for d in FS_DIVS if d in divs), {})
+    return out
+
+
+def _multi_params(corps: list[CorpEntry], period: Period, api_key: str) -> dict[str, Any]:
+    corp_codes = ",".join(c.corp_code for c in corps)
+    return {"crtfc_key": api_key, "corp_code": corp_codes, "bsns_year": period[0], "reprt_code": period[1]}
+
+
+def _missing_batches(
+    corps: list[CorpEntry], periods: list[Period]
+) -> tuple[dict[tuple[str, Period], dict[str, Any]], list[tuple[Period, list[CorpEntry]]]]:
+    """캐시에 있는 (회사, 기간)은 꺼내고, 없는 것만 기간별 MULTI_BATCH개 묶음으로 돌려준다."""
+    found: dict[tuple[str, Period], dict[str, Any]] = {}
+    batches: list[tuple[Period, list[CorpEntry]]] = []
+    for period in periods:
+        missing = []
+        for corp in corps:
+            cached = cache.get(_multi_key(corp.corp_code, period))
+            if cached is None:
+                missing.append(corp)
+            else:
+                found[(corp.corp_code, period)] = cached
+        for i in range(0, len(missing), MULTI_BATCH):
+            batches.append((period, missing[i : i + MULTI_BATCH]))
+    return found, batches
+
+
+def _store_batch(period: Period, records: dict[str, dict[str, Any]], found: dict) -> None:
+    for corp_code, record in records.items():
+        ttl = DART_FINANCIALS_TTL_SECONDS if record else NO_DATA_TTL_SECONDS
+        cache.set_(_multi_key(corp_code, period), record, ttl)
+        found[(corp_code, period)] = record
+
+
+def load_records(
+    corps: list[CorpEntry], periods: list[Period], api_key: str
+) -> dict[tuple[str, Period], dict[str, Any]]:
+    """(corp_code, 기간)별 주요계정. 캐시에 없는 것만 기간별로 묶어 요청한다."""
+    found, batches = _missing_batches(corps, periods)
+    for period, batch in batches:
+        r = http.get(MULTI_ACCOUNT_URL, params=_multi_params(batch, period, api_key), timeout=TIMEOUT)
+        http.raise_for_status(r, "dart")
+        _store_batch(period, parse_multi(r.json(), batch), found)
+    return found
+
+
+async def aload_records(
+    corps: list[CorpEntry], periods: list[Period], api_key: str
+) -> dict[tuple[str, Period], dict[str, Any]]:
+    """load_records의 async 버전. 기간×묶음 요청을 동시에 보낸다 (host 동시 요청 수는 app.http가 제한)."""
+    found, batches = await cache.arun(_missing_batches, corps, periods)
+
+    async def _one(period: Period, batch: list[CorpEntry]) -> None:
+        r = await http.aget(MULTI_ACCOUNT_URL, params=_multi_params(batch, period, api_key), timeout=TIMEOUT)
+        http.raise_for_status(r, "dart")
+        await cache.arun(_store_batch, period, parse_multi(r.json(), batch), found)
+
+    await asyncio.gather(*(_one(p, b) for p, b in batches))
+    return found
+
+
+def build_table(
+    corps: list[CorpEntry],
+    records: dict[tuple[str, Period], dict[str, Any]],
+    periods: list[Period],
+    max_years: int = MAX_YEARS,
+    max_quarters: int = MAX_QUARTERS,
+) -> dict[str, list[Any]]:
+    """
+    회사별로 값이 있는 연간 max_years개 + 분기 max_quarters개를 최신순으로 이어 붙인 컬럼형 표.
+    순서는 회사마다 실제 기간 말(end) 기준 (결산월이 달라도 그 회사 안에서는 맞다).
+    """
+    cols: dict[str, list[Any]] = {
+        c: []
+        for c in (
+            "stock_code", "corp_name", "period", "end", "end_nominal", "fiscal_year", "fs_div", "currency", *METRICS
+        )
+    }
+    for corp in corps:
+        ends = {p: _record_end(records.get((corp.corp_code, p)), p) for p in periods}
+        with_data = sorted((p for p in periods if records.get((corp.corp_code, p))), key=ends.get, reverse=True)
+        annual = [p for p in with_data if p[1] == "11011"][:max_years]
+        quarterly = [p for p in with_data if p[1] != "11011"][:max_quarters]
+        for period in annual + quarterly:
+            record = records[(corp.corp_code, period)]
+            cols["stock_code"].append(corp.stock_code)
+            cols["corp_name"].append(corp.corp_name)
+            cols["period"].append(REPORTS[period[1]][0])
+            cols["end"].append(ends[period])
+            cols["end_nominal"].append(not record.get("end"))
+            cols["fiscal_year"].append(int(period[0]))
+            cols["fs_div"].append(record.get("fs_div"))
+            cols["currency"].append(record.get("currency"))
+            for metric in METRICS:
+                cols[metric].append(record.get(metric))
+    return cols
+
+
+def _record_end(record: dict[str, Any] | None, period: Period) -> str:
+    return (record or {}).get("end") or period_end(*period)
+
+
+def comparison_table(table: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """
+    컬럼형 표 → 회사·계정별 한 행, 기간(FY2024, 2025Q2 …)을 열로 둔 비교표 (엑셀 "DART_Compare" 시트).
+    열은 사업연도·보고서 기준으로 맞춘다 (결산월이 다른 회사는 같은 열이라도 실제 기간 말이 다르다).
+    연간 오래된 순, 이어서 분기 오래된 순.
+    """
+    rows: dict[tuple[str, str], dict[str, Any]] = {}
+    labels: dict[str, tuple[int, int, str]] = {}
+    for i, period in enumerate(table.get("period") or []):
+        year = table["fiscal_year"][i]
+        label = f"FY{year}" if period == "FY" else f"{year}{period}"
+        labels[label] = (0 if period == "FY" else 1, year, period)
+        for metric in METRICS:
+            key = (table["stock_code"][i], metric)
+            row = rows.setdefault(key, {"stock_code": key[0], "corp_name": table["corp_name"][i], "account": metric})
+            row[label] = table[metric][i]
+    order = sorted(labels, key=labels.get)
+    head = ("stock_code", "corp_name", "account")
+    return [{**{k: row[k] for k in head}, **{label: row.get(label) for label in order}} for row in rows.values()]
+
+
+def _corps_for(stock_codes: Iterable[str]) -> list[CorpEntry]:
+    corps = []
+    for stock_code in stock_codes:
+        entry = corp_index.lookup_stock(_normalize_stock_code(stock_code))
+        if entry is None:
+            raise ValueError(f"종목번호에 해당하는 회사를 찾을 수 없습니다: {stock_code}")
+        corps.append(entry)
+    return corps
+
+
+def _require_key() -> str:
+    if not DART_API_KEY:
+        raise ValueError("DART_API_KEY 환경변수가 설정되지 않았습니다.")
+    return DART_API_KEY
+
+
+@single_flight
+def collect_dart_financials(*stock_codes: str) -> dict[str, list[Any]]:
+    """종목코드들의 주요계정 시계열 (연간 MAX_YEARS개 + 분기 MAX_QUARTERS개). 여러 회사는 한 요청으로 묶는다."""
+    api_key = _require_key()
+    _refresh_corp_index(api_key)
+    corps = _corps_for(stock_codes)
+    periods = candidate_periods(date.today())
+    records = load_records(corps, periods, api_key)
+    return build_table(corps, records, periods)
+
+
+@async_single_flight
+async def acollect_dart_financials(*stock_codes: str) -> dict[str, list[Any]]:
+    """collect_dart_financials의 async 버전."""
+    api_key = _require_key()
+    await aensure_corp_index(api_key)
+    corps = _corps_for(stock_codes)
+    periods = candidate_periods(date.today())
+    records = await aload_records(corps, periods, api_key)
+    return build_table(corps, records, periods)
+
+
+def parse_statement(data: dict[str, Any]) -> dict[str, list[Any]] | None:
+    """fnlttSinglAcntAll 응답 → 컬럼형 계정표 (금액은 int). 013이면 None."""
+    status = data.get("status")
+    if status == NO_DATA_STATUS:
+        return None
+    if status != "000":
+        raise http.UpstreamError("dart", detail=f"{status} {data.get('message', 'DART API 오류')}")
+    cols: dict[str, list[Any]] = {c: [] for c in STATEMENT_COLUMNS}
+    for row in data.get("list") or []:
+        for c in STATEMENT_COLUMNS:
+            cols[c].append(parse_amount(row.get(c)) if c in _AMOUNT_FIELDS else row.get(c))
+    return cols
+
+
+async def astatement(stock_code: str, year: str, report: str = "annual", fs_div: str | None = None) -> dict[str, Any]:
+    """
+    단일회사 전체 재무제표 (BS/IS/CIS/CF/SCE 전 계정). fs_div 없으면 연결(CFS) → 별도(OFS) 순으로 찾는다.
+    (회사, 사업연도, 보고서, fs_div) 단위로 캐시.
+    """
+    api_key = _require_key()
+    reprt_code = resolve_report(report)
+    await aensure_corp_index(api_key)
+    corp = _corps_for([stock_code])[0]
+    divs = (fs_div.upper(),) if fs_div else FS_DIVS
+    for div in divs:
+        if div not in FS_DIVS:
+            raise ValueError(f"fs_div must be CFS or OFS: {fs_div}")
+        key = f"dart:statement:{corp.corp_code}:{year}:{reprt_code}:{div}"
+        cols = await cache.aget(key)
+        if cols is None:
+            params = {
+                "crtfc_key": api_key,
+                "corp_code": corp.corp_code,
+                "bsns_year": year,
+                "reprt_code": reprt_code,
+                "fs_div": div,
+            }
+            r = await http.aget(FULL_STATEMENT_URL, params=params, timeout=TIMEOUT)
+            http.raise_for_status(r, "dart")
+            cols = parse_statement(r.json()) or {}
+            await cache.aset_(key, cols, DART_FINANCIALS_TTL_SECONDS if cols else NO_DATA_TTL_SECONDS)
+        if cols:
+            return {
+                "stock_code": corp.stock_code,
+                "corp_name": corp.corp_name,
+                "fiscal_year": int(year),
+                "period": REPORTS[reprt_code][0],
+                # 전체 재무제표 응답에는 당기일자가 없어 명목 기간 말이다
+                "end": period_end(year, reprt_code),
+                "end_nominal": True,
+                "fs_div": div,
+                "statement": cols,
+            }
+    raise ValueError(f"재무제표가 없습니다: {stock_code} {year} {reprt_code}")
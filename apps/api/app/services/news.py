@@ -14,24 +14,18 @@
 
 from __future__ import annotations
 
-import time
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
 from typing import Any, Dict, List, Tuple
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
-import requests
-
+from app import cache, http
 from app.config import NEWS_API_KEY, NAVER_CLIENT_ID, NAVER_CLIENT_SECRET
+from app.singleflight import async_single_flight, single_flight
 
 
-# 1시간 메모리 캐시 (프로세스 단위)
+# 1시간 캐시 (app.cache 공용 엔진 사용)
 _CACHE_TTL_SECONDS = 60 * 60
-_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
-
-
-def _now_ts() -> float:
-    return time.time()
 
 
 def _has_hangul(text: str) -> bool:
@@ -49,18 +43,11 @@ def _cache_key(provider: str, query: str, max_results: int, daily_only: bool) ->
 
 
 def _cache_get(key: str) -> List[Dict[str, Any]] | None:
-    item = _cache.get(key)
-    if not item:
-        return None
-    ts, val = item
-    if _now_ts() - ts > _CACHE_TTL_SECONDS:
-        _cache.pop(key, None)
-        return None
-    return val
+    return cache.get(key)
 
 
 def _cache_set(key: str, val: List[Dict[str, Any]]) -> None:
-    _cache[key] = (_now_ts(), val)
+    cache.set_(key, val, _CACHE_TTL_SECONDS)
 
 
 def _canonicalize_url(url: str) -> str:
@@ -155,43 +142,32 @@ def _filter_by_timerange(
     return filtered
 
 
-def _search_newsapi(
-    query: str,
-    max_results: int,
-    daily_only: bool,
-) -> List[Dict[str, Any]]:
-    """NewsAPI.org 기반 뉴스 검색 (주로 영문)."""
-    if not NEWS_API_KEY:
-        return []
+NEWSAPI_URL = "https://newsapi.org/v2/everything"
+NAVER_NEWS_URL = "https://openapi.naver.com/v1/search/news.json"
 
-    provider = "newsapi"
-    key = _cache_key(provider, query, max_results, daily_only)
-    cached = _cache_get(key)
-    if cached is not None:
-        return cached[:max_results]
 
+def _newsapi_params(query: str, max_results: int, daily_only: bool) -> Dict[str, Any]:
     from_dt, to_dt = _build_time_range_newsapi(daily_only)
 
-    url = "https://newsapi.org/v2/everything"
     params: Dict[str, Any] = {
         "q": query,
         "pageSize": min(max_results, 100),
         "sortBy": "publishedAt",
         "language": "en",
-        "apiKey": NEWS_API_KEY,
     }
     if from_dt:
         params["from"] = from_dt
     if to_dt:
         params["to"] = to_dt
+    return params
 
-    try:
-        resp = requests.get(url, params=params, timeout=20)
-        resp.raise_for_status()
-        data = resp.json()
-    except Exception:
-        return []
 
+def _newsapi_headers() -> Dict[str, str]:
+    # 키는 쿼리스트링 대신 헤더로 (에러 메시지·로그에 URL이 남아도 키는 빠지도록)
+    return {"X-Api-Key": NEWS_API_KEY or ""}
+
+
+def _parse_newsapi(data: Dict[str, Any], max_results: int) -> List[Dict[str, Any]]:
     articles = data.get("articles") or []
     results: List[Dict[str, Any]] = []
     seen_urls: set[str] = set()
@@ -230,46 +206,85 @@ def _search_newsapi(
             return datetime.min.replace(tzinfo=timezone.utc)
 
     results.sort(key=_sort_key, reverse=True)
+    return results
+
+
+@single_flight
+def _search_newsapi(
+    query: str,
+    max_results: int,
+    daily_only: bool,
+) -> List[Dict[str, Any]]:
+    """NewsAPI.org 기반 뉴스 검색 (주로 영문)."""
+    if not NEWS_API_KEY:
+        return []
+
+    key = _cache_key("newsapi", query, max_results, daily_only)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached[:max_results]
+
+    try:
+        resp = http.get(
+            NEWSAPI_URL,
+            headers=_newsapi_headers(),
+            params=_newsapi_params(query, max_results, daily_only),
+            timeout=20,
+        )
+        http.raise_for_status(resp, "newsapi")
+        data = resp.json()
+    except Exception:
+        return []
+
+    results = _parse_newsapi(data, max_results)
     _cache_set(key, results)
     return results[:max_results]
 
 
-def _search_naver(
+@async_single_flight
+async def _asearch_newsapi(
     query: str,
     max_results: int,
     daily_only: bool,
 ) -> List[Dict[str, Any]]:
-    """NAVER 뉴스 검색 API 기반 검색 (주로 한글)."""
-    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+    """_search_newsapi의 async 버전. upstream 에러는 삼키지 않고 올린다 (API의 stale-on-error 판단용)."""
+    if not NEWS_API_KEY:
         return []
 
-    provider = "naver"
-    key = _cache_key(provider, query, max_results, daily_only)
-    cached = _cache_get(key)
+    key = _cache_key("newsapi", query, max_results, daily_only)
+    cached = await cache.arun(_cache_get, key)
     if cached is not None:
         return cached[:max_results]
 
-    url = "https://openapi.naver.com/v1/search/news.json"
-    display = min(max_results, 100)
+    resp = await http.aget(
+        NEWSAPI_URL,
+        headers=_newsapi_headers(),
+        params=_newsapi_params(query, max_results, daily_only),
+        timeout=20,
+    )
+    http.raise_for_status(resp, "newsapi")
+    data = resp.json()
 
+    results = _parse_newsapi(data, max_results)
+    await cache.arun(_cache_set, key, results)
+    return results[:max_results]
+
+
+def _naver_request(query: str, max_results: int) -> Tuple[Dict[str, str], Dict[str, Any]]:
     headers = {
-        "X-Naver-Client-Id": NAVER_CLIENT_ID,
-        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET,
+        "X-Naver-Client-Id": NAVER_CLIENT_ID or "",
+        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET or "",
     }
     params: Dict[str, Any] = {
         "query": query,
-        "display": display,
+        "display": min(max_results, 100),
         "start": 1,
         "sort": "sim",  # 정확도순. 필요하면 "date"로 변경 가능
     }
+    return headers, params
 
-    try:
-        resp = requests.get(url, headers=headers, params=params, timeout=20)
-        resp.raise_for_status()
-        data = resp.json()
-    except Exception:
-        return []
 
+def _parse_naver(data: Dict[str, Any], max_results: int, daily_only: bool) -> List[Dict[str, Any]]:
     items = data.get("items") or []
 
     # pubDate 기준으로 최근 24시간/30일 필터링
@@ -330,10 +345,62 @@ def _search_naver(
                 return datetime.min.replace(tzinfo=timezone.utc)
 
     results.sort(key=_sort_key, reverse=True)
+    return results
+
+
+@single_flight
+def _search_naver(
+    query: str,
+    max_results: int,
+    daily_only: bool,
+) -> List[Dict[str, Any]]:
+    """NAVER 뉴스 검색 API 기반 검색 (주로 한글)."""
+    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+        return []
+
+    key = _cache_key("naver", query, max_results, daily_only)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached[:max_results]
+
+    headers, params = _naver_request(query, max_results)
+    try:
+        resp = http.get(NAVER_NEWS_URL, headers=headers, params=params, timeout=20)
+        http.raise_for_status(resp, "naver")
+        data = resp.json()
+    except Exception:
+        return []
+
+    results = _parse_naver(data, max_results, daily_only)
     _cache_set(key, results)
     return results[:max_results]
 
 
+@async_single_flight
+async def _asearch_naver(
+    query: str,
+    max_results: int,
+    daily_only: bool,
+) -> List[Dict[str, Any]]:
+    """_search_naver의 async 버전. upstream 에러는 올린다."""
+    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+        return []
+
+    key = _cache_key("naver", query, max_results, daily_only)
+    cached = await cache.arun(_cache_get, key)
+    if cached is not None:
+        return cached[:max_results]
+
+    headers, params = _naver_request(query, max_results)
+    resp = await http.aget(NAVER_NEWS_URL, headers=headers, params=params, timeout=20)
+    http.raise_for_status(resp, "naver")
+    data = resp.json()
+
+    results = _parse_naver(data, max_results, daily_only)
+    await cache.arun(_cache_set, key, results)
+    return results[:max_results]
+
+
 def search_news_articles(
     query: str,
     max_results: int = 40,
@@ -365,3 +432,41 @@ def search_news_articles(
     # 주 소스가 실패하면 보조 소스로라도 결과 시도
     fallback_results = fallback(query, max_results=max_results, daily_only=daily_only)
     return fallback_results[:max_results]
+
+
+async def asearch_news_articles(
+    query: str,
+    max_results: int = 40,
+    daily_only: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    search_news_articles의 async 버전.
+    주 소스가 실패하거나 비어 있으면 보조 소스를 시도하고, 두 소스가 모두 실패하면 주 소스의 예외를 올린다.
+    """
+    if not query:
+        return []
+
+    if _has_hangul(query):
+        primary = _asearch_naver
+        fallback = _asearch_newsapi
+    else:
+        primary = _asearch_newsapi
+        fallback = _asearch_naver
+
+    primary_error: Exception | None = None
+    try:
+        results = await primary(query, max_results=max_results, daily_only=daily_only)
+        if results:
+            return results[:max_results]
+    except Exception as e:
+        primary_error = e
+
+    try:
+        fallback_results = await fallback(query, max_results=max_results, daily_only=daily_only)
+    except Exception:
+        if primary_error is not None:
+            raise primary_error
+        raise
+    if not fallback_results and primary_error is not None:
+        raise primary_error
+    return fallback_results[:max_results]
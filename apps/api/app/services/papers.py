@@ -1,37 +1,88 @@
 """OpenAlex paper search. Only results with pdf_url. No API key required."""
+import asyncio
 import time
+
+import httpx
 import requests
 
+from app import http
+from app.singleflight import async_single_flight, single_flight
+
 OPENALEX_BASE = "https://api.openalex.org"
 USER_AGENT = "AC-research API (paper scraper)"
 REQUEST_DELAY = 0.2
 TIMEOUT = 30
+PER_PAGE = 25
+MAX_PAGES = 8
+
+COLUMN_ORDER = [
+    "title", "authors", "year", "venue", "citation_count",
+    "is_open_access", "main_url", "pdf_url", "query",
+]
+HEADERS = {"User-Agent": USER_AGENT, "Accept": "application/json"}
+
+
+def _page_url(query: str, page: int) -> str:
+    return (
+        f"{OPENALEX_BASE}/works"
+        f"?search={requests.utils.quote(query)}"
+        f"&sort=cited_by_count:desc"
+        f"&per-page={PER_PAGE}"
+        f"&page={page}"
+    )
+
+
+def _rows_from_works(results: list[dict], query: str, all_rows: list[dict], max_results: int) -> None:
+    """OpenAlex works 한 페이지를 pdf_url 있는 행만 all_rows에 추가 (max_results에서 중단)."""
+    for w in results:
+        authorships = w.get("authorships") or []
+        authors = ", ".join(
+            (a.get("author") or {}).get("display_name") or "" for a in authorships
+        ).strip()
+        primary = w.get("primary_location") or {}
+        source = primary.get("source") or {}
+        venue = source.get("display_name") or ""
+        locations = w.get("locations") or []
+        pdf_url = ""
+        for loc in locations:
+            if loc.get("pdf_url"):
+                pdf_url = (loc.get("pdf_url") or "").strip()
+                break
+        if not pdf_url:
+            continue
+        row = {
+            "title": w.get("title") or "",
+            "authors": authors,
+            "year": w.get("publication_year") or "",
+            "venue": venue,
+            "citation_count": int(w.get("cited_by_count") or 0),
+            "is_open_access": bool((w.get("open_access") or {}).get("is_oa")),
+            "main_url": w.get("id") or "",
+            "pdf_url": pdf_url,
+            "query": query,
+        }
+        ordered = {k: row[k] for k in COLUMN_ORDER}
+        all_rows.append(ordered)
+        if len(all_rows) >= max_results:
+            break
+
+
+def _finalize(all_rows: list[dict], max_results: int) -> list[dict]:
+    all_rows.sort(key=lambda x: x["citation_count"], reverse=True)
+    return all_rows[:max_results]
 
 
+@single_flight
 def search_papers(query: str, max_results: int = 30) -> list[dict]:
     """Search OpenAlex; only include items with pdf_url; sort by citation_count desc."""
     if not query or not query.strip():
         return []
     query = query.strip()
-    column_order = [
-        "title", "authors", "year", "venue", "citation_count",
-        "is_open_access", "main_url", "pdf_url", "query",
-    ]
-    all_rows = []
+    all_rows: list[dict] = []
     page = 1
-    per_page = 25
-    max_pages = 8
-    while len(all_rows) < max_results and page <= max_pages:
-        url = (
-            f"{OPENALEX_BASE}/works"
-            f"?search={requests.utils.quote(query)}"
-            f"&sort=cited_by_count:desc"
-            f"&per-page={per_page}"
-            f"&page={page}"
-        )
-        headers = {"User-Agent": USER_AGENT, "Accept": "application/json"}
+    while len(all_rows) < max_results and page <= MAX_PAGES:
         try:
-            resp = requests.get(url, headers=headers, timeout=TIMEOUT)
+            resp = http.get(_page_url(query, page), headers=HEADERS, timeout=TIMEOUT)
             resp.raise_for_status()
             data = resp.json()
         except requests.RequestException:
@@ -41,40 +92,40 @@ def search_papers(query: str, max_results: int = 30) -> list[dict]:
         results = data.get("results") or []
         if not results:
             break
-        for w in results:
-            authorships = w.get("authorships") or []
-            authors = ", ".join(
-                (a.get("author") or {}).get("display_name") or "" for a in authorships
-            ).strip()
-            primary = w.get("primary_location") or {}
-            source = primary.get("source") or {}
-            venue = source.get("display_name") or ""
-            locations = w.get("locations") or []
-            pdf_url = ""
-            for loc in locations:
-                if loc.get("pdf_url"):
-                    pdf_url = (loc.get("pdf_url") or "").strip()
-                    break
-            if not pdf_url:
-                continue
-            row = {
-                "title": w.get("title") or "",
-                "authors": authors,
-                "year": w.get("publication_year") or "",
-                "venue": venue,
-                "citation_count": int(w.get("cited_by_count") or 0),
-                "is_open_access": bool((w.get("open_access") or {}).get("is_oa")),
-                "main_url": w.get("id") or "",
-                "pdf_url": pdf_url,
-                "query": query,
-            }
-            ordered = {k: row[k] for k in column_order}
-            all_rows.append(ordered)
-            if len(all_rows) >= max_results:
-                break
-        if len(results) < per_page:
+        _rows_from_works(results, query, all_rows, max_results)
+        if len(results) < PER_PAGE:
             break
         page += 1
         time.sleep(REQUEST_DELAY)
-    all_rows.sort(key=lambda x: x["citation_count"], reverse=True)
-    return all_rows[:max_results]
+    return _finalize(all_rows, max_results)
+
+
+@async_single_flight
+async def asearch_papers(query: str, max_results: int = 30) -> list[dict]:
+    """
+    search_papers의 async 버전.
+    첫 페이지부터 실패하면 예외를 올리고 (API의 stale-on-error 판단용), 이후 페이지 실패는 모은 결과까지만 반환.
+    """
+    if not query or not query.strip():
+        return []
+    query = query.strip()
+    all_rows: list[dict] = []
+    page = 1
+    while len(all_rows) < max_results and page <= MAX_PAGES:
+        try:
+            resp = await http.aget(_page_url(query, page), headers=HEADERS, timeout=TIMEOUT)
+            resp.raise_for_status()
+            data = resp.json()
+        except (httpx.HTTPError, ValueError):
+            if page == 1:
+                raise
+            break
+        results = data.get("results") or []
+        if not results:
+            break
+        _rows_from_works(results, query, all_rows, max_results)
+        if len(results) < PER_PAGE:
+            break
+        page += 1
+        await asyncio.sleep(REQUEST_DELAY)
+    return _finalize(all_rows, max_results)
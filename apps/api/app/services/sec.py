@@ -1,98 +1,514 @@
 """SEC EDGAR 10-K/10-Q/8-K link collection. No Streamlit dependency."""
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
+import email.utils
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Mapping
+
+import httpx
 import requests
 
+from app import cache, http, ratelimit
+from app.config import (
+    SEC_BACKOFF_BASE_SECONDS,
+    SEC_BACKOFF_MAX_SECONDS,
+    SEC_CURRENT_FEED_TTL_SECONDS,
+    SEC_MAX_REQUESTS_PER_SECOND,
+    SEC_MAX_RETRIES,
+    SEC_OFFLINE,
+    SEC_OVERFLOW_TTL_SECONDS,
+    SEC_RATE_LIMIT_SHARED,
+    SEC_SUBMISSIONS_TTL_SECONDS,
+)
+from app.services import sec_bulk, sec_daily
+from app.services.sec_filings import FilingsView, merge_columns, recent_columns
+from app.services.sec_tickers import ticker_index
+from app.singleflight import AsyncSingleFlight, async_single_flight, single_flight
+
 USER_AGENT = "AC-research API (SEC scraper)"
 TIMEOUT = 25
-
-
-def _sec_get(url: str, host: str = "www.sec.gov") -> requests.Response:
-    headers = {
+COMPANY_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+TICKERS_RETRY_SECONDS = 60
+SUBMISSIONS_BASE = "https://data.sec.gov/submissions"
+HISTORY_YEARS = 5
+# overflow 페이지 동시 다운로드 수 (data.sec.gov host 한도와 맞춤)
+OVERFLOW_WORKERS = 4
+# daily index / 피드 누적분 보관 시간. daily_only는 최근 이틀치만 본다
+DAILY_KEEP_SECONDS = 2 * 24 * 60 * 60
+FEED_MAX_PAGES = 10
+FEED_CACHE_KEY = "sec:current-feed"
+# 재시도 대상. 403은 휴일/미게시 daily index에도 오므로 재시도하지 않는다
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# 프로세스의 모든 SEC 요청(www.sec.gov, data.sec.gov)이 공유하는 fair access 한도
+limiter = ratelimit.limiter("sec", SEC_MAX_REQUESTS_PER_SECOND, shared=SEC_RATE_LIMIT_SHARED)
+
+_feed_lock = threading.Lock()
+_daily_flight = AsyncSingleFlight()
+
+_tickers_flight = AsyncSingleFlight()
+
+
+def sec_headers(host: str) -> dict[str, str]:
+    return {
         "User-Agent": USER_AGENT,
         "Accept-Encoding": "gzip, deflate",
         "Host": host,
     }
-    resp = requests.get(url, headers=headers, timeout=TIMEOUT)
+
+
+def _retry_delay(attempt: int, headers: Mapping[str, str] | None) -> tuple[float, bool]:
+    """(대기 초, Retry-After를 따랐는지). Retry-After(초 또는 HTTP-date)가 없으면 jitter를 준 지수 backoff."""
+    value = (headers or {}).get("Retry-After")
+    if value:
+        try:
+            seconds: float | None = float(value)
+        except ValueError:
+            try:
+                seconds = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                seconds = None
+        if seconds is not None:
+            return min(max(0.0, seconds), SEC_BACKOFF_MAX_SECONDS), True
+    delay = min(SEC_BACKOFF_MAX_SECONDS, SEC_BACKOFF_BASE_SECONDS * 2 ** attempt)
+    return random.uniform(delay / 2, delay), False
+
+
+def _sec_request(url: str, headers: dict[str, str], **kwargs: Any) -> requests.Response:
+    """
+    SEC GET (raise_for_status는 호출자가). 요청마다 공용 limiter 토큰을 받고,
+    429/5xx/연결 오류는 SEC_MAX_RETRIES번까지 backoff 후 재시도한다. 429의 대기는 limiter 전체에 건다.
+    """
+    attempt = 0
+    while True:
+        limiter.acquire()
+        try:
+            resp = http.get(url, headers=headers, timeout=TIMEOUT, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= SEC_MAX_RETRIES:
+                raise
+            delay, from_header = _retry_delay(attempt, None)
+        else:
+            if resp.status_code not in RETRY_STATUSES or attempt == SEC_MAX_RETRIES:
+                return resp
+            delay, from_header = _retry_delay(attempt, resp.headers)
+            if resp.status_code == 429:
+                limiter.block(delay)
+        limiter.note_retry(from_header)
+        time.sleep(delay)
+        attempt += 1
+
+
+async def _asec_request(url: str, headers: dict[str, str], **kwargs: Any) -> httpx.Response:
+    """_sec_request의 async 버전."""
+    attempt = 0
+    while True:
+        await limiter.aacquire()
+        try:
+            resp = await http.aget(url, headers=headers, timeout=TIMEOUT, **kwargs)
+        except httpx.TransportError:
+            if attempt >= SEC_MAX_RETRIES:
+                raise
+            delay, from_header = _retry_delay(attempt, None)
+        else:
+            if resp.status_code not in RETRY_STATUSES or attempt == SEC_MAX_RETRIES:
+                return resp
+            delay, from_header = _retry_delay(attempt, resp.headers)
+            if resp.status_code == 429:
+                limiter.block(delay)
+        limiter.note_retry(from_header)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def sec_get(url: str, host: str = "www.sec.gov") -> requests.Response:
+    resp = _sec_request(url, sec_headers(host))
     resp.raise_for_status()
     return resp
 
 
-def _get_cik_from_ticker(ticker: str) -> str:
-    url = "https://www.sec.gov/files/company_tickers.json"
-    resp = _sec_get(url, host="www.sec.gov")
-    data = resp.json()
-    t = ticker.upper()
-    for item in data.values():
-        if item["ticker"].upper() == t:
-            return str(item["cik_str"])
-    raise ValueError(f"CIK not found for ticker {ticker}")
-
-
-def _filing_records_from_recent(
-    cik: str,
-    filings: dict,
-    form_filter: list[str],
-    cutoff_date: dt.date | None,
-    max_items: int | None,
-) -> list[dict]:
-    forms = filings.get("form", [])
-    dates = filings.get("filingDate", [])
-    accession_numbers = filings.get("accessionNumber", [])
-    primary_docs = filings.get("primaryDocument", [])
-    records: list[dict] = []
-
-    for form, date_str, acc, primary in zip(forms, dates, accession_numbers, primary_docs):
-        if form not in form_filter:
-            continue
-        filed_date = dt.datetime.strptime(date_str, "%Y-%m-%d").date()
-        if cutoff_date and filed_date < cutoff_date:
-            continue
+async def asec_get(url: str, host: str = "www.sec.gov") -> httpx.Response:
+    resp = await _asec_request(url, sec_headers(host))
+    resp.raise_for_status()
+    return resp
 
-        accession_nodash = acc.replace("-", "")
-        cik_no_padding = str(int(cik))
-        doc_url = f"https://www.sec.gov/Archives/edgar/data/{cik_no_padding}/{accession_nodash}/{primary}"
 
-        records.append(
-            {
-                "source_type": "SEC",
-                "url": doc_url,
-                "published_date": filed_date.isoformat(),
-                "ticker": None,
-            }
-        )
+def _tickers_headers() -> dict[str, str]:
+    return {**sec_headers("www.sec.gov"), **ticker_index.conditional_headers()}
 
-    records.sort(key=lambda r: r["published_date"], reverse=True)
-    if max_items is not None:
-        records = records[:max_items]
-    return records
 
+def refresh_ticker_index() -> None:
+    """인덱스가 비었거나 오래됐으면 company_tickers.json을 조건부 GET으로 갱신 (스레드 간 한 번만)."""
+    with ticker_index.lock:
+        if not ticker_index.needs_refresh():
+            return
+        try:
+            resp = _sec_request(COMPANY_TICKERS_URL, _tickers_headers())
+            if resp.status_code != 304:
+                resp.raise_for_status()
+            ticker_index.apply(resp.status_code, resp.headers, None if resp.status_code == 304 else resp.json())
+        except (requests.RequestException, ValueError):
+            if not len(ticker_index):
+                raise
+            ticker_index.postpone(TICKERS_RETRY_SECONDS)
 
-def _get_recent_filings_payload(cik: str) -> dict:
+
+async def _afetch_ticker_index() -> None:
+    try:
+        resp = await _asec_request(COMPANY_TICKERS_URL, _tickers_headers())
+        if resp.status_code != 304:
+            resp.raise_for_status()
+        payload = None if resp.status_code == 304 else resp.json()
+        # 인덱스 교체와 디스크 저장은 lock을 잡고 이벤트 루프 밖에서
+        await asyncio.to_thread(ticker_index.apply, resp.status_code, resp.headers, payload)
+    except (httpx.HTTPError, ValueError):
+        if not len(ticker_index):
+            raise
+        ticker_index.postpone(TICKERS_RETRY_SECONDS)
+
+
+async def arefresh_ticker_index() -> None:
+    """refresh_ticker_index의 async 버전. 동시에 들어온 갱신은 하나로 합친다."""
+    if ticker_index.needs_refresh():
+        await _tickers_flight.do(COMPANY_TICKERS_URL, _afetch_ticker_index)
+
+
+def _cik_from_index(ticker: str) -> str:
+    entry = ticker_index.lookup(ticker)
+    if entry is None:
+        raise ValueError(f"CIK not found for ticker {ticker}")
+    return entry.cik
+
+
+def get_cik_from_ticker(ticker: str) -> str:
+    refresh_ticker_index()
+    return _cik_from_index(ticker)
+
+
+async def aget_cik_from_ticker(ticker: str) -> str:
+    await arefresh_ticker_index()
+    return _cik_from_index(ticker)
+
+
+def _submissions_url(cik: str) -> str:
     padded_cik = cik.zfill(10)
-    api_url = f"https://data.sec.gov/submissions/CIK{padded_cik}.json"
-    resp = _sec_get(api_url, host="data.sec.gov")
-    data = resp.json()
-    return data.get("filings", {}).get("recent", {})
+    return f"{SUBMISSIONS_BASE}/CIK{padded_cik}.json"
+
+
+def _submissions_cache_key(cik: str) -> str:
+    return f"sec:submissions:{int(cik)}"
+
+
+def _parse_submissions(data: dict) -> dict:
+    """filings.recent의 필요한 컬럼 + overflow 페이지(filings.files) 목록 + SIC (bulk 저장소가 없을 때 업종 비교용)."""
+    filings = data.get("filings", {})
+    files = [
+        {"name": f["name"], "filingFrom": f.get("filingFrom") or "", "filingTo": f.get("filingTo") or ""}
+        for f in filings.get("files") or []
+        if f.get("name")
+    ]
+    sic = str(data.get("sic") or "")
+    return {
+        "recent": recent_columns(filings.get("recent", {})),
+        "files": files,
+        "sic": int(sic) if sic.isdigit() else None,
+        "sic_description": data.get("sicDescription") or "",
+    }
+
+
+def get_submissions(cik: str, fresh: bool = False) -> dict:
+    """CIK별로 캐시하므로 같은 티커는 한 번만 받는다. fresh=True면 캐시를 건너뛰고 다시 받아 저장한다."""
+    key = _submissions_cache_key(cik)
+    cached = None if fresh else cache.get(key)
+    if cached is not None and "recent" in cached:
+        return cached
+    resp = sec_get(_submissions_url(cik), host="data.sec.gov")
+    submissions = _parse_submissions(resp.json())
+    cache.set_(key, submissions, SEC_SUBMISSIONS_TTL_SECONDS)
+    return submissions
+
+
+async def aget_submissions(cik: str, fresh: bool = False) -> dict:
+    key = _submissions_cache_key(cik)
+    cached = None if fresh else await cache.aget(key)
+    if cached is not None and "recent" in cached:
+        return cached
+    resp = await asec_get(_submissions_url(cik), host="data.sec.gov")
+    submissions = _parse_submissions(resp.json())
+    await cache.aset_(key, submissions, SEC_SUBMISSIONS_TTL_SECONDS)
+    return submissions
+
+
+def _get_recent_filings_payload(cik: str) -> dict:
+    return get_submissions(cik)["recent"]
+
+
+async def _aget_recent_filings_payload(cik: str) -> dict:
+    return (await aget_submissions(cik))["recent"]
+
+
+def _overflow_pages(submissions: dict, since: dt.date) -> list[str]:
+    """since 이후 제출분이 들어 있는 overflow 페이지 이름 (그보다 오래된 페이지는 받지 않는다)."""
+    cutoff = since.isoformat()
+    return [f["name"] for f in submissions.get("files") or [] if not f["filingTo"] or f["filingTo"] >= cutoff]
+
+
+def _overflow_cache_key(name: str) -> str:
+    return f"sec:submissions-page:{name}"
+
+
+def _get_overflow_page(name: str) -> dict:
+    key = _overflow_cache_key(name)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    resp = sec_get(f"{SUBMISSIONS_BASE}/{name}", host="data.sec.gov")
+    columns = recent_columns(resp.json())
+    cache.set_(key, columns, SEC_OVERFLOW_TTL_SECONDS)
+    return columns
+
+
+async def _aget_overflow_page(name: str) -> dict:
+    key = _overflow_cache_key(name)
+    cached = await cache.aget(key)
+    if cached is not None:
+        return cached
+    resp = await asec_get(f"{SUBMISSIONS_BASE}/{name}", host="data.sec.gov")
+    columns = recent_columns(resp.json())
+    await cache.aset_(key, columns, SEC_OVERFLOW_TTL_SECONDS)
+    return columns
+
+
+def _get_full_filings(cik: str, since: dt.date) -> dict:
+    """
+    filings.recent(최대 ~1000건)에 since 이후 구간의 overflow 페이지를 이어 붙인다.
+    페이지는 동시에 받되 host별 동시 요청 한도(app.http) 안에서만 나간다.
+    """
+    submissions = get_submissions(cik)
+    names = _overflow_pages(submissions, since)
+    if not names:
+        return submissions["recent"]
+    with ThreadPoolExecutor(max_workers=min(OVERFLOW_WORKERS, len(names))) as pool:
+        pages = list(pool.map(_get_overflow_page, names))
+    return merge_columns([submissions["recent"], *pages])
+
+
+async def _aget_full_filings(cik: str, since: dt.date) -> dict:
+    submissions = await aget_submissions(cik)
+    names = _overflow_pages(submissions, since)
+    if not names:
+        return submissions["recent"]
+    pages = await asyncio.gather(*(_aget_overflow_page(n) for n in names))
+    return merge_columns([submissions["recent"], *pages])
+
+
+def _history_since() -> dt.date:
+    return dt.date.today() - dt.timedelta(days=365 * HISTORY_YEARS)
 
 
 def _get_recent_10k_filings(cik: str, years: int = 5) -> list[dict]:
-    filings = _get_recent_filings_payload(cik)
-    cutoff = dt.date.today() - dt.timedelta(days=365 * years)
-    return _filing_records_from_recent(cik, filings, ["10-K"], cutoff, None)
+    view = FilingsView(cik, _get_recent_filings_payload(cik))
+    return view.records(view.select(["10-K"], dt.date.today() - dt.timedelta(days=365 * years)))
 
 
 def _get_recent_10q_filings(cik: str, quarters: int = 4) -> list[dict]:
-    filings = _get_recent_filings_payload(cik)
+    view = FilingsView(cik, _get_recent_filings_payload(cik))
     # 최근 filing 목록에서 10-Q만 form 기준으로 잘라내고, 개수(quarters)만 제한
-    return _filing_records_from_recent(cik, filings, ["10-Q"], None, quarters)
+    return view.records(view.select(["10-Q"], None, quarters))
 
 
 def _get_recent_8k_filings(cik: str, days: int = 365, max_items: int = 30) -> list[dict]:
-    filings = _get_recent_filings_payload(cik)
-    cutoff = dt.date.today() - dt.timedelta(days=days)
-    return _filing_records_from_recent(cik, filings, ["8-K"], cutoff, max_items)
+    view = FilingsView(cik, _get_recent_filings_payload(cik))
+    return view.records(view.select(["8-K"], dt.date.today() - dt.timedelta(days=days), max_items))
+
+
+def _select_default_windows(view: FilingsView) -> list[dict]:
+    """최근 5년 10-K + 최근 4건 10-Q + 최근 1년 8-K(최대 30건)를 한 뷰에서 고른다."""
+    today = dt.date.today()
+    return (
+        view.records(view.select(["10-K"], today - dt.timedelta(days=365 * HISTORY_YEARS)))
+        + view.records(view.select(["10-Q"], None, 4))
+        + view.records(view.select(["8-K"], today - dt.timedelta(days=365), 30))
+    )
+
+
+def _daily_index_cache_key(day: dt.date) -> str:
+    return f"sec:daily-index:{day:%Y%m%d}"
+
+
+def _store_daily_index(day: dt.date, status_code: int, text: str) -> sec_daily.DayIndex:
+    # 주말/휴일이나 아직 게시 전(당일분)이면 403/404 → 잠시 뒤 다시 확인
+    if status_code in (403, 404):
+        index, ttl = {}, SEC_CURRENT_FEED_TTL_SECONDS
+    else:
+        index, ttl = sec_daily.parse_master_index(text), DAILY_KEEP_SECONDS
+    cache.set_(_daily_index_cache_key(day), index, ttl)
+    return index
+
+
+def _get_daily_index(day: dt.date) -> sec_daily.DayIndex:
+    cached = cache.get(_daily_index_cache_key(day))
+    if cached is not None:
+        return cached
+    resp = _sec_request(sec_daily.master_index_url(day), sec_headers("www.sec.gov"))
+    if resp.status_code not in (403, 404):
+        resp.raise_for_status()
+    return _store_daily_index(day, resp.status_code, resp.text)
+
+
+async def _aget_daily_index(day: dt.date) -> sec_daily.DayIndex:
+    key = _daily_index_cache_key(day)
+    cached = await cache.aget(key)
+    if cached is not None:
+        return cached
+    # 여러 티커가 동시에 같은 날짜 인덱스를 찾아도 다운로드는 한 번
+    return await _daily_flight.do(key, partial(_afetch_daily_index, day))
+
+
+async def _afetch_daily_index(day: dt.date) -> sec_daily.DayIndex:
+    resp = await _asec_request(sec_daily.master_index_url(day), sec_headers("www.sec.gov"))
+    if resp.status_code not in (403, 404):
+        resp.raise_for_status()
+    return await cache.arun(_store_daily_index, day, resp.status_code, resp.text)
+
+
+def _feed_state() -> dict:
+    return cache.get(FEED_CACHE_KEY) or {"fetched_at": 0.0, "entries": {}}
+
+
+def _merge_feed_page(entries: dict, xml_text: str, form: str, last_seen: float, since: str) -> tuple[float, bool]:
+    """
+    피드 한 페이지를 누적분에 더하고 (이 페이지의 가장 최근 updated, 다음 페이지가 필요한지)를 반환.
+    피드는 최신순이므로 지난 갱신의 가장 최근 updated(last_seen)보다 오래된 항목, 이미 본 accession,
+    구간 시작일(since) 이전 항목이 나오면 그 뒤는 볼 필요가 없다.
+    """
+    rows = sec_daily.parse_current_feed(xml_text)
+    newest = last_seen
+    for cik, row_form, filed, accession, updated in rows:
+        if updated < last_seen or accession in entries or filed < since:
+            return newest, False
+        newest = max(newest, updated)
+        if row_form == form:
+            entries[accession] = [cik, row_form, filed]
+    return newest, len(rows) >= sec_daily.FEED_PAGE_SIZE
+
+
+def _save_feed_state(state: dict) -> dict:
+    start = sec_daily.window_days()[0].isoformat()
+    state["entries"] = {acc: row for acc, row in state["entries"].items() if row[2] >= start}
+    state["fetched_at"] = time.time()
+    cache.set_(FEED_CACHE_KEY, state, DAILY_KEEP_SECONDS)
+    return state
+
+
+def _refresh_feed() -> dict:
+    """latest filings 피드를 SEC_CURRENT_FEED_TTL_SECONDS마다 증분 갱신. 실패하면 이전 누적분을 쓴다."""
+    with _feed_lock:
+        state = _feed_state()
+        if time.time() - state["fetched_at"] < SEC_CURRENT_FEED_TTL_SECONDS:
+            return state
+        since = sec_daily.window_days()[0].isoformat()
+        updated = state.setdefault("updated", {})
+        try:
+            for form in sec_daily.FORMS:
+                newest = last_seen = updated.get(form, 0.0)
+                for page in range(FEED_MAX_PAGES):
+                    params = sec_daily.current_feed_params(form, page * sec_daily.FEED_PAGE_SIZE)
+                    resp = _sec_request(sec_daily.CURRENT_FEED_URL, sec_headers("www.sec.gov"), params=params)
+                    resp.raise_for_status()
+                    page_newest, more = _merge_feed_page(state["entries"], resp.text, form, last_seen, since)
+                    newest = max(newest, page_newest)
+                    if not more:
+                        break
+                # 한 form의 페이지를 끝까지 본 뒤에만 기준 시각을 올린다 (중간 실패 시 다음 갱신이 빈 구간을 건너뛰지 않게)
+                updated[form] = newest
+        except (requests.RequestException, ValueError, ET.ParseError):
+            return state
+        return _save_feed_state(state)
+
+
+async def _afetch_feed() -> dict:
+    state = await cache.arun(_feed_state)
+    if time.time() - state["fetched_at"] < SEC_CURRENT_FEED_TTL_SECONDS:
+        return state
+    since = sec_daily.window_days()[0].isoformat()
+    updated = state.setdefault("updated", {})
+    try:
+        for form in sec_daily.FORMS:
+            newest = last_seen = updated.get(form, 0.0)
+            for page in range(FEED_MAX_PAGES):
+                params = sec_daily.current_feed_params(form, page * sec_daily.FEED_PAGE_SIZE)
+                resp = await _asec_request(sec_daily.CURRENT_FEED_URL, sec_headers("www.sec.gov"), params=params)
+                resp.raise_for_status()
+                page_newest, more = _merge_feed_page(state["entries"], resp.text, form, last_seen, since)
+                newest = max(newest, page_newest)
+                if not more:
+                    break
+            updated[form] = newest
+    except (httpx.HTTPError, ValueError, ET.ParseError):
+        return state
+    return await cache.arun(_save_feed_state, state)
+
+
+async def _arefresh_feed() -> dict:
+    return await _daily_flight.do(FEED_CACHE_KEY, _afetch_feed)
+
+
+def _daily_records(cik: str) -> list[dict]:
+    """최근 24시간 구간 날짜의 daily index + 당일 피드에서 한 CIK의 10-K/10-Q/8-K."""
+    days = sec_daily.window_days()
+    indexes = [_get_daily_index(d) for d in days]
+    indexes.append(sec_daily.feed_index(_refresh_feed()["entries"], days))
+    accessions = sec_daily.accessions_for(cik, indexes)
+    return sec_daily.records_for(cik, indexes, _primary_documents(cik, accessions) if accessions else None)
+
+
+async def _adaily_records(cik: str) -> list[dict]:
+    days = sec_daily.window_days()
+    indexes = list(await asyncio.gather(*(_aget_daily_index(d) for d in days)))
+    indexes.append(sec_daily.feed_index((await _arefresh_feed())["entries"], days))
+    accessions = sec_daily.accessions_for(cik, indexes)
+    return sec_daily.records_for(cik, indexes, await _aprimary_documents(cik, accessions) if accessions else None)
+
+
+def _primary_documents(cik: str, accessions: set[str]) -> dict[str, str]:
+    """
+    daily index/피드 제출분의 본문 파일명 (submissions recent에서). 캐시된 submissions에 없는 accession이 있으면
+    (캐시 이후 제출분) 한 번 새로 받는다. 실패하면 빈 dict → url은 filing index 페이지로 남는다.
+    """
+    try:
+        docs = sec_daily.primary_documents(get_submissions(cik)["recent"])
+        if not accessions <= docs.keys():
+            docs = sec_daily.primary_documents(get_submissions(cik, fresh=True)["recent"])
+    except (requests.RequestException, ValueError):
+        return {}
+    return docs
+
+
+async def _aprimary_documents(cik: str, accessions: set[str]) -> dict[str, str]:
+    try:
+        docs = sec_daily.primary_documents((await aget_submissions(cik))["recent"])
+        if not accessions <= docs.keys():
+            docs = sec_daily.primary_documents((await aget_submissions(cik, fresh=True))["recent"])
+    except (httpx.HTTPError, ValueError):
+        return {}
+    return docs
+
+
+def _offline_records(ticker: str) -> list[dict]:
+    """bulk 저장소(sec_bulk)만으로 기본 구간을 고른다. 네트워크 호출 없음 (저장소는 전체 이력을 담고 있다)."""
+    store = sec_bulk.get_store()
+    cik = store.cik_for_ticker(ticker)
+    if cik is None:
+        raise ValueError(f"CIK not found for ticker {ticker}")
+    return _select_default_windows(FilingsView(cik, store.columns(cik)))
 
 
 def _filter_last_24h(records: list[dict]) -> list[dict]:
@@ -125,29 +541,9 @@ def _filter_last_24h(records: list[dict]) -> list[dict]:
     return filtered
 
 
-def collect_sec_links(ticker: str, daily_only: bool = False) -> list[dict]:
-    """
-    Recent 5y 10-K + 4 quarters 10-Q + recent 1y 8-K.
-
-    Each dict:
-      - source_type: "SEC"
-      - url
-      - published_date (YYYY-MM-DD)
-      - ticker (uppercased)
-
-    daily_only=False: 기존과 동일 (5y 10-K, 4x 10-Q, 1y 8-K 전부)
-    daily_only=True : 위 전체 중에서 최근 24시간(UTC 기준) 이내 제출분만 반환
-    """
+def _finalize_records(records: list[dict], ticker: str, daily_only: bool) -> list[dict]:
+    """URL 기준 중복 제거 + ticker 채우기 + 최신순 정렬 (+ daily_only면 24시간 필터)."""
     t = ticker.upper()
-    cik = _get_cik_from_ticker(ticker)
-
-    records = (
-        _get_recent_10k_filings(cik, years=5)
-        + _get_recent_10q_filings(cik, quarters=4)
-        + _get_recent_8k_filings(cik, days=365, max_items=30)
-    )
-
-    # URL 기준 중복 제거
     seen: set[str] = set()
     deduped: list[dict] = []
     for r in records:
@@ -164,3 +560,57 @@ def collect_sec_links(ticker: str, daily_only: bool = False) -> list[dict]:
         deduped = _filter_last_24h(deduped)
 
     return deduped
+
+
+@single_flight
+def collect_sec_links(
+    ticker: str, daily_only: bool = False, deep_history: bool = False, offline: bool | None = None
+) -> list[dict]:
+    """
+    Recent 5y 10-K + 4 quarters 10-Q + recent 1y 8-K.
+
+    Each dict:
+      - source_type: "SEC"
+      - url
+      - published_date (YYYY-MM-DD)
+      - ticker (uppercased)
+
+    daily_only=False: 기존과 동일 (5y 10-K, 4x 10-Q, 1y 8-K 전부)
+    daily_only=True : 위 전체 중에서 최근 24시간(UTC 기준) 이내 제출분만 반환.
+                      티커별 submissions 대신 시장 전체 daily index/피드(sec_daily)에서 찾는다.
+                      url은 본문 문서(submissions의 primaryDocument, 못 찾으면 filing index 페이지)이고
+                      index_url에 filing index 페이지(...-index.htm)를 함께 준다.
+    deep_history=True: filings.recent(최대 ~1000건)에서 잘린 구간을 overflow 페이지로 채운다.
+                       8-K가 많은 회사도 5y 10-K 구간이 빠짐없이 나온다. daily_only면 무시.
+    offline=True: bulk 저장소(python -m app.services.sec_bulk로 적재)에서만 읽는다. None이면 SEC_OFFLINE 설정.
+    """
+    if SEC_OFFLINE if offline is None else offline:
+        return _finalize_records(_offline_records(ticker), ticker, daily_only)
+    cik = get_cik_from_ticker(ticker)
+    if daily_only:
+        return _finalize_records(_daily_records(cik), ticker, daily_only)
+    if deep_history:
+        columns = _get_full_filings(cik, _history_since())
+    else:
+        columns = _get_recent_filings_payload(cik)
+    view = FilingsView(cik, columns)
+    return _finalize_records(_select_default_windows(view), ticker, daily_only)
+
+
+@async_single_flight
+async def acollect_sec_links(
+    ticker: str, daily_only: bool = False, deep_history: bool = False, offline: bool | None = None
+) -> list[dict]:
+    """collect_sec_links의 async 버전."""
+    if SEC_OFFLINE if offline is None else offline:
+        records = await asyncio.to_thread(_offline_records, ticker)
+        return _finalize_records(records, ticker, daily_only)
+    cik = await aget_cik_from_ticker(ticker)
+    if daily_only:
+        return _finalize_records(await _adaily_records(cik), ticker, daily_only)
+    if deep_history:
+        columns = await _aget_full_filings(cik, _history_since())
+    else:
+        columns = await _aget_recent_filings_payload(cik)
+    view = FilingsView(cik, columns)
+    return _finalize_records(_select_default_windows(view), ticker, daily_only)
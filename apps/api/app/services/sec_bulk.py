@@ -0,0 +1,448 @@
+"""
+EDGAR bulk submissions 로컬 저장소 (오프라인 / 전 종목 스크리닝용).
+
+SEC가 매일 밤 게시하는 submissions.zip(전 CIK의 submissions JSON)을 엔트리 단위로 스트리밍해
+필요한 폼만 컬럼형 .npy 파일로 저장하고, 조회 시 np.load(mmap_mode="r")로 매핑해 읽는다.
+프로세스 메모리에 전부 올리지 않고 CIK 구간만 페이지 단위로 읽으므로 수천 개 CIK도 네트워크 없이 처리한다.
+
+    python -m app.services.sec_bulk --out /data/sec-bulk            # 다운로드 후 적재
+    python -m app.services.sec_bulk --zip submissions.zip --out ...  # 이미 받은 파일로 적재
+    SEC_BULK_PATH=/data/sec-bulk SEC_OFFLINE=1 uvicorn app.main:app  # collect_sec_links가 저장소만 사용
+
+저장 파일 (cik 오름차순, 같은 cik 안에서는 filingDate 내림차순):
+  cik.npy(uint32) form.npy(uint16, forms.json 코드) date.npy(datetime64[D]) accession.npy(uint64)
+  primary.bin + primary_off.npy(int64, 길이 n+1) / index_cik.npy + index_start.npy (CIK별 시작 위치)
+  tickers.json(ticker -> cik, name) / sic_cik.npy(uint32) + sic_code.npy(uint16) (CIK별 SIC, 동종업계 비교용) / meta.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+from app.config import SEC_BULK_PATH
+
+SUBMISSIONS_ZIP_URL = "https://www.sec.gov/Archives/edgar/daily-index/bulkdata/submissions.zip"
+DEFAULT_FORMS = ("10-K", "10-Q", "8-K")
+
+_ENTRY_CIK = re.compile(r"CIK(\d{10})")
+_ACCESSION = re.compile(r"^\d{10}-\d{2}-\d{6}$")
+_PRIMARY_ENCODING = "utf-8"
+
+
+def _accession_to_int(accession: Any) -> int | None:
+    """"0000320193-24-000069" → 18자리 정수. 형식이 틀리면 None."""
+    if not isinstance(accession, str) or not _ACCESSION.match(accession):
+        return None
+    return int(accession.replace("-", ""))
+
+
+def _accession_from_int(value: int) -> str:
+    digits = f"{int(value):018d}"
+    return f"{digits[:10]}-{digits[10:12]}-{digits[12:]}"
+
+
+# 적재 중 컬럼 버퍼를 임시 파일로 내보내는 행 수 / 정렬된 순서로 최종 파일을 채울 때 한 번에 옮기는 행 수
+SPOOL_ROWS = 200_000
+COPY_ROWS = 1_000_000
+# 정렬 키의 날짜 부분 (내림차순을 오름차순 정렬로 만들기 위해 뺀다)
+_MAX_DAY = 2**31 - 1
+# 임시 컬럼 파일: 이름 -> dtype (date는 1970-01-01 기준 일수)
+_SPOOL_COLUMNS = {
+    "cik": np.uint32,
+    "form": np.uint16,
+    "date": np.int64,
+    "accession": np.uint64,
+    "primary_len": np.uint32,
+}
+
+
+class _Spool:
+    """
+    적재 중인 행을 컬럼별 임시 파일(<name>.raw)에 이어 쓴다. 메모리에는 SPOOL_ROWS행 버퍼만 두고,
+    primaryDocument 바이트는 바로 primary.raw에 쓴다 (길이만 컬럼으로).
+    """
+
+    def __init__(self, tmp_dir: str) -> None:
+        self.dir = tmp_dir
+        self.rows = 0
+        self._files = {name: open(self._path(name), "wb") for name in _SPOOL_COLUMNS}
+        self._primary = open(os.path.join(tmp_dir, "primary.raw"), "wb")
+        self._buffers: dict[str, list[np.ndarray]] = {name: [] for name in _SPOOL_COLUMNS}
+        self._buffered = 0
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.dir, f"{name}.raw")
+
+    def add(self, columns: dict[str, np.ndarray], primaries: list[bytes]) -> None:
+        for name, values in columns.items():
+            self._buffers[name].append(values)
+        self._buffers["primary_len"].append(np.fromiter(map(len, primaries), dtype=np.uint32, count=len(primaries)))
+        self._primary.write(b"".join(primaries))
+        self.rows += len(primaries)
+        self._buffered += len(primaries)
+        if self._buffered >= SPOOL_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        for name, dtype in _SPOOL_COLUMNS.items():
+            if self._buffers[name]:
+                np.concatenate(self._buffers[name]).astype(dtype, copy=False).tofile(self._files[name])
+                self._buffers[name].clear()
+        self._buffered = 0
+
+    def close(self) -> None:
+        self.flush()
+        for f in (*self._files.values(), self._primary):
+            f.close()
+
+    def column(self, name: str) -> np.ndarray:
+        dtype = _SPOOL_COLUMNS[name]
+        if not self.rows:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self._path(name), dtype=dtype, mode="r", shape=(self.rows,))
+
+    def primary_bytes(self) -> np.ndarray:
+        size = os.path.getsize(os.path.join(self.dir, "primary.raw"))
+        if not size:
+            return np.zeros(0, dtype=np.uint8)
+        return np.memmap(os.path.join(self.dir, "primary.raw"), dtype=np.uint8, mode="r")
+
+    def remove(self) -> None:
+        for name in (*_SPOOL_COLUMNS, "primary"):
+            try:
+                os.unlink(self._path(name))
+            except OSError:
+                pass
+
+
+def _filings_columns(data: dict[str, Any]) -> dict[str, Any]:
+    """메인 파일(CIK##########.json)은 filings.recent, overflow 파일은 최상위가 곧 컬럼."""
+    if "filings" in data:
+        return data.get("filings", {}).get("recent", {}) or {}
+    return data
+
+
+def _parse_dates(values: list[Any]) -> np.ndarray:
+    """filingDate 문자열 → datetime64[D]. 비었거나 형식이 틀린 값은 NaT."""
+    try:
+        return np.asarray(values, dtype="datetime64[D]")
+    except (TypeError, ValueError):
+        out = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[D]")
+        for i, value in enumerate(values):
+            try:
+                out[i] = np.datetime64(value, "D")
+            except (TypeError, ValueError):
+                pass
+        return out
+
+
+def _add_entry(spool: _Spool, cik: int, columns: dict[str, Any], vocab: dict[str, int], forms: set[str]) -> None:
+    form = columns.get("form") or []
+    n = min(len(columns.get(c) or []) for c in ("form", "filingDate", "accessionNumber", "primaryDocument"))
+    if not n:
+        return
+    form_arr = np.asarray(form[:n], dtype=str)
+    dates = _parse_dates(columns["filingDate"][:n])
+    # 제출일이 없는 행은 기간 조회에 쓸 수 없고 정렬 키도 만들 수 없으므로 버린다
+    mask = ~np.isnat(dates)
+    if forms:
+        mask &= np.isin(form_arr, list(forms))
+    keep = np.flatnonzero(mask)
+    # 접수번호 형식이 틀린 행도 버린다 (한 건 때문에 적재 전체가 멈추지 않게)
+    accessions = {i: _accession_to_int(columns["accessionNumber"][i]) for i in keep}
+    keep = np.asarray([i for i in keep if accessions[i] is not None], dtype=np.int64)
+    if not len(keep):
+        return
+    primaries = columns["primaryDocument"]
+    for f in form_arr[keep]:
+        vocab.setdefault(str(f), len(vocab))
+    spool.add(
+        {
+            "cik": np.full(len(keep), cik, dtype=np.uint32),
+            "form": np.asarray([vocab[str(f)] for f in form_arr[keep]], dtype=np.uint16),
+            "date": dates[keep].astype(np.int64),
+            "accession": np.asarray([accessions[i] for i in keep], dtype=np.uint64),
+        },
+        [(primaries[i] or "").encode(_PRIMARY_ENCODING) for i in keep],
+    )
+
+
+def _iter_zip_entries(zip_path: str) -> Iterator[tuple[str, dict[str, Any]]]:
+    """zip 엔트리를 하나씩 열어 JSON으로 (전체 압축 해제 없이)."""
+    with zipfile.ZipFile(zip_path) as zf:
+        for info in zf.infolist():
+            if info.is_dir() or not info.filename.endswith(".json"):
+                continue
+            with zf.open(info) as f:
+                try:
+                    yield info.filename, json.load(f)
+                except ValueError:
+                    continue
+
+
+def _save_gathered(path: str, src: np.ndarray, order: np.ndarray) -> None:
+    """src[order]를 .npy로. 출력은 memmap에 COPY_ROWS행씩 채워 전체를 메모리에 올리지 않는다."""
+    if not len(order):
+        np.save(path, np.asarray(src[:0]))
+        return
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=src.dtype, shape=(len(order),))
+    for i in range(0, len(order), COPY_ROWS):
+        out[i : i + COPY_ROWS] = src[order[i : i + COPY_ROWS]]
+    out.flush()
+    del out
+
+
+def _write_primary(spool: _Spool, tmp_dir: str, order: np.ndarray) -> None:
+    """primary.raw(적재 순서)를 정렬 순서의 primary.bin + primary_off.npy로 옮긴다."""
+    lengths = spool.column("primary_len")
+    src_off = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=src_off[1:])
+    raw = spool.primary_bytes()
+    primary_off = np.lib.format.open_memmap(
+        os.path.join(tmp_dir, "primary_off.npy"), mode="w+", dtype=np.int64, shape=(len(order) + 1,)
+    )
+    primary_off[0] = 0
+    total = 0
+    with open(os.path.join(tmp_dir, "primary.bin"), "wb") as f:
+        for i in range(0, len(order), COPY_ROWS):
+            idx = order[i : i + COPY_ROWS]
+            block_len = np.asarray(lengths[idx], dtype=np.int64)
+            primary_off[i + 1 : i + 1 + len(idx)] = total + np.cumsum(block_len)
+            total += int(block_len.sum())
+            f.write(b"".join(raw[src_off[k] : src_off[k + 1]].tobytes() for k in idx))
+    primary_off.flush()
+    del primary_off
+
+
+def build_store(zip_path: str, out_dir: str = SEC_BULK_PATH, forms: Iterable[str] = DEFAULT_FORMS) -> dict[str, Any]:
+    """
+    submissions.zip → 컬럼형 저장소. 임시 디렉터리에 다 쓴 뒤 교체하므로
+    적재 중에도 이전 저장소를 읽는 프로세스는 영향을 받지 않는다.
+
+    메모리: 엔트리를 읽으면서 행을 컬럼별 임시 파일로 내보내고(SPOOL_ROWS행 버퍼), 정렬은 (cik, 날짜)를 묶은
+    uint64 키 하나의 argsort(행당 16바이트)로 한 뒤 memmap에서 COPY_ROWS행씩 옮긴다.
+    행 데이터(특히 primaryDocument 문자열)를 파이썬 객체로 모아 두지 않는다.
+    """
+    wanted = {f for f in forms if f}
+    vocab: dict[str, int] = {}
+    tickers: dict[str, list[Any]] = {}
+    sics: dict[int, int] = {}
+
+    parent = os.path.dirname(os.path.abspath(out_dir))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".sec-bulk-", dir=parent)
+    try:
+        spool = _Spool(tmp_dir)
+        try:
+            for name, data in _iter_zip_entries(zip_path):
+                match = _ENTRY_CIK.search(os.path.basename(name))
+                if not match:
+                    continue
+                cik = int(match.group(1))
+                if "filings" in data:
+                    for ticker in data.get("tickers") or []:
+                        tickers.setdefault(str(ticker).upper(), [str(cik), data.get("name") or ""])
+                    if str(data.get("sic") or "").isdigit():
+                        sics[cik] = int(data["sic"])
+                _add_entry(spool, cik, _filings_columns(data), vocab, wanted)
+        finally:
+            spool.close()
+        meta = _write_store(spool, tmp_dir, vocab, tickers, sics)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    meta.update(source=os.path.basename(zip_path), forms=sorted(wanted))
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    old_dir = f"{out_dir}.old"
+    if os.path.isdir(out_dir):
+        shutil.rmtree(old_dir, ignore_errors=True)
+        os.replace(out_dir, old_dir)
+    os.replace(tmp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return meta
+
+
+def _write_store(
+    spool: _Spool, tmp_dir: str, vocab: dict[str, int], tickers: dict[str, list[Any]], sics: dict[int, int]
+) -> dict[str, Any]:
+    cik = spool.column("cik")
+    days = spool.column("date")
+    # cik 오름차순, 같은 cik 안에서는 날짜 내림차순 (안정 정렬이라 같은 날짜는 적재 순서)
+    key = (cik.astype(np.uint64) << np.uint64(32)) | (np.int64(_MAX_DAY) - days).astype(np.uint64)
+    order = np.argsort(key, kind="stable")
+    del key
+
+    _save_gathered(os.path.join(tmp_dir, "cik.npy"), cik, order)
+    _save_gathered(os.path.join(tmp_dir, "form.npy"), spool.column("form"), order)
+    _save_gathered(os.path.join(tmp_dir, "date.npy"), days.view("datetime64[D]"), order)
+    _save_gathered(os.path.join(tmp_dir, "accession.npy"), spool.column("accession"), order)
+    _write_primary(spool, tmp_dir, order)
+    del cik, days
+
+    sorted_cik = np.load(os.path.join(tmp_dir, "cik.npy"), mmap_mode="r")
+    if len(sorted_cik):
+        index_start = np.concatenate(([0], np.flatnonzero(sorted_cik[1:] != sorted_cik[:-1]) + 1))
+    else:
+        index_start = np.zeros(0, dtype=np.int64)
+    index_cik = np.asarray(sorted_cik[index_start], dtype=np.uint32)
+    rows = len(sorted_cik)
+    del sorted_cik
+    spool.remove()
+
+    sic_cik = np.asarray(sorted(sics), dtype=np.uint32)
+    sic_code = np.asarray([sics[int(c)] for c in sic_cik], dtype=np.uint16)
+    np.save(os.path.join(tmp_dir, "index_cik.npy"), index_cik)
+    np.save(os.path.join(tmp_dir, "index_start.npy"), index_start.astype(np.int64))
+    np.save(os.path.join(tmp_dir, "sic_cik.npy"), sic_cik)
+    np.save(os.path.join(tmp_dir, "sic_code.npy"), sic_code)
+    with open(os.path.join(tmp_dir, "forms.json"), "w", encoding="utf-8") as f:
+        json.dump(sorted(vocab, key=vocab.get), f)
+    with open(os.path.join(tmp_dir, "tickers.json"), "w", encoding="utf-8") as f:
+        json.dump(tickers, f, ensure_ascii=False, separators=(",", ":"))
+    return {"built_at": time.time(), "rows": int(rows), "ciks": int(len(index_cik))}
+
+
+class BulkStore:
+    """build_store 결과를 mmap으로 여는 읽기 전용 저장소. CIK 조회는 index_cik 이진 탐색."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+        def _load(name: str) -> np.ndarray:
+            return np.load(os.path.join(path, name), mmap_mode="r")
+
+        self.cik = _load("cik.npy")
+        self.form = _load("form.npy")
+        self.date = _load("date.npy")
+        self.accession = _load("accession.npy")
+        self.primary_off = _load("primary_off.npy")
+        self.index_cik = _load("index_cik.npy")
+        self.index_start = _load("index_start.npy")
+        if os.path.exists(os.path.join(path, "sic_code.npy")):
+            self.sic_cik, self.sic_code = _load("sic_cik.npy"), _load("sic_code.npy")
+        else:
+            # SIC 컬럼 이전에 적재된 저장소
+            self.sic_cik, self.sic_code = np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.uint16)
+        if self.primary_off[-1]:
+            self.primary = np.memmap(os.path.join(path, "primary.bin"), dtype=np.uint8, mode="r")
+        else:
+            self.primary = np.zeros(0, dtype=np.uint8)
+        with open(os.path.join(path, "forms.json"), encoding="utf-8") as f:
+            self.forms = np.asarray(json.load(f), dtype=str)
+        with open(os.path.join(path, "tickers.json"), encoding="utf-8") as f:
+            self.tickers: dict[str, list[str]] = json.load(f)
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta: dict[str, Any] = json.load(f)
+
+    def __len__(self) -> int:
+        return len(self.cik)
+
+    def cik_for_ticker(self, ticker: str) -> str | None:
+        entry = self.tickers.get((ticker or "").strip().upper())
+        return entry[0] if entry else None
+
+    def sic_for(self, cik: str | int) -> int | None:
+        target = np.uint32(int(cik))
+        pos = int(np.searchsorted(self.sic_cik, target))
+        if pos >= len(self.sic_cik) or self.sic_cik[pos] != target:
+            return None
+        return int(self.sic_code[pos])
+
+    def ciks_with_sic(self, sic: int) -> np.ndarray:
+        """같은 SIC 코드의 CIK 배열 (오름차순)."""
+        return np.asarray(self.sic_cik[self.sic_code == sic])
+
+    def _span(self, cik: str | int) -> tuple[int, int]:
+        target = np.uint32(int(cik))
+        pos = int(np.searchsorted(self.index_cik, target))
+        if pos >= len(self.index_cik) or self.index_cik[pos] != target:
+            return 0, 0
+        start = int(self.index_start[pos])
+        end = int(self.index_start[pos + 1]) if pos + 1 < len(self.index_start) else len(self.cik)
+        return start, end
+
+    def columns(self, cik: str | int) -> dict[str, list[str]]:
+        """한 CIK의 filing 목록을 services.sec_filings.FilingsView 입력 형식으로."""
+        start, end = self._span(cik)
+        offsets = self.primary_off[start:end + 1]
+        raw = bytes(self.primary[offsets[0]:offsets[-1]]) if end > start else b""
+        base = int(offsets[0]) if end > start else 0
+        primaries = [
+            raw[int(offsets[i]) - base:int(offsets[i + 1]) - base].decode(_PRIMARY_ENCODING)
+            for i in range(end - start)
+        ]
+        return {
+            "form": self.forms[self.form[start:end]].tolist(),
+            "filingDate": [str(d) for d in self.date[start:end]],
+            "accessionNumber": [_accession_from_int(a) for a in self.accession[start:end]],
+            "primaryDocument": primaries,
+        }
+
+
+_store: BulkStore | None = None
+_store_mtime = 0.0
+_store_lock = threading.Lock()
+
+
+def get_store(path: str = SEC_BULK_PATH) -> BulkStore:
+    """
+    프로세스 공용 BulkStore. 저장소가 없으면 FileNotFoundError.
+    밤사이 다시 적재되면(meta.json 변경) 다음 조회부터 새 저장소를 연다.
+    """
+    global _store, _store_mtime
+    meta_path = os.path.join(path, "meta.json")
+    with _store_lock:
+        try:
+            mtime = os.stat(meta_path).st_mtime
+        except OSError:
+            raise FileNotFoundError(f"SEC bulk store not found at {path}; run python -m app.services.sec_bulk")
+        if _store is None or _store.path != path or mtime != _store_mtime:
+            _store, _store_mtime = BulkStore(path), mtime
+        return _store
+
+
+def download_zip(dest: str, url: str = SUBMISSIONS_ZIP_URL) -> str:
+    """submissions.zip을 메모리에 올리지 않고 청크 단위로 파일에 쓴다."""
+    from app import http
+    from app.services.sec import TIMEOUT, limiter, sec_headers
+
+    tmp = f"{dest}.part"
+    limiter.acquire()
+    with http.get_session().get(url, headers=sec_headers("www.sec.gov"), timeout=TIMEOUT, stream=True) as resp:
+        resp.raise_for_status()
+        with open(tmp, "wb") as f:
+            for block in resp.iter_content(chunk_size=1 << 20):
+                f.write(block)
+    os.replace(tmp, dest)
+    return dest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load EDGAR bulk submissions.zip into a local columnar store")
+    parser.add_argument("--zip", help="이미 받은 submissions.zip 경로 (없으면 SEC에서 다운로드)")
+    parser.add_argument("--out", default=SEC_BULK_PATH)
+    parser.add_argument("--forms", default=",".join(DEFAULT_FORMS), help="저장할 폼 (쉼표 구분, 빈 값이면 전체)")
+    args = parser.parse_args()
+
+    zip_path = args.zip
+    if not zip_path:
+        zip_path = download_zip(os.path.join(tempfile.gettempdir(), "submissions.zip"))
+    meta = build_store(zip_path, args.out, [f.strip() for f in args.forms.split(",")])
+    # CLI 출력: 적재 결과(meta.json과 같은 내용)를 stdout에 JSON 한 줄로 (배치 스크립트가 읽는다)
+    print(json.dumps(meta))
+
+
+if __name__ == "__main__":
+    main()
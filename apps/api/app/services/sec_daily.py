@@ -0,0 +1,157 @@
+"""
+EDGAR 일별 제출 목록 (daily_only용).
+
+티커마다 submissions 전체를 받는 대신, 시장 전체의 하루치 목록 하나로 최근 24시간 제출분을 답한다.
+- daily-index master.YYYYMMDD.idx: 하루가 끝난 뒤 게시되며 이후 바뀌지 않는다
+- latest filings Atom 피드(getcurrent): 아직 daily index가 없는 당일분. 지난 갱신 때 본 가장 최근 updated보다
+  오래된 항목(또는 이미 본 accession)이 나오면 페이지 넘김을 멈춘다
+둘 다 CIK → [[form, filing_date, accession], ...] 형태로 줄여 저장한다. 네트워크와 캐시는 services.sec가 맡는다.
+둘 다 primaryDocument가 없으므로 본문 문서 url은 해당 CIK의 submissions(accession → primaryDocument)로 채운다.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import re
+import xml.etree.ElementTree as ET
+from typing import Iterable
+
+FORMS = ("10-K", "10-Q", "8-K")
+DAILY_INDEX_BASE = "https://www.sec.gov/Archives/edgar/daily-index"
+CURRENT_FEED_URL = "https://www.sec.gov/cgi-bin/browse-edgar"
+FEED_PAGE_SIZE = 100
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_TITLE_CIK = re.compile(r"\((\d{10})\)")
+_ACCESSION = re.compile(r"accession-number=([\d-]+)")
+
+# CIK(선행 0 없음) -> [[form, YYYY-MM-DD, accession], ...]
+DayIndex = dict[str, list[list[str]]]
+
+
+def window_days(now: dt.datetime | None = None) -> list[dt.date]:
+    """services.sec._filter_last_24h와 같은 기준: UTC 24시간 전 날짜부터 오늘까지."""
+    now = now or dt.datetime.now(dt.timezone.utc)
+    start = (now - dt.timedelta(hours=24)).date()
+    return [start + dt.timedelta(days=i) for i in range((now.date() - start).days + 1)]
+
+
+def master_index_url(day: dt.date) -> str:
+    quarter = (day.month - 1) // 3 + 1
+    return f"{DAILY_INDEX_BASE}/{day.year}/QTR{quarter}/master.{day:%Y%m%d}.idx"
+
+
+def current_feed_params(form: str, start: int) -> dict[str, str | int]:
+    return {
+        "action": "getcurrent",
+        "type": form,
+        "owner": "include",
+        "count": FEED_PAGE_SIZE,
+        "start": start,
+        "output": "atom",
+    }
+
+
+def parse_master_index(text: str, forms: Iterable[str] = FORMS) -> DayIndex:
+    """
+    master.idx(CIK|Company Name|Form Type|Date Filed|File Name)에서 forms만 골라 CIK별로 묶는다.
+    File Name(edgar/data/<cik>/<accession>.txt)에서 accession을 꺼낸다.
+    """
+    wanted = set(forms)
+    index: DayIndex = {}
+    body = text.split("\n----", 1)[-1]
+    for line in body.splitlines():
+        parts = line.split("|")
+        if len(parts) != 5 or parts[2] not in wanted:
+            continue
+        cik, _, form, filed, filename = parts
+        accession = filename.rsplit("/", 1)[-1].removesuffix(".txt")
+        filed_iso = f"{filed[:4]}-{filed[4:6]}-{filed[6:8]}" if "-" not in filed else filed
+        index.setdefault(str(int(cik)), []).append([form, filed_iso, accession])
+    return index
+
+
+def parse_current_feed(xml_text: str) -> list[tuple[str, str, str, str, float]]:
+    """
+    getcurrent Atom 피드 → [(cik, form, YYYY-MM-DD, accession, updated epoch 초), ...] (피드 순서 = 최신순).
+    type=8-K로 요청해도 8-K/A 등이 섞이므로 form 필터는 호출자가 한다 (페이지 크기 판단은 전체 개수로).
+    """
+    entries: list[tuple[str, str, str, str, float]] = []
+    root = ET.fromstring(xml_text)
+    for entry in root.iter(f"{_ATOM}entry"):
+        category = entry.find(f"{_ATOM}category")
+        form = category.get("term", "") if category is not None else ""
+        title = entry.findtext(f"{_ATOM}title") or ""
+        cik_match = _TITLE_CIK.search(title)
+        acc_match = _ACCESSION.search(entry.findtext(f"{_ATOM}id") or "")
+        updated = _parse_updated(entry.findtext(f"{_ATOM}updated") or "")
+        if not form or not cik_match or not acc_match or updated is None:
+            continue
+        cik = str(int(cik_match.group(1)))
+        entries.append((cik, form, updated.date().isoformat(), acc_match.group(1), updated.timestamp()))
+    return entries
+
+
+def _parse_updated(text: str) -> dt.datetime | None:
+    """Atom updated(2024-05-01T16:05:12-04:00). 날짜는 피드 시간대(미 동부) 기준 그대로 쓴다."""
+    try:
+        return dt.datetime.fromisoformat(text.strip())
+    except ValueError:
+        return None
+
+
+def filing_index_url(cik: str, accession: str) -> str:
+    return f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{accession.replace('-', '')}/{accession}-index.htm"
+
+
+def document_url(cik: str, accession: str, primary_document: str) -> str:
+    """services.sec_filings.FilingsView.records와 같은 본문 문서 url."""
+    return f"https://www.sec.gov/Archives/edgar/data/{int(cik)}/{accession.replace('-', '')}/{primary_document}"
+
+
+def primary_documents(columns: dict[str, list[str]]) -> dict[str, str]:
+    """submissions 컬럼 → accession → primaryDocument (비어 있는 값은 뺀다)."""
+    return {acc: doc for acc, doc in zip(columns.get("accessionNumber") or [], columns.get("primaryDocument") or []) if doc}
+
+
+def accessions_for(cik: str, indexes: Iterable[DayIndex]) -> set[str]:
+    key = str(int(cik))
+    return {accession for index in indexes for _form, _filed, accession in index.get(key) or []}
+
+
+def feed_index(entries: dict[str, list[str]], days: Iterable[dt.date]) -> DayIndex:
+    """피드 누적분(accession -> [cik, form, date])을 days 구간만 DayIndex로."""
+    wanted = {d.isoformat() for d in days}
+    index: DayIndex = {}
+    for accession, (cik, form, filed) in entries.items():
+        if filed in wanted:
+            index.setdefault(cik, []).append([form, filed, accession])
+    return index
+
+
+def records_for(cik: str, indexes: Iterable[DayIndex], primary_docs: dict[str, str] | None = None) -> list[dict]:
+    """
+    여러 날짜(및 피드)의 인덱스에서 한 CIK의 제출분을 SEC 결과 dict로 (accession 중복 제거).
+    url은 primary_docs(accession → primaryDocument)에 있으면 본문 문서, 없으면 filing index 페이지.
+    index_url은 항상 filing index 페이지.
+    """
+    primary_docs = primary_docs or {}
+    key = str(int(cik))
+    seen: set[str] = set()
+    records: list[dict] = []
+    for index in indexes:
+        for _form, filed, accession in index.get(key) or []:
+            if accession in seen:
+                continue
+            seen.add(accession)
+            index_url = filing_index_url(key, accession)
+            primary = primary_docs.get(accession)
+            records.append(
+                {
+                    "source_type": "SEC",
+                    "url": document_url(key, accession, primary) if primary else index_url,
+                    "index_url": index_url,
+                    "published_date": filed,
+                    "ticker": None,
+                }
+            )
+    return records
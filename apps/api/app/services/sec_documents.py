@@ -0,0 +1,136 @@
+"""
+SEC filing 문서 다운로더 + 로컬 blob 저장소.
+
+collect_sec_links가 돌려준 URL의 문서를 SEC 공용 속도 제한(services.sec의 limiter) 안에서 동시에 받아
+gzip으로 압축해 내용 해시(sha256) 주소로 저장한다. filing 문서는 게시 후 바뀌지 않으므로 한 번 받은 URL은
+이후 디스크에서 바로 읽고, 같은 내용(다른 URL)은 blob 하나를 공유한다.
+
+저장 구조 (SEC_DOCS_PATH)
+  blobs/<sha[:2]>/<sha>.gz   원문 gzip (불변, 있으면 다시 쓰지 않음)
+  blobs/<sha[:2]>/<sha>.json {"content_type", "size"} (해시만으로 서빙할 때 사용)
+  refs/<sha256(url)>.json    {"url", "sha256", "content_type", "size", "stored_size", "fetched_at"}
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from functools import partial
+from typing import Any, Iterable
+
+from app.config import SEC_DOCS_PATH, SEC_DOWNLOAD_CONCURRENCY
+from app.http import host_of
+from app.services.sec import asec_get
+from app.singleflight import AsyncSingleFlight
+from app.utils import write_atomic
+
+GZIP_LEVEL = 6
+SEC_HOSTS = ("www.sec.gov", "sec.gov")
+
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+
+class DocumentStore:
+    """내용 해시 주소 gzip blob 저장소. 쓰기는 임시 파일 → os.replace라 동시 쓰기에도 깨지지 않는다."""
+
+    def __init__(self, path: str = SEC_DOCS_PATH) -> None:
+        self.path = path
+
+    def _ref_path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.path, "refs", f"{key}.json")
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.path, "blobs", sha256[:2], f"{sha256}.gz")
+
+    def ref(self, url: str) -> dict[str, Any] | None:
+        """URL이 이미 저장돼 있으면 ref, 없거나 blob이 사라졌으면 None."""
+        try:
+            with open(self._ref_path(url), encoding="utf-8") as f:
+                ref = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return ref if os.path.exists(self.blob_path(ref["sha256"])) else None
+
+    def put(self, url: str, body: bytes, content_type: str) -> dict[str, Any]:
+        sha = hashlib.sha256(body).hexdigest()
+        blob = self.blob_path(sha)
+        if not os.path.exists(blob):
+            write_atomic(blob, gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0))
+            meta = {"content_type": content_type, "size": len(body)}
+            write_atomic(f"{blob[:-3]}.json", json.dumps(meta).encode("utf-8"))
+        ref = {
+            "url": url,
+            "sha256": sha,
+            "content_type": content_type,
+            "size": len(body),
+            "stored_size": os.path.getsize(blob),
+            "fetched_at": time.time(),
+        }
+        write_atomic(self._ref_path(url), json.dumps(ref).encode("utf-8"))
+        return ref
+
+    def blob_meta(self, sha256: str) -> dict[str, Any] | None:
+        """저장된 blob의 {content_type, size}. 해시 형식이 아니거나 없으면 None."""
+        if not _SHA256.match(sha256 or ""):
+            return None
+        try:
+            with open(f"{self.blob_path(sha256)[:-3]}.json", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if os.path.exists(self.blob_path(sha256)) else None
+
+    def read(self, sha256: str) -> bytes:
+        with gzip.open(self.blob_path(sha256), "rb") as f:
+            return f.read()
+
+
+# 여러 요청이 같은 URL을 동시에 받으려 할 때 한 번만 받는다
+_download_flight = AsyncSingleFlight()
+_stores: dict[str, DocumentStore] = {}
+
+
+def get_store(path: str = SEC_DOCS_PATH) -> DocumentStore:
+    store = _stores.get(path)
+    if store is None:
+        store = _stores.setdefault(path, DocumentStore(path))
+    return store
+
+
+async def _adownload_one(store: DocumentStore, url: str, sem: asyncio.Semaphore) -> dict[str, Any]:
+    # ref 파일 읽기(JSON)도 이벤트 루프 밖에서
+    ref = await asyncio.to_thread(store.ref, url)
+    if ref is not None:
+        return {**ref, "cached": True}
+    async with sem:
+        resp = await asec_get(url, host="www.sec.gov")
+    content_type = resp.headers.get("content-type", "application/octet-stream")
+    # 압축/파일 쓰기는 이벤트 루프 밖에서
+    ref = await asyncio.to_thread(store.put, url, resp.content, content_type)
+    return {**ref, "cached": False}
+
+
+async def adownload_documents(urls: Iterable[str], path: str = SEC_DOCS_PATH) -> list[dict[str, Any]]:
+    """
+    URL 목록을 받아 저장소에 넣고, 입력 순서대로 ref(+cached) 또는 {"url", "error"}를 반환.
+    중복 URL은 한 번만 받고, SEC 외 URL은 받지 않는다.
+    """
+    store = get_store(path)
+    unique = list(dict.fromkeys(u for u in urls if u))
+    sem = asyncio.Semaphore(max(1, SEC_DOWNLOAD_CONCURRENCY))
+
+    async def _one(url: str) -> dict[str, Any]:
+        if host_of(url) not in SEC_HOSTS:
+            return {"url": url, "error": "not an SEC URL"}
+        try:
+            return await _download_flight.do(f"{store.path}:{url}", partial(_adownload_one, store, url, sem))
+        except Exception as e:
+            return {"url": url, "error": str(e)}
+
+    results = await asyncio.gather(*(_one(u) for u in unique))
+    return list(results)
@@ -0,0 +1,67 @@
+"""
+EDGAR submissions filings의 컬럼형(배열) 뷰.
+
+submissions JSON의 filings.recent는 이미 컬럼별 배열(form[], filingDate[], ...)이므로
+numpy 배열로 그대로 올려 두고, 폼 종류/기간/개수 조건을 한 번에 마스크로 골라낸다.
+네트워크와 캐시는 services.sec가 맡는다.
+"""
+from __future__ import annotations
+
+import datetime as dt
+from typing import Any, Iterable
+
+import numpy as np
+
+# submissions JSON에서 쓰는 컬럼 (캐시에도 이 컬럼만 저장)
+COLUMNS = ("form", "filingDate", "accessionNumber", "primaryDocument")
+
+
+def recent_columns(filings: dict[str, Any]) -> dict[str, list[str]]:
+    """filings.recent(또는 overflow 페이지)에서 필요한 컬럼만 같은 길이로 잘라 반환."""
+    n = min((len(filings.get(c) or []) for c in COLUMNS), default=0)
+    return {c: list((filings.get(c) or [])[:n]) for c in COLUMNS}
+
+
+def merge_columns(parts: list[dict[str, list[str]]]) -> dict[str, list[str]]:
+    """recent와 overflow 페이지 컬럼을 이어 붙인다."""
+    return {c: [v for part in parts for v in part.get(c) or []] for c in COLUMNS}
+
+
+class FilingsView:
+    """한 CIK의 filing 목록. 각 컬럼은 같은 길이의 numpy 배열."""
+
+    def __init__(self, cik: str, columns: dict[str, list[str]]) -> None:
+        self.cik = str(int(cik))
+        self.form = np.asarray(columns.get("form") or [], dtype=str)
+        self.filing_date = np.asarray(columns.get("filingDate") or [], dtype="datetime64[D]")
+        self.accession = np.asarray(columns.get("accessionNumber") or [], dtype=str)
+        self.primary_doc = np.asarray(columns.get("primaryDocument") or [], dtype=str)
+
+    def __len__(self) -> int:
+        return len(self.form)
+
+    def select(self, forms: Iterable[str], cutoff: dt.date | None = None, max_items: int | None = None) -> np.ndarray:
+        """
+        조건에 맞는 행 인덱스를 filingDate 내림차순(같은 날짜는 원래 순서)으로 반환.
+        cutoff 이전 제출분은 제외하고, max_items개까지만 남긴다.
+        """
+        mask = np.isin(self.form, list(forms))
+        if cutoff is not None:
+            mask &= self.filing_date >= np.datetime64(cutoff, "D")
+        idx = np.flatnonzero(mask)
+        days = self.filing_date[idx].astype("int64")
+        idx = idx[np.lexsort((idx, -days))]
+        return idx if max_items is None else idx[:max_items]
+
+    def records(self, idx: np.ndarray) -> list[dict]:
+        """선택된 행을 SEC 결과 dict로 변환 (ticker는 호출자가 채운다)."""
+        base = f"https://www.sec.gov/Archives/edgar/data/{self.cik}"
+        return [
+            {
+                "source_type": "SEC",
+                "url": f"{base}/{self.accession[i].replace('-', '')}/{self.primary_doc[i]}",
+                "published_date": str(self.filing_date[i]),
+                "ticker": None,
+            }
+            for i in idx
+        ]
@@ -0,0 +1,228 @@
+"""
+SEC XBRL companyfacts 기반 핵심 재무 시계열 (US 티커).
+
+data.sec.gov/api/xbrl/companyfacts/CIK##########.json을 CIK당 한 번 받아 필요한 개념만 남겨 캐시하고,
+연간(FY) / 분기(Q) 기간으로 맞춘 컬럼형 시계열을 만든다.
+
+    {"ticker": [...], "period": ["FY", ..., "Q", ...], "end": ["2024-09-28", ...], "fiscal_year": [...],
+     "revenue": [...], "net_income": [...], "total_assets": [...], ...}
+
+- 손익/현금흐름(기간 값)은 start~end 길이로 연간(330~380일)과 분기(80~100일)를 가르고
+- 재무상태표/주식수(시점 값)는 같은 end 날짜로 붙인다
+- 같은 기간에 값이 여러 개면 (개념 우선순위, 최근 제출) 순으로 하나만 남긴다
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app import cache
+from app.config import SEC_FACTS_TTL_SECONDS, SEC_OFFLINE
+from app.services.sec import aget_cik_from_ticker, asec_get, get_cik_from_ticker, sec_get
+from app.singleflight import async_single_flight, single_flight
+
+COMPANY_FACTS_URL = "https://data.sec.gov/api/xbrl/companyfacts/CIK{cik:010d}.json"
+
+# metric -> (값 종류, [(taxonomy, concept), ...] 우선순위 순)
+CONCEPTS: dict[str, tuple[str, list[tuple[str, str]]]] = {
+    "revenue": ("duration", [
+        ("us-gaap", "Revenues"),
+        ("us-gaap", "RevenueFromContractWithCustomerExcludingAssessedTax"),
+        ("us-gaap", "RevenueFromContractWithCustomerIncludingAssessedTax"),
+        ("us-gaap", "SalesRevenueNet"),
+    ]),
+    "operating_income": ("duration", [("us-gaap", "OperatingIncomeLoss")]),
+    "net_income": ("duration", [("us-gaap", "NetIncomeLoss"), ("us-gaap", "ProfitLoss")]),
+    "eps_diluted": ("duration", [("us-gaap", "EarningsPerShareDiluted")]),
+    "operating_cash_flow": ("duration", [("us-gaap", "NetCashProvidedByUsedInOperatingActivities")]),
+    "capex": ("duration", [("us-gaap", "PaymentsToAcquirePropertyPlantAndEquipment")]),
+    "total_assets": ("instant", [("us-gaap", "Assets")]),
+    "total_liabilities": ("instant", [("us-gaap", "Liabilities")]),
+    "equity": ("instant", [("us-gaap", "StockholdersEquity")]),
+    "cash": ("instant", [("us-gaap", "CashAndCashEquivalentsAtCarryingValue")]),
+    "shares_outstanding": ("instant", [
+        ("dei", "EntityCommonStockSharesOutstanding"),
+        ("us-gaap", "CommonStockSharesOutstanding"),
+    ]),
+}
+METRICS = list(CONCEPTS)
+REPORT_FORMS = ("10-K", "10-K/A", "10-Q", "10-Q/A", "20-F", "20-F/A", "40-F", "40-F/A")
+ANNUAL_DAYS = (330, 380)
+QUARTER_DAYS = (80, 100)
+MAX_YEARS = 10
+MAX_QUARTERS = 8
+# 표지(dei) 값: 기간 말 이후 이 일수 안의 값을 해당 기간에 붙인다
+COVER_METRICS = ("shares_outstanding",)
+COVER_LAG_DAYS = 100
+
+_FACT_FIELDS = ("start", "end", "val", "fy", "filed", "form")
+
+
+def compact_facts(data: dict[str, Any]) -> dict[str, Any]:
+    """
+    companyfacts 원본(수 MB)에서 CONCEPTS만 골라 metric별 컬럼 목록으로 줄인다 (캐시 저장 형식).
+    {"entity": ..., "facts": {metric: {"rank": [...], "start": [...], "end": [...], ...}}}
+    """
+    facts = data.get("facts") or {}
+    out: dict[str, dict[str, list[Any]]] = {}
+    for metric, (_, concepts) in CONCEPTS.items():
+        cols: dict[str, list[Any]] = {"rank": [], **{f: [] for f in _FACT_FIELDS}}
+        for rank, (taxonomy, concept) in enumerate(concepts):
+            units = ((facts.get(taxonomy) or {}).get(concept) or {}).get("units") or {}
+            for unit_facts in units.values():
+                for fact in unit_facts:
+                    if fact.get("form") not in REPORT_FORMS or fact.get("val") is None:
+                        continue
+                    cols["rank"].append(rank)
+                    for f in _FACT_FIELDS:
+                        cols[f].append(fact.get(f))
+        if cols["rank"]:
+            out[metric] = cols
+    return {"entity": data.get("entityName") or "", "facts": out}
+
+
+def _long_frame(facts: dict[str, Any]) -> pd.DataFrame:
+    frames = []
+    for metric, cols in (facts.get("facts") or {}).items():
+        df = pd.DataFrame(cols)
+        df["metric"] = metric
+        df["kind"] = CONCEPTS[metric][0] if metric in CONCEPTS else "duration"
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=["metric", "kind", "rank", *_FACT_FIELDS])
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_series(facts: dict[str, Any], max_years: int = MAX_YEARS, max_quarters: int = MAX_QUARTERS) -> dict[str, list]:
+    """compact_facts 결과 → 기간 정렬된 컬럼형 시계열 (연간 최신순, 이어서 분기 최신순)."""
+    df = _long_frame(facts)
+    empty: dict[str, list] = {"period": [], "end": [], "fiscal_year": [], **{m: [] for m in METRICS}}
+    if df.empty:
+        return empty
+
+    df["end"] = pd.to_datetime(df["end"], errors="coerce")
+    df["start"] = pd.to_datetime(df["start"], errors="coerce")
+    df["filed"] = pd.to_datetime(df["filed"], errors="coerce")
+    df = df.dropna(subset=["end"])
+    days = (df["end"] - df["start"]).dt.days
+    df["period"] = np.select(
+        [
+            df["kind"].eq("instant"),
+            days.between(*ANNUAL_DAYS),
+            days.between(*QUARTER_DAYS),
+        ],
+        ["I", "FY", "Q"],
+        default="",
+    )
+    df = df[df["period"] != ""]
+    # 같은 (metric, 기간, end)는 개념 우선순위 → 최근 제출 순으로 하나만
+    df = df.sort_values(["rank", "filed"], ascending=[True, False])
+    df = df.drop_duplicates(subset=["metric", "period", "end"], keep="first")
+
+    flows = df[df["period"] != "I"]
+    if flows.empty:
+        return empty
+    # 기간 축: 기간 값(손익/현금흐름)이 있는 (period, end).
+    # fy는 제출 보고서의 회계연도라 비교 기간에도 최신 값이 붙으므로, 그 기간을 처음 보고한 fact의 fy를 쓴다.
+    spine = (
+        flows.sort_values("filed")
+        .drop_duplicates(subset=["period", "end"])[["period", "end", "fy"]]
+        .sort_values("end", ascending=False)
+    )
+    spine = pd.concat([
+        spine[spine["period"] == "FY"].head(max_years),
+        spine[spine["period"] == "Q"].head(max_quarters),
+    ])
+    wide = flows.pivot_table(index=["period", "end"], columns="metric", values="val", aggfunc="first")
+    table = spine.merge(wide.reset_index(), on=["period", "end"], how="left")
+
+    instants = df[df["period"] == "I"]
+    balance = instants[~instants["metric"].isin(COVER_METRICS)]
+    if not balance.empty:
+        table = table.merge(
+            balance.pivot_table(index="end", columns="metric", values="val", aggfunc="first").reset_index(),
+            on="end",
+            how="left",
+        )
+    # 표지(dei) 주식수는 기간 말이 아니라 제출 직전 날짜 기준이므로, 기간 말 이후 가장 가까운 값을 붙인다
+    table = table.sort_values("end").reset_index(drop=True)
+    for metric in COVER_METRICS:
+        cover = instants[instants["metric"] == metric][["end", "val"]].sort_values("end")
+        if cover.empty:
+            continue
+        matched = pd.merge_asof(
+            table[["end"]],
+            cover.rename(columns={"val": metric}),
+            on="end",
+            direction="forward",
+            tolerance=pd.Timedelta(days=COVER_LAG_DAYS),
+        )
+        table[metric] = matched[metric].to_numpy()
+    order = pd.Categorical(table["period"], ["FY", "Q"])
+    table = table.assign(_order=order).sort_values(["_order", "end"], ascending=[True, False])
+
+    out: dict[str, list] = {
+        "period": table["period"].tolist(),
+        "end": table["end"].dt.strftime("%Y-%m-%d").tolist(),
+        "fiscal_year": [None if pd.isna(v) else int(v) for v in table["fy"]],
+    }
+    for metric in METRICS:
+        col = table[metric] if metric in table else pd.Series([np.nan] * len(table))
+        out[metric] = [None if pd.isna(v) else float(v) for v in col]
+    return out
+
+
+def _facts_cache_key(cik: str) -> str:
+    return f"sec:companyfacts:{int(cik)}"
+
+
+def get_company_facts(cik: str) -> dict[str, Any]:
+    """CIK별 compact facts. 원본은 크므로 필요한 개념만 SEC_FACTS_TTL_SECONDS 동안 캐시한다."""
+    key = _facts_cache_key(cik)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    resp = sec_get(COMPANY_FACTS_URL.format(cik=int(cik)), host="data.sec.gov")
+    facts = compact_facts(resp.json())
+    cache.set_(key, facts, SEC_FACTS_TTL_SECONDS)
+    return facts
+
+
+async def aget_company_facts(cik: str) -> dict[str, Any]:
+    key = _facts_cache_key(cik)
+    cached = await cache.aget(key)
+    if cached is not None:
+        return cached
+    resp = await asec_get(COMPANY_FACTS_URL.format(cik=int(cik)), host="data.sec.gov")
+    facts = compact_facts(resp.json())
+    await cache.aset_(key, facts, SEC_FACTS_TTL_SECONDS)
+    return facts
+
+
+def _with_ticker(series: dict[str, list], ticker: str) -> dict[str, list]:
+    return {"ticker": [ticker.upper()] * len(series["period"]), **series}
+
+
+@single_flight
+def collect_sec_financials(ticker: str) -> dict[str, list]:
+    """
+    US 티커의 핵심 재무 시계열 (최근 10개 연도 + 8개 분기).
+    SEC_OFFLINE이면 companyfacts가 bulk 저장소에 없으므로 빈 결과.
+    """
+    if SEC_OFFLINE:
+        return _with_ticker(build_series({}), ticker)
+    cik = get_cik_from_ticker(ticker)
+    return _with_ticker(build_series(get_company_facts(cik)), ticker)
+
+
+@async_single_flight
+async def acollect_sec_financials(ticker: str) -> dict[str, list]:
+    """collect_sec_financials의 async 버전. 기간 정렬(pandas)은 이벤트 루프 밖에서 한다."""
+    if SEC_OFFLINE:
+        return _with_ticker(build_series({}), ticker)
+    cik = await aget_cik_from_ticker(ticker)
+    facts = await aget_company_facts(cik)
+    return _with_ticker(await asyncio.to_thread(build_series, facts), ticker)
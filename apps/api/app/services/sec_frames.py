@@ -0,0 +1,215 @@
+"""
+SEC XBRL frames 기반 동종업계 비교.
+
+frames API(data.sec.gov/api/xbrl/frames/<taxonomy>/<tag>/<unit>/<period>.json)는 한 개념·한 기간의 값을
+전체 제출사에 대해 한 번에 돌려준다. 회사마다 companyfacts를 받는 대신 개념(우선순위 후보)당 한 번씩만 받아 캐시하고,
+티커/CIK 인덱스와 붙여 순위와 백분위를 한 번에 계산한다.
+
+비교 대상(scope)
+- "custom": 호출자가 준 티커 목록
+- "sic": 같은 SIC 회사. 대상 회사의 SIC는 bulk 저장소(app.services.sec_bulk), 없으면 submissions에서 얻고,
+  같은 SIC의 회사 목록은 bulk 저장소에서 얻는다
+- "all": 저장소가 없거나 SIC를 모르면 해당 frame의 전체 제출사 (응답의 scope_note에 이유)
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import re
+from typing import Any, Iterable
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from app import cache
+from app.config import SEC_BULK_PATH, SEC_FRAMES_TTL_SECONDS
+from app.services import sec_bulk
+from app.services.sec import aget_cik_from_ticker, aget_submissions, asec_get
+from app.services.sec_financials import CONCEPTS
+from app.services.sec_tickers import ticker_index
+
+FRAMES_BASE = "https://data.sec.gov/api/xbrl/frames"
+DEFAULT_LIMIT = 50
+
+# metric별 frames 단위 (기본 USD)
+UNITS = {"eps_diluted": "USD-per-shares", "shares_outstanding": "shares"}
+
+_PERIOD = re.compile(r"^CY(\d{4})(Q[1-4])?I?$")
+
+
+def normalize_period(period: str | None, instant: bool, today: dt.date | None = None) -> str:
+    """
+    CY2023 / CY2023Q2 형식으로 맞춘다. 시점 값(재무상태표)은 분기 말 기준이므로 CY2023 → CY2023Q4I.
+    period가 없으면 직전 연도.
+    """
+    today = today or dt.date.today()
+    text = (period or f"CY{today.year - 1}").strip().upper()
+    match = _PERIOD.match(text)
+    if not match:
+        raise ValueError(f"invalid period {period!r} (expected CY2023 or CY2023Q2)")
+    year, quarter = match.group(1), match.group(2)
+    if instant:
+        return f"CY{year}{quarter or 'Q4'}I"
+    return f"CY{year}{quarter or ''}"
+
+
+def frame_url(taxonomy: str, tag: str, unit: str, period: str) -> str:
+    return f"{FRAMES_BASE}/{taxonomy}/{tag}/{unit}/{period}.json"
+
+
+def compact_frame(data: dict[str, Any]) -> dict[str, list[Any]]:
+    """frames 응답 → 컬럼형 {cik, name, val, end, accn} (캐시 저장 형식)."""
+    rows = data.get("data") or []
+    return {
+        "cik": [int(r["cik"]) for r in rows],
+        "name": [r.get("entityName") or "" for r in rows],
+        "val": [r.get("val") for r in rows],
+        "end": [r.get("end") or "" for r in rows],
+        "accn": [r.get("accn") or "" for r in rows],
+    }
+
+
+def _frame_cache_key(taxonomy: str, tag: str, unit: str, period: str) -> str:
+    return f"sec:frame:{taxonomy}:{tag}:{unit}:{period}"
+
+
+async def aget_frame(taxonomy: str, tag: str, unit: str, period: str) -> dict[str, list[Any]]:
+    """frame 하나. 해당 기간에 그 개념이 없으면(404) 빈 frame도 캐시한다."""
+    key = _frame_cache_key(taxonomy, tag, unit, period)
+    cached = await cache.aget(key)
+    if cached is not None:
+        return cached
+    try:
+        resp = await asec_get(frame_url(taxonomy, tag, unit, period), host="data.sec.gov")
+        frame = compact_frame(resp.json())
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 404:
+            raise
+        frame = compact_frame({})
+    await cache.aset_(key, frame, SEC_FRAMES_TTL_SECONDS)
+    return frame
+
+
+def combine_frames(frames: list[dict[str, list[Any]]]) -> pd.DataFrame:
+    """개념 우선순위 순의 frame들을 합쳐 CIK당 한 값만 남긴다 (앞선 개념 우선)."""
+    parts = [pd.DataFrame(frame).assign(concept=rank) for rank, frame in enumerate(frames) if frame.get("cik")]
+    if not parts:
+        return pd.DataFrame(columns=["cik", "name", "val", "end", "accn", "concept"])
+    df = pd.concat(parts, ignore_index=True).dropna(subset=["val"])
+    return df.sort_values("concept", kind="stable").drop_duplicates(subset="cik", keep="first")
+
+
+def rank_peers(
+    df: pd.DataFrame, subject_cik: int, peer_ciks: Iterable[int] | None = None, limit: int = DEFAULT_LIMIT
+) -> dict[str, Any]:
+    """
+    값 내림차순 순위(1 = 최대)와 백분위(0~100, 클수록 큼)를 계산한다.
+    peers는 상위 limit개이고, 대상 회사는 순위 밖이어도 subject로 따로 돌려준다.
+    """
+    if peer_ciks is not None:
+        wanted = np.union1d(np.asarray(list(peer_ciks), dtype=np.int64), [subject_cik])
+        df = df[np.isin(df["cik"].to_numpy(dtype=np.int64), wanted)]
+    df = df.assign(
+        rank=df["val"].rank(ascending=False, method="min"),
+        percentile=(df["val"].rank(pct=True, method="max") * 100).round(1),
+    ).sort_values(["rank", "cik"])
+
+    subject = df[df["cik"] == subject_cik]
+    top = df.head(limit)
+    tickers = [entry.ticker if (entry := ticker_index.by_cik(c)) else None for c in top["cik"]]
+    vals = df["val"]
+    return {
+        "count": int(len(df)),
+        "subject": None if subject.empty else {
+            "val": float(subject["val"].iloc[0]),
+            "rank": int(subject["rank"].iloc[0]),
+            "percentile": float(subject["percentile"].iloc[0]),
+            "end": subject["end"].iloc[0],
+        },
+        "stats": {} if df.empty else {
+            "mean": float(vals.mean()),
+            "median": float(vals.median()),
+            "p25": float(vals.quantile(0.25)),
+            "p75": float(vals.quantile(0.75)),
+        },
+        "peers": {
+            "ticker": tickers,
+            "cik": [int(c) for c in top["cik"]],
+            "name": top["name"].tolist(),
+            "val": [float(v) for v in top["val"]],
+            "end": top["end"].tolist(),
+            "rank": [int(r) for r in top["rank"]],
+            "percentile": [float(p) for p in top["percentile"]],
+        },
+    }
+
+
+def _bulk_store() -> sec_bulk.BulkStore | None:
+    try:
+        return sec_bulk.get_store(SEC_BULK_PATH)
+    except FileNotFoundError:
+        return None
+
+
+async def _asic_peers(cik: int) -> tuple[int | None, np.ndarray | None, str | None]:
+    """
+    (SIC, 같은 SIC의 CIK 배열, 전체 제출사로 넓힌 이유). 대상 회사의 SIC는 bulk 저장소에 없으면 submissions에서 얻는다.
+    같은 SIC 회사 목록은 bulk 저장소에만 있으므로, 저장소가 없으면 SIC를 알아도 전체 제출사와 비교한다.
+    """
+    store = await asyncio.to_thread(_bulk_store)
+    sic = store.sic_for(cik) if store is not None else None
+    if sic is None:
+        try:
+            sic = (await aget_submissions(str(cik))).get("sic")
+        except httpx.HTTPError:
+            sic = None
+    if sic is None:
+        return None, None, "SIC code unknown; compared against all filers"
+    if store is None:
+        return sic, None, "SEC bulk store not built (python -m app.services.sec_bulk); compared against all filers"
+    return sic, store.ciks_with_sic(sic), None
+
+
+async def apeer_comparison(
+    ticker: str,
+    metric: str,
+    period: str | None = None,
+    peers: list[str] | None = None,
+    limit: int = DEFAULT_LIMIT,
+) -> dict[str, Any]:
+    """
+    ticker의 metric을 같은 기간 동종업계(peers / 같은 SIC / 전체 제출사)와 비교.
+    metric은 services.sec_financials.CONCEPTS의 키. 알 수 없는 metric/period/티커는 ValueError.
+    """
+    if metric not in CONCEPTS:
+        raise ValueError(f"unknown metric {metric!r} (one of {', '.join(CONCEPTS)})")
+    kind, concepts = CONCEPTS[metric]
+    frame_period = normalize_period(period, instant=kind == "instant")
+    unit = UNITS.get(metric, "USD")
+
+    cik = int(await aget_cik_from_ticker(ticker))
+    sic: int | None = None
+    scope_note: str | None = None
+    if peers:
+        peer_ciks: Any = [int(await aget_cik_from_ticker(p)) for p in peers]
+        scope = "custom"
+    else:
+        sic, peer_ciks, scope_note = await _asic_peers(cik)
+        scope = "sic" if peer_ciks is not None else "all"
+
+    frames = await asyncio.gather(*(aget_frame(tax, tag, unit, frame_period) for tax, tag in concepts))
+    df = combine_frames(list(frames))
+    ranked = await asyncio.to_thread(rank_peers, df, cik, peer_ciks, limit)
+    return {
+        "ticker": ticker.upper(),
+        "cik": str(cik),
+        "metric": metric,
+        "period": frame_period,
+        "unit": unit,
+        "concepts": [f"{tax}:{tag}" for tax, tag in concepts],
+        "scope": scope,
+        "scope_note": scope_note,
+        "sic": sic,
+        **ranked,
+    }
@@ -0,0 +1,275 @@
+"""
+10-K / 10-Q 본문 → Item 섹션별 텍스트.
+
+수십 MB의 inline XBRL HTML을 DOM으로 올리지 않고, 문서 저장소(services.sec_documents)의 gzip blob을
+청크 단위로 풀면서 html.parser에 흘려 넣는다. 메모리에는 현재 줄과 (요청 시) 섹션 텍스트만 남는다.
+
+- ix:header, script/style, display:none 블록은 건너뛴다 (inline XBRL 숨김 데이터)
+- "PART II" / "Item 1A." 같은 짧은 줄을 섹션 경계로 보고, 본문 없는 목차 항목은 버리며 같은 섹션이 여러 번 나오면 가장 긴 것을 쓴다
+- 섹션마다 공백 정규화 텍스트의 sha256을 계산해, 직전 filing과 해시만 비교해 바뀌지 않은 섹션을 표시한다
+"""
+from __future__ import annotations
+
+import asyncio
+import codecs
+import gzip
+import hashlib
+import re
+from html.parser import HTMLParser
+from typing import Any, BinaryIO, Callable
+
+from app import cache
+from app.services import sec_documents
+from app.services.sec import aget_cik_from_ticker, aget_submissions
+from app.services.sec_filings import FilingsView
+
+READ_CHUNK = 64 * 1024
+CHUNK_CHARS = 4000
+HEADING_MAX_CHARS = 200
+SECTIONS_TTL_SECONDS = 30 * 24 * 60 * 60
+# 파싱 규칙이 바뀌면 올려서 이전 캐시를 무시한다
+SECTIONS_VERSION = 1
+
+_SKIP_TAGS = {"script", "style", "head", "title", "ix:header"}
+_BLOCK_TAGS = {
+    "p", "div", "br", "tr", "li", "table", "section", "article",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "ul", "ol", "pre", "blockquote",
+}
+_CELL_TAGS = {"td", "th"}
+# 닫는 태그가 없는 요소. display:none이어도 건너뛸 범위가 없다
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr",
+}
+_HIDDEN_STYLE = re.compile(r"display\s*:\s*none", re.I)
+_SPACES = re.compile(r"\s+")
+_PART = re.compile(r"^part\s+(iv|iii|ii|i)\b", re.I)
+_PAGE_SUFFIX = re.compile(r"\s+\d{1,4}$")
+_ITEM = re.compile(r"^item\s+(\d{1,2}[a-c]?)\s*[\.:\-–—]?\s*(.*)$", re.I)
+
+
+class _TextExtractor(HTMLParser):
+    """HTML을 정규화된 줄 단위 텍스트로 바꿔 on_line에 넘긴다."""
+
+    def __init__(self, on_line: Callable[[str], None]) -> None:
+        super().__init__(convert_charrefs=True)
+        self.on_line = on_line
+        self._parts: list[str] = []
+        self._skip_tag: str | None = None
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if tag in _SKIP_TAGS or _HIDDEN_STYLE.search(dict(attrs).get("style") or ""):
+            if tag not in _VOID_TAGS:
+                self._skip_tag, self._skip_depth = tag, 1
+            return
+        if tag in _BLOCK_TAGS:
+            self._flush()
+        elif tag in _CELL_TAGS:
+            self._parts.append(" ")
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self._skip_tag is None and tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._skip_tag = None
+            return
+        if tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_tag is None:
+            self._parts.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+
+    def _flush(self) -> None:
+        if not self._parts:
+            return
+        line = _SPACES.sub(" ", "".join(self._parts)).strip()
+        self._parts = []
+        if line:
+            self.on_line(line)
+
+
+class _Section:
+    def __init__(self, part: str | None, item: str, title: str, keep_text: bool) -> None:
+        self.part = part
+        self.item = item
+        self.title = title
+        self.chars = 0
+        self.digest = hashlib.sha256()
+        self.lines: list[str] | None = [] if keep_text else None
+
+    @property
+    def key(self) -> str:
+        return f"{self.part}-{self.item}" if self.part else self.item
+
+    def add(self, line: str) -> None:
+        self.chars += len(line) + 1
+        self.digest.update(line.encode("utf-8"))
+        self.digest.update(b"\n")
+        if self.lines is not None:
+            self.lines.append(line)
+
+
+def _chunks(lines: list[str], size: int = CHUNK_CHARS) -> list[str]:
+    """줄 경계에서 size자 이하로 나눈다 (한 줄이 더 길면 그 줄만 잘라서)."""
+    chunks: list[str] = []
+    current: list[str] = []
+    length = 0
+    for line in lines:
+        while len(line) > size:
+            if current:
+                chunks.append("\n".join(current))
+                current, length = [], 0
+            chunks.append(line[:size])
+            line = line[size:]
+        if length + len(line) + 1 > size and current:
+            chunks.append("\n".join(current))
+            current, length = [], 0
+        current.append(line)
+        length += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+class _Sectionizer:
+    """줄 스트림에서 PART / Item 경계를 찾아 섹션별 해시(와 텍스트)를 모은다."""
+
+    def __init__(self, keep_text: bool) -> None:
+        self.keep_text = keep_text
+        self.part: str | None = None
+        self.current: _Section | None = None
+        self.best: dict[str, _Section] = {}
+
+    def on_line(self, line: str) -> None:
+        if len(line) <= HEADING_MAX_CHARS:
+            part = _PART.match(line)
+            if part:
+                self._close()
+                self.part = part.group(1).upper()
+                # "PART I — Item 1. Business"처럼 한 줄에 붙은 경우
+                rest = line[part.end():].lstrip(" .:-–—")
+                if _ITEM.match(rest):
+                    self.on_line(rest)
+                return
+            item = _ITEM.match(line)
+            if item:
+                self._close()
+                title = _PAGE_SUFFIX.sub("", item.group(2)).strip()
+                self.current = _Section(self.part, item.group(1).upper(), title, self.keep_text)
+                return
+        if self.current is not None:
+            self.current.add(line)
+
+    def _close(self) -> None:
+        section, self.current = self.current, None
+        if section is None:
+            return
+        previous = self.best.get(section.key)
+        if previous is None or section.chars > previous.chars:
+            self.best[section.key] = section
+
+    def sections(self) -> list[dict[str, Any]]:
+        self._close()
+        out = []
+        for section in self.best.values():
+            if not section.chars:
+                # 본문 없는 제목만(목차 항목)
+                continue
+            record: dict[str, Any] = {
+                "key": section.key,
+                "part": section.part,
+                "item": section.item,
+                "title": section.title,
+                "chars": section.chars,
+                "sha256": section.digest.hexdigest(),
+            }
+            if section.lines is not None:
+                record["chunks"] = _chunks(section.lines)
+            out.append(record)
+        return out
+
+
+def extract_sections(stream: BinaryIO, keep_text: bool = False, encoding: str = "utf-8") -> list[dict[str, Any]]:
+    """바이너리 스트림(HTML)을 READ_CHUNK 단위로 읽어 섹션 목록을 문서 순서대로 반환."""
+    sectionizer = _Sectionizer(keep_text)
+    parser = _TextExtractor(sectionizer.on_line)
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    while True:
+        block = stream.read(READ_CHUNK)
+        if not block:
+            break
+        parser.feed(decoder.decode(block))
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    return sectionizer.sections()
+
+
+def extract_blob_sections(sha256: str, keep_text: bool = False) -> list[dict[str, Any]]:
+    """문서 저장소의 gzip blob을 풀면서 섹션 추출. 메타데이터(해시)는 blob 해시 단위로 캐시한다."""
+    key = f"sec:sections:{SECTIONS_VERSION}:{sha256}"
+    if not keep_text:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    with gzip.open(sec_documents.get_store().blob_path(sha256), "rb") as f:
+        sections = extract_sections(f, keep_text=keep_text)
+    meta = [{k: v for k, v in s.items() if k != "chunks"} for s in sections]
+    cache.set_(key, meta, SECTIONS_TTL_SECONDS)
+    return sections
+
+
+def mark_unchanged(filings: list[dict[str, Any]]) -> None:
+    """
+    최신순 filing 목록에서 각 섹션 해시를 바로 이전(더 오래된) filing의 같은 섹션과 비교해 unchanged를 채운다.
+    섹션 dict는 캐시에 있던 객체일 수 있어(memory 백엔드) 복사본에 표시한다.
+    """
+    for newer, older in zip(filings, filings[1:] + [None]):
+        previous = {s["key"]: s["sha256"] for s in (older or {}).get("sections") or []}
+        marked = []
+        for section in newer.get("sections") or []:
+            old = previous.get(section["key"])
+            marked.append({**section, "unchanged": None if old is None else old == section["sha256"]})
+        if "sections" in newer:
+            newer["sections"] = marked
+
+
+async def asec_sections(
+    ticker: str, form: str = "10-K", limit: int = 2, include_text: bool = False
+) -> dict[str, Any]:
+    """
+    ticker의 최근 form filing limit건을 받아(문서 저장소 경유) Item 섹션으로 나눈다.
+    섹션마다 sha256과 직전 filing 대비 unchanged를 붙이고, include_text면 chunks(최대 CHUNK_CHARS자)도 담는다.
+    """
+    cik = await aget_cik_from_ticker(ticker)
+    view = FilingsView(cik, (await aget_submissions(cik))["recent"])
+    records = view.records(view.select([form], None, limit))
+    refs = await sec_documents.adownload_documents(r["url"] for r in records)
+    by_url = {ref["url"]: ref for ref in refs}
+
+    filings: list[dict[str, Any]] = []
+    for record in records:
+        ref = by_url.get(record["url"], {})
+        filing = {"url": record["url"], "published_date": record["published_date"], "form": form}
+        if "sha256" not in ref:
+            filing["error"] = ref.get("error", "download failed")
+            filings.append(filing)
+            continue
+        filing["sha256"] = ref["sha256"]
+        filing["sections"] = await asyncio.to_thread(extract_blob_sections, ref["sha256"], include_text)
+        filings.append(filing)
+    mark_unchanged(filings)
+    return {"ticker": ticker.upper(), "form": form, "filings": filings}
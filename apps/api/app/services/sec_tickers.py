@@ -0,0 +1,139 @@
+"""
+SEC company_tickers.json 로컬 인덱스.
+
+티커 → (CIK, 회사명)을 프로세스 단위 dict로 들고 O(1)로 조회한다.
+- 처음 쓸 때 디스크 사본(SEC_TICKERS_PATH)이 있으면 그걸로 시작하고
+- SEC_TICKERS_REFRESH_SECONDS가 지나면 ETag / Last-Modified 조건부 GET으로 갱신 (변경 없으면 304, 본문 없음)
+- 갱신이 실패해도 기존 인덱스가 있으면 그대로 쓴다
+- 조회용 dict 두 개는 하나의 _Tables로 묶어 한 번에 교체하므로 조회는 락 없이 해도 늘 같은 세대를 본다.
+  상태 교체(apply/디스크 적재)는 lock 안에서 한다
+네트워크 호출은 services.sec가 하고, 이 모듈은 인덱스 상태와 파싱/저장만 맡는다.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Mapping, NamedTuple
+
+from app.config import SEC_TICKERS_PATH, SEC_TICKERS_REFRESH_SECONDS
+from app.utils import write_atomic
+
+
+class TickerEntry(NamedTuple):
+    ticker: str
+    cik: str
+    name: str
+
+
+class _Tables(NamedTuple):
+    by_ticker: dict[str, TickerEntry]
+    by_cik: dict[str, TickerEntry]
+
+
+class TickerIndex:
+    def __init__(self, path: str = SEC_TICKERS_PATH, refresh_seconds: float = SEC_TICKERS_REFRESH_SECONDS) -> None:
+        self.path = path if path and path != "off" else ""
+        self.refresh_seconds = refresh_seconds
+        # 동기 갱신은 lock을 잡은 채 apply를 부르므로 재진입 가능해야 한다
+        self.lock = threading.RLock()
+        self._tables = _Tables({}, {})
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._checked_at = 0.0  # 마지막으로 upstream과 맞춰 본 시각 (wall clock)
+        self._disk_loaded = False
+        self.generation = 0  # _replace마다 +1 (파생 인덱스 재생성 판단용)
+
+    def __len__(self) -> int:
+        return len(self._tables.by_ticker)
+
+    def lookup(self, ticker: str) -> TickerEntry | None:
+        return self._tables.by_ticker.get((ticker or "").strip().upper())
+
+    def entries(self) -> list[TickerEntry]:
+        return list(self._tables.by_ticker.values())
+
+    def by_cik(self, cik: str | int) -> TickerEntry | None:
+        return self._tables.by_cik.get(str(int(cik)))
+
+    def needs_refresh(self) -> bool:
+        """디스크 사본을 (한 번) 읽은 뒤에도 비었거나 refresh_seconds가 지났으면 True."""
+        if not self._disk_loaded:
+            with self.lock:
+                if not self._disk_loaded:
+                    self._load_disk()
+        return not self._tables.by_ticker or time.time() - self._checked_at >= self.refresh_seconds
+
+    def postpone(self, seconds: float) -> None:
+        """갱신 실패 시 기존 인덱스로 버티면서 seconds 뒤에 다시 시도하도록 미룬다."""
+        # 값 하나만 바꾸므로 락 없이 (이벤트 루프에서도 불리며, 동기 갱신은 다운로드 중에도 lock을 잡고 있다)
+        self._checked_at = time.time() - self.refresh_seconds + seconds
+
+    def conditional_headers(self) -> dict[str, str]:
+        if not self._tables.by_ticker:
+            return {}
+        headers: dict[str, str] = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    def apply(self, status_code: int, headers: Mapping[str, str], payload: Any = None) -> None:
+        """
+        조건부 GET 응답 반영. 304면 확인 시각만 갱신, 200이면 인덱스를 통째로 교체.
+        dict 생성과 디스크 저장이 있으므로 async 호출자는 스레드에서 부른다.
+        """
+        rows = None
+        if status_code != 304:
+            rows = [(item["ticker"], item["cik_str"], item.get("title") or "") for item in (payload or {}).values()]
+        with self.lock:
+            self._checked_at = time.time()
+            if rows is not None:
+                self._etag = headers.get("ETag") or headers.get("etag")
+                self._last_modified = headers.get("Last-Modified") or headers.get("last-modified")
+                self._replace(rows)
+            self._save_disk()
+
+    def _replace(self, rows: list[Any]) -> None:
+        by_ticker: dict[str, TickerEntry] = {}
+        by_cik: dict[str, TickerEntry] = {}
+        for ticker, cik, name in rows:
+            entry = TickerEntry(str(ticker).upper(), str(int(cik)), name)
+            by_ticker[entry.ticker] = entry
+            # 한 CIK에 여러 티커(우선주 등)가 있으면 파일 앞쪽(대표 티커)을 유지
+            by_cik.setdefault(entry.cik, entry)
+        # 참조 하나만 바꾸므로 조회 쪽은 락 없이 읽어도 두 dict가 어긋나지 않는다
+        self._tables = _Tables(by_ticker, by_cik)
+        self.generation += 1
+
+    def _load_disk(self) -> None:
+        self._disk_loaded = True
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._replace(data["rows"])
+            self._etag = data.get("etag")
+            self._last_modified = data.get("last_modified")
+            self._checked_at = float(data.get("checked_at") or 0)
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+
+    def _save_disk(self) -> None:
+        if not self.path:
+            return
+        data = {
+            "etag": self._etag,
+            "last_modified": self._last_modified,
+            "checked_at": self._checked_at,
+            "rows": [list(e) for e in self._tables.by_ticker.values()],
+        }
+        try:
+            write_atomic(self.path, json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        except OSError:
+            return
+
+
+ticker_index = TickerIndex()
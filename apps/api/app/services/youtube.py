@@ -4,7 +4,10 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
+from app import cache, http
 from app.config import YOUTUBE_API_KEY
+from app.http import host_slot
+from app.singleflight import async_single_flight, single_flight
 
 try:
     from googleapiclient.discovery import build
@@ -14,9 +17,14 @@ except ImportError:
     HttpError = Exception  # type: ignore
 
 
-# 24h in-memory cache (per process)
+YOUTUBE_API_HOST = "www.googleapis.com"
+YOUTUBE_SEARCH_URL = f"https://{YOUTUBE_API_HOST}/youtube/v3/search"
+TIMEOUT = 20
+
+# 24h cache (app.cache 공용 엔진). 쿼터 초과 시 만료 항목이라도 쓰기 위해
+# 엔진에는 (저장 시각, 결과)를 _STALE_KEEP_SECONDS 동안 보관하고 신선도는 여기서 판단한다.
 _CACHE_TTL_SECONDS = 24 * 60 * 60
-_cache: dict[str, tuple[float, list[dict]]] = {}
+_STALE_KEEP_SECONDS = 7 * 24 * 60 * 60
 
 
 def _now_ts() -> float:
@@ -38,29 +46,34 @@ def _cache_key(query: str, max_results: int, daily_only: bool) -> str:
 
 
 def _cache_get(key: str) -> list[dict] | None:
-    item = _cache.get(key)
+    item = cache.get(key)
     if not item:
         return None
     ts, val = item
     if _now_ts() - ts > _CACHE_TTL_SECONDS:
-        _cache.pop(key, None)
         return None
     return val
 
 
+def _cache_get_stale(key: str) -> list[dict] | None:
+    item = cache.get(key)
+    return item[1] if item else None
+
+
 def _cache_set(key: str, val: list[dict]) -> None:
-    _cache[key] = (_now_ts(), val)
+    cache.set_(key, (_now_ts(), val), _STALE_KEEP_SECONDS)
+
+
+def _is_quota_body(status: int | None, content: str) -> bool:
+    return status == 403 and ("quotaExceeded" in content or "dailyLimitExceeded" in content)
 
 
 def _is_quota_exceeded(err: Exception) -> bool:
     if not isinstance(err, HttpError):
         return False
     try:
-        status = getattr(err.resp, "status", None)
-        if status != 403:
-            return False
         content = err.content.decode("utf-8", errors="ignore") if getattr(err, "content", None) else ""
-        return "quotaExceeded" in content or "dailyLimitExceeded" in content
+        return _is_quota_body(getattr(err.resp, "status", None), content)
     except Exception:
         return False
 
@@ -93,6 +106,75 @@ def _parse_published_at(value: str) -> datetime | None:
         return None
 
 
+def _published_after(now_utc: datetime, daily_only: bool) -> str:
+    if daily_only:
+        base_dt = now_utc - timedelta(hours=24)
+    else:
+        base_dt = now_utc - timedelta(days=365)
+    return _to_rfc3339(base_dt)
+
+
+def _search_params(query: str, published_after: str, per_page: int, page_token: str | None) -> dict[str, Any]:
+    return {
+        "part": "snippet",
+        "q": query,
+        "type": "video",
+        "order": "date",
+        "publishedAfter": published_after,
+        "videoDuration": "long",
+        "maxResults": per_page,
+        "pageToken": page_token or "",
+    }
+
+
+def _append_items(resp: dict, results: list[dict[str, Any]], max_results: int) -> None:
+    items = resp.get("items", []) or []
+    for item in items:
+        vid = ((item.get("id") or {}).get("videoId") or "").strip()
+        if not vid:
+            continue
+        snippet = item.get("snippet") or {}
+        published_at_raw = snippet.get("publishedAt") or ""
+        results.append(
+            {
+                "title": snippet.get("title") or "",
+                "url": f"https://www.youtube.com/watch?v={vid}",
+                "duration_minutes": None,
+                "published_at": published_at_raw,
+            }
+        )
+        if len(results) >= max_results:
+            break
+
+
+def _finalize(results: list[dict[str, Any]], now_utc: datetime, daily_only: bool, max_results: int) -> list[dict]:
+    # 추가 안전장치: daily_only=True일 때는 응답에서도 다시 24시간 컷
+    if daily_only:
+        cutoff = now_utc - timedelta(hours=24)
+        filtered: list[dict[str, Any]] = []
+        for item in results:
+            dt = _parse_published_at(item.get("published_at") or "")
+            if dt is None:
+                # publishedAt 파싱 실패한 것은 보수적으로 포함하지 않는다.
+                continue
+            if dt >= cutoff:
+                filtered.append(item)
+        results = filtered
+    return results[:max_results]
+
+
+def _on_error(key: str, err: Exception, max_results: int) -> list[dict]:
+    # If quota exceeded, serve cached data if any exists (even stale one is better than hard fail)
+    if _is_quota_exceeded(err):
+        stale = _cache_get_stale(key)
+        if stale:
+            return stale[:max_results]
+        return []
+    # other errors: don't poison cache
+    return []
+
+
+@single_flight
 def search_youtube_videos(
     query: str,
     max_results: int = 30,
@@ -119,12 +201,7 @@ def search_youtube_videos(
     youtube = build("youtube", "v3", developerKey=YOUTUBE_API_KEY)
 
     now_utc = datetime.now(timezone.utc)
-    if daily_only:
-        base_dt = now_utc - timedelta(hours=24)
-    else:
-        base_dt = now_utc - timedelta(days=365)
-
-    published_after = _to_rfc3339(base_dt)
+    published_after = _published_after(now_utc, daily_only)
 
     results: list[dict[str, Any]] = []
     next_page_token: str | None = None
@@ -135,67 +212,74 @@ def search_youtube_videos(
 
     try:
         while len(results) < max_results:
-            resp = (
-                youtube.search()
-                .list(
-                    part="snippet",
-                    q=query,
-                    type="video",
-                    order="date",
-                    publishedAfter=published_after,
-                    videoDuration="long",
-                    maxResults=per_page,
-                    pageToken=next_page_token or "",
+            with host_slot(YOUTUBE_API_HOST):
+                resp = (
+                    youtube.search()
+                    .list(**_search_params(query, published_after, per_page, next_page_token))
+                    .execute()
                 )
-                .execute()
-            )
-
-            items = resp.get("items", []) or []
-            for item in items:
-                vid = ((item.get("id") or {}).get("videoId") or "").strip()
-                if not vid:
-                    continue
-                snippet = item.get("snippet") or {}
-                published_at_raw = snippet.get("publishedAt") or ""
-                results.append(
-                    {
-                        "title": snippet.get("title") or "",
-                        "url": f"https://www.youtube.com/watch?v={vid}",
-                        "duration_minutes": None,
-                        "published_at": published_at_raw,
-                    }
-                )
-                if len(results) >= max_results:
-                    break
+
+            _append_items(resp, results, max_results)
 
             next_page_token = resp.get("nextPageToken")
             if not next_page_token:
                 break
 
-        # 추가 안전장치: daily_only=True일 때는 응답에서도 다시 24시간 컷
-        if daily_only:
-            cutoff = now_utc - timedelta(hours=24)
-            filtered: list[dict[str, Any]] = []
-            for item in results:
-                dt = _parse_published_at(item.get("published_at") or "")
-                if dt is None:
-                    # publishedAt 파싱 실패한 것은 보수적으로 포함하지 않는다.
-                    continue
-                if dt >= cutoff:
-                    filtered.append(item)
-            results = filtered
-
         # cache successful results
-        trimmed = results[:max_results]
+        trimmed = _finalize(results, now_utc, daily_only, max_results)
         _cache_set(key, trimmed)
         return trimmed
 
     except Exception as e:
-        # If quota exceeded, serve cached data if any exists (even stale one is better than hard fail)
-        if _is_quota_exceeded(e):
-            stale = _cache.get(key)
-            if stale:
-                return stale[1][:max_results]
-            return []
-        # other errors: don't poison cache
+        return _on_error(key, e, max_results)
+
+
+@async_single_flight
+async def asearch_youtube_videos(
+    query: str,
+    max_results: int = 30,
+    daily_only: bool = False,
+) -> list[dict]:
+    """
+    search_youtube_videos의 async 버전.
+    googleapiclient는 동기 전용이므로 Data API v3 REST(search.list)를 공용 AsyncClient로 직접 호출한다.
+    quota 초과 시에는 서비스 자체의 오래된 캐시로 응답하고, 그 외 upstream 에러는 호출자(API)로 올린다.
+    """
+    if not query:
+        return []
+    if not YOUTUBE_API_KEY:
         return []
+
+    key = _cache_key(query, max_results, daily_only)
+    cached = await cache.arun(_cache_get, key)
+    if cached is not None:
+        return cached[:max_results]
+
+    now_utc = datetime.now(timezone.utc)
+    published_after = _published_after(now_utc, daily_only)
+
+    results: list[dict[str, Any]] = []
+    next_page_token: str | None = None
+    per_page = 20 if max_results > 20 else max_results
+
+    # 키는 쿼리스트링 대신 헤더로 (httpx 에러 메시지에 URL이 그대로 들어가므로)
+    headers = {"X-Goog-Api-Key": YOUTUBE_API_KEY}
+    while len(results) < max_results:
+        params = _search_params(query, published_after, per_page, next_page_token)
+        r = await http.aget(YOUTUBE_SEARCH_URL, headers=headers, params=params, timeout=TIMEOUT)
+        if r.status_code >= 400:
+            stale = await cache.arun(_cache_get_stale, key) if _is_quota_body(r.status_code, r.text) else None
+            if stale:
+                return stale[:max_results]
+            raise http.UpstreamError("youtube", r.status_code)
+        resp = r.json()
+
+        _append_items(resp, results, max_results)
+
+        next_page_token = resp.get("nextPageToken")
+        if not next_page_token:
+            break
+
+    trimmed = _finalize(results, now_utc, daily_only, max_results)
+    await cache.arun(_cache_set, key, trimmed)
+    return trimmed
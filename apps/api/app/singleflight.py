@@ -0,0 +1,115 @@
+"""
+Single-flight request coalescing.
+
+같은 키로 동시에 들어온 호출은 upstream 실행 한 번을 기다렸다가 그 결과(또는 예외)를 공유한다.
+캐시가 채워지기 전 몰려드는 동일 요청이 SEC/YouTube/OpenAlex/NewsAPI 쿼터를 N번 쓰지 않게 한다.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import threading
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """스레드용: 첫 호출자(leader)만 fn을 실행하고 나머지는 완료를 기다린다."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    asyncio용: 키별로 Task 하나를 공유한다.
+    각 호출자는 shield로 기다리므로, 한 호출자가 취소돼도 다른 호출자의 실행은 계속된다.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # 모든 대기자가 취소된 경우에도 "exception was never retrieved" 경고가 나지 않도록
+        if not task.cancelled():
+            task.exception()
+
+
+def single_flight(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    서비스 함수용 데코레이터: (함수, 정규화된 인자)가 같은 동시 호출을 하나로 합친다.
+    인자는 기본값까지 채워 비교하므로 f("AAPL")와 f("AAPL", daily_only=False)는 같은 호출로 본다.
+    """
+    flight = SingleFlight()
+    sig = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(sorted(bound.arguments.items()))
+        return flight.do(key, lambda: fn(*args, **kwargs))
+
+    return wrapper
+
+
+def async_single_flight(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """single_flight의 async 함수 버전."""
+    flight = AsyncSingleFlight()
+    sig = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        bound = sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple(sorted(bound.arguments.items()))
+        return await flight.do(key, lambda: fn(*args, **kwargs))
+
+    return wrapper
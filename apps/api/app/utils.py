@@ -1,7 +1,10 @@
 """Shared utilities."""
+import os
 import re
+import threading
 
 _SLUG_BAD = re.compile(r"[\s\t/\\:?\"'*<>|]+")
+_HANGUL = re.compile(r"[가-힣ㄱ-ㆎ]")
 
 
 def slugify(text: str) -> str:
@@ -17,3 +20,27 @@ def is_korea_stock(query: str) -> bool:
     q = (query or "").strip()
     digits_only = re.sub(r"\D", "", q)
     return len(digits_only) >= 6
+
+
+def has_hangul(text: str) -> bool:
+    """True if text contains any Hangul syllable or jamo."""
+    return bool(_HANGUL.search(text or ""))
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Write data to path through a temp file + os.replace, so readers never see a partial file.
+    The temp name is unique per process/thread; it is removed if the write fails.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
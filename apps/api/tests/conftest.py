@@ -0,0 +1,28 @@
+"""
+pytest 공용 설정. app 패키지를 import하기 전에 디스크/네트워크를 쓰는 기본값을 끈다.
+
+    cd apps/api && python -m pytest -q
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+os.environ.setdefault("CACHE_BACKEND", "memory")
+os.environ.setdefault("CACHE_SNAPSHOT_SECONDS", "0")
+os.environ.setdefault("CACHE_SNAPSHOT_PATH", "off")
+os.environ.setdefault("DART_CORPS_PATH", "off")
+os.environ.setdefault("SEC_TICKERS_PATH", "off")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture_path(name: str) -> str:
+    return os.path.join(FIXTURES, name)
+
+
+def read_fixture(name: str) -> str:
+    with open(fixture_path(name), encoding="utf-8") as f:
+        return f.read()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import sys
+import time
+
+from app.cache import TTLCache, approx_size
+
+
+def _entry_size(key: str, value) -> int:
+    return approx_size(value) + sys.getsizeof(key)
+
+
+def test_get_set_and_delete():
+    c = TTLCache(max_bytes=10_000)
+    c.set_("a", {"x": [1, 2]}, 60)
+    assert c.get("a") == {"x": [1, 2]}
+    c.delete("a")
+    assert c.get("a") is None
+    s = c.stats()
+    assert (s["hits"], s["misses"], s["entries"], s["bytes"]) == (1, 1, 0, 0)
+
+
+def test_lru_evicts_least_recently_used_within_byte_budget():
+    size = _entry_size("a", "v" * 100)
+    c = TTLCache(max_bytes=size * 2)
+    c.set_("a", "v" * 100, 60)
+    c.set_("b", "v" * 100, 60)
+    # a를 읽어 최근 사용으로 올리면 다음 쓰기에서 b가 나간다
+    assert c.get("a") is not None
+    c.set_("c", "v" * 100, 60)
+    assert c.get("b") is None
+    assert c.get("a") is not None and c.get("c") is not None
+    s = c.stats()
+    assert s["evictions"] == 1
+    assert s["bytes"] <= c.max_bytes
+
+
+def test_oversized_value_is_not_stored():
+    c = TTLCache(max_bytes=200)
+    c.set_("small", 1, 60)
+    c.set_("big", "x" * 1000, 60)
+    assert c.get("big") is None
+    assert c.get("small") == 1
+
+
+def test_overwrite_keeps_byte_accounting():
+    c = TTLCache(max_bytes=10_000)
+    c.set_("k", "a" * 500, 60)
+    c.set_("k", "b", 60)
+    assert c.stats()["bytes"] == _entry_size("k", "b")
+
+
+def test_expired_entry_is_a_miss():
+    c = TTLCache(max_bytes=10_000, sweep_interval=3600)
+    c.set_("k", 1, 0.01)
+    time.sleep(0.02)
+    assert c.get("k") is None
+    s = c.stats()
+    assert s["expirations"] == 1 and s["entries"] == 0
+
+
+def test_sweep_on_reads_releases_expired_bytes():
+    c = TTLCache(max_bytes=10_000, sweep_interval=0)
+    c.set_("old", "x" * 200, 0.01)
+    c.set_("live", 1, 60)
+    time.sleep(0.02)
+    # 다른 키를 읽기만 해도 만료 항목이 예산에서 빠진다
+    assert c.get("live") == 1
+    s = c.stats()
+    assert s["entries"] == 1
+    assert s["bytes"] == _entry_size("live", 1)
+
+
+def test_stats_sweeps_expired_entries():
+    c = TTLCache(max_bytes=10_000, sweep_interval=0)
+    c.set_("k", "x", 0.01)
+    time.sleep(0.02)
+    assert c.stats()["entries"] == 0
+
+
+def test_incr_counts_and_restarts_after_expiry():
+    c = TTLCache(max_bytes=10_000)
+    assert [c.incr("n", 0.05) for _ in range(3)] == [1, 2, 3]
+    time.sleep(0.06)
+    assert c.incr("n", 60) == 1
+
+
+def test_incr_respects_byte_budget():
+    size = _entry_size("n0", 1)
+    c = TTLCache(max_bytes=size * 3)
+    for i in range(10):
+        c.incr(f"n{i}", 60)
+    s = c.stats()
+    assert s["bytes"] <= c.max_bytes
+    assert s["entries"] == 3
+    assert c.get("n9") == 1
+
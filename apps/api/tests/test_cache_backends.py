@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import threading
+import time
+
+import pytest
+
+from app.cache_backends import RedisCache, SQLiteCache, dumps
+from app.resp_standin import StandinStore, serve
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    return SQLiteCache(str(tmp_path / "cache.db"), max_bytes=1_000_000, sweep_interval=0)
+
+
+@pytest.fixture
+def standin():
+    """app.resp_standin 서버를 별도 스레드의 이벤트 루프에서 띄우고 (url, store)를 준다."""
+    store = StandinStore()
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    holder = {}
+
+    def run():
+        asyncio.set_event_loop(loop)
+        holder["server"] = loop.run_until_complete(serve("127.0.0.1", 0, store))
+        ready.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    ready.wait(5)
+    port = holder["server"].sockets[0].getsockname()[1]
+    yield f"redis://127.0.0.1:{port}/0", store
+
+    async def _close():
+        holder["server"].close()
+        # 열린 연결 핸들러까지 정리한 뒤 루프를 멈춘다
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await holder["server"].wait_closed()
+
+    asyncio.run_coroutine_threadsafe(_close(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+@pytest.fixture
+def redis_cache(standin):
+    url, _ = standin
+    cache = RedisCache(url, prefix="test:")
+    yield cache
+    cache._reset()
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def backend(request):
+    return request.getfixturevalue(f"{request.param}_cache")
+
+
+def test_round_trip_and_delete(backend):
+    value = {"title": "삼성전자", "rows": [1, 2.5, None, True]}
+    backend.set_("k", value, 60)
+    assert backend.get("k") == value
+    backend.delete("k")
+    assert backend.get("k") is None
+
+
+def test_expired_value_is_a_miss(backend):
+    backend.set_("k", "v", 0.05)
+    time.sleep(0.1)
+    assert backend.get("k") is None
+
+
+def test_incr_is_a_counter_with_ttl(backend):
+    assert [backend.incr("n", 0.1) for _ in range(3)] == [1, 2, 3]
+    time.sleep(0.15)
+    assert backend.incr("n", 60) == 1
+
+
+def test_unserializable_value_is_skipped_not_stringified(backend, caplog):
+    backend.set_("when", {"at": dt.date(2024, 1, 1)}, 60)
+    assert backend.get("when") is None
+    assert backend.stats()["errors"] >= 1
+    assert "when" in caplog.text
+
+
+def test_clear(backend):
+    backend.set_("a", 1, 60)
+    backend.set_("b", 2, 60)
+    backend.clear()
+    assert backend.get("a") is None and backend.get("b") is None
+    assert backend.stats()["entries"] == 0
+
+
+def test_sqlite_evicts_least_recently_read(tmp_path):
+    size = len(dumps("x" * 50))
+    # 예산 정리는 sweep 주기에 맞춰 하므로 매 쓰기마다 하도록
+    cache = SQLiteCache(str(tmp_path / "lru.db"), max_bytes=size * 2, sweep_interval=0)
+    cache.set_("a", "x" * 50, 60)
+    time.sleep(0.01)
+    cache.set_("b", "x" * 50, 60)
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.set_("c", "x" * 50, 60)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "shared.db")
+    SQLiteCache(path, max_bytes=10**6).set_("k", [1, 2], 60)
+    assert SQLiteCache(path, max_bytes=10**6).get("k") == [1, 2]
+
+
+def test_sqlite_stats_and_clear_survive_a_broken_database(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "broken.db"), max_bytes=10**6)
+    cache._conn().execute("DROP TABLE cache")
+    cache.clear()
+    stats = cache.stats()
+    assert stats["entries"] is None and stats["bytes"] is None
+    assert stats["errors"] == 2
+
+
+def test_redis_uses_prefix_and_server_side_ttl(standin, redis_cache):
+    _, store = standin
+    redis_cache.set_("k", "v", 60)
+    assert b"test:k" in store.data
+    assert store.data[b"test:k"][1] is not None
+
+
+def test_redis_incr_always_sets_ttl_on_creation(standin, redis_cache):
+    _, store = standin
+    assert redis_cache.incr("n", 60) == 1
+    expires = store.data[b"test:n"][1]
+    assert expires is not None
+    # 이후 증가는 만료 시각을 늘리지 않는다
+    assert redis_cache.incr("n", 3600) == 2
+    assert store.data[b"test:n"][1] == expires
+
+
+def test_redis_incr_is_not_retried_after_a_dropped_connection(standin, redis_cache):
+    assert redis_cache.incr("n", 60) == 1
+    redis_cache._conn().close()
+    # 끊긴 연결에서는 세지 않고 실패로 돌려준다. 다음 호출은 새 연결에서 한 번만 센다
+    assert redis_cache.incr("n", 60) is None
+    assert redis_cache.incr("n", 60) == 2
+
+
+def test_redis_backend_down_is_a_miss():
+    cache = RedisCache("redis://127.0.0.1:1/0", timeout=0.2)
+    assert cache.get("k") is None
+    cache.set_("k", 1, 60)
+    assert cache.incr("n", 60) is None
+    assert cache.stats()["errors"] == 3
+
+
+def test_redis_reconnects_after_a_dropped_connection(standin, redis_cache):
+    redis_cache.set_("k", 1, 60)
+    # 연결이 끊겨도 다음 명령에서 한 번 재연결한다
+    redis_cache._conn().close()
+    assert redis_cache.get("k") == 1
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import datetime as dt
+import os
+
+import pytest
+
+from app import cache
+from app.cache import SNAPSHOT_MAGIC, TTLCache
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    c = TTLCache(max_bytes=1_000_000)
+    monkeypatch.setattr(cache, "_cache", c)
+    return c
+
+
+def test_snapshot_and_restore_preserve_lru_order_and_ttl():
+    c = TTLCache(max_bytes=10_000)
+    c.set_("a", 1, 60)
+    c.set_("b", 2, 60)
+    c.get("a")
+    snap = c.snapshot()
+    assert [k for k, _, _ in snap] == ["b", "a"]
+    assert all(0 < remaining <= 60 for _, _, remaining in snap)
+
+    other = TTLCache(max_bytes=10_000)
+    other.set_("a", "newer", 60)
+    assert other.restore(snap + [("gone", 3, -1)]) == 1
+    assert other.get("a") == "newer"
+    assert other.get("b") == 2
+    assert other.get("gone") is None
+
+
+def test_file_round_trip(tmp_path, memory_cache, monkeypatch):
+    path = str(tmp_path / "cache.snapshot")
+    memory_cache.set_("sec:x", {"rows": [1, 2]}, 60)
+    memory_cache.set_("news:y", ["a"], 60)
+    assert cache.save_snapshot(path) == 2
+    with open(path, "rb") as f:
+        assert f.read().startswith(SNAPSHOT_MAGIC)
+
+    fresh = TTLCache(max_bytes=1_000_000)
+    monkeypatch.setattr(cache, "_cache", fresh)
+    assert cache.load_snapshot(path) == 2
+    assert fresh.get("sec:x") == {"rows": [1, 2]}
+    assert [k for k, _, _ in fresh.snapshot()] == ["news:y", "sec:x"]
+
+
+def test_snapshot_skips_values_json_cannot_represent(tmp_path, memory_cache, monkeypatch, caplog):
+    path = str(tmp_path / "cache.snapshot")
+    memory_cache.set_("ok", 1, 60)
+    for i in range(5):
+        memory_cache.set_(f"bad{i}", {"at": dt.date(2024, 1, 1)}, 60)
+    assert cache.save_snapshot(path) == 1
+    # 건너뛴 항목 수만 저장마다 한 줄로 남긴다
+    warnings = [r for r in caplog.records if r.levelname == "WARNING"]
+    assert len(warnings) == 1 and "5" in warnings[0].getMessage()
+
+    fresh = TTLCache(max_bytes=1_000_000)
+    monkeypatch.setattr(cache, "_cache", fresh)
+    assert cache.load_snapshot(path) == 1
+    assert fresh.get("bad0") is None
+
+
+def test_failed_save_keeps_previous_snapshot_and_no_temp_file(tmp_path, memory_cache):
+    path = tmp_path / "cache.snapshot"
+    path.mkdir()  # os.replace가 실패하도록
+    memory_cache.set_("k", 1, 60)
+    with pytest.raises(OSError):
+        cache.save_snapshot(str(path))
+    assert os.listdir(tmp_path) == ["cache.snapshot"]
+
+
+def test_load_ignores_missing_or_foreign_files(tmp_path, memory_cache):
+    assert cache.load_snapshot(str(tmp_path / "missing")) == 0
+    foreign = tmp_path / "foreign"
+    foreign.write_bytes(b"not a snapshot")
+    assert cache.load_snapshot(str(foreign)) == 0
+    assert cache.save_snapshot("off") == 0
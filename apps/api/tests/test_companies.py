@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import companies
+from app.services.companies import Company, CompanyIndex, normalize
+
+SAMSUNG = Company("KR", "005930", "삼성전자", "00126380")
+SAMSUNG_SDI = Company("KR", "006400", "삼성SDI", "00126362")
+SAMSUNG_BIO = Company("KR", "207940", "삼성바이오로직스", "00877059")
+APPLE = Company("US", "AAPL", "Apple Inc.", "320193")
+APPLIED = Company("US", "AMAT", "Applied Materials Inc", "6951")
+SAMSUNG_US = Company("US", "SSNLF", "Samsung Electronics Co Ltd", "1234")
+
+
+@pytest.fixture
+def index():
+    return CompanyIndex([SAMSUNG, SAMSUNG_SDI, SAMSUNG_BIO, APPLE, APPLIED, SAMSUNG_US])
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("(주) 삼성 전자", "삼성전자"),
+        ("㈜삼성전자", "삼성전자"),
+        ("삼성전자 주식회사", "삼성전자"),
+        ("Apple Inc.", "apple"),
+        ("MICROSOFT CORP", "microsoft"),
+        ("Samsung Electronics Co., Ltd.", "samsungelectronics"),
+        ("Berkshire Hathaway Inc /DE/", "berkshirehathaway"),
+        ("ＡＢＣ－１", "abc1"),
+        ("", ""),
+    ],
+)
+def test_normalize(text, expected):
+    assert normalize(text) == expected
+
+
+def test_resolve_by_name_or_code(index):
+    assert index.resolve("삼성전자(주)") is SAMSUNG
+    assert index.resolve("005930") is SAMSUNG
+    assert index.resolve("aapl") is APPLE
+    assert index.resolve("Apple") is APPLE
+    assert index.resolve("삼성") is None
+
+
+def test_resolve_prefers_market_of_query_script():
+    kr = Company("KR", "111111", "Hanmi", "1")
+    us = Company("US", "HNMI", "Hanmi", "2")
+    index = CompanyIndex([kr, us])
+    assert index.resolve("Hanmi") is us
+    assert index.resolve("111111") is kr
+
+
+def test_suggest_ranks_exact_then_shorter_keys(index):
+    assert index.suggest("삼성") == [SAMSUNG, SAMSUNG_SDI, SAMSUNG_BIO]
+    assert index.suggest("삼성전자") == [SAMSUNG]
+    assert index.suggest("appl") == [APPLE, APPLIED]
+
+
+def test_suggest_filters_market_and_limit(index):
+    assert index.suggest("samsung", market="KR") == []
+    assert index.suggest("samsung", market="US") == [SAMSUNG_US]
+    assert len(index.suggest("삼성", limit=2)) == 2
+    assert index.suggest("  ") == []
+
+
+def test_suggest_scans_at_most_max_scan_keys(monkeypatch):
+    many = [Company("US", f"T{i:03d}", f"Test {i:03d}", str(i)) for i in range(20)]
+    monkeypatch.setattr(companies, "MAX_SCAN", 5)
+    index = CompanyIndex(many)
+    assert len(index.suggest("test", limit=50)) <= 5
+
+
+def test_get_index_rebuilds_only_when_sources_change(monkeypatch):
+    corp = SimpleNamespace(generation=1, entries=lambda: [
+        SimpleNamespace(stock_code="005930", corp_name="삼성전자", corp_code="00126380"),
+        SimpleNamespace(stock_code="", corp_name="비상장", corp_code="1"),
+    ])
+    tickers = SimpleNamespace(generation=1, entries=lambda: [SimpleNamespace(ticker="AAPL", name="Apple Inc.", cik="320193")])
+    monkeypatch.setattr(companies, "corp_index", corp)
+    monkeypatch.setattr(companies, "ticker_index", tickers)
+    monkeypatch.setattr(companies, "_state", {"index": None, "sources": None})
+
+    first = companies.get_index()
+    # 종목코드 없는 회사는 빠진다
+    assert len(first) == 2
+    assert companies.get_index() is first
+    tickers.generation = 2
+    assert companies.get_index() is not first
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+
+import pytest
+from conftest import read_fixture
+
+from app import http
+from app.services import dart_financials as fin
+from app.services.dart_corps import CorpEntry
+
+SAMSUNG = CorpEntry("00126380", "삼성전자", "005930", "20240101")
+JUNE_FY = CorpEntry("00999999", "6월결산", "123456", "20240101")
+
+
+def _multi() -> dict:
+    return json.loads(read_fixture("fnlttMultiAcnt_2024_11011.json"))
+
+
+def test_parse_multi_prefers_consolidated_and_reads_term_end():
+    # 응답 행에는 corp_code가 없어 종목코드로 회사를 찾는다
+    missing = CorpEntry("00000001", "응답없음", "000001", "20240101")
+    records = fin.parse_multi(_multi(), [SAMSUNG, JUNE_FY, missing])
+    samsung = records["00126380"]
+    # 연결(CFS)이 있으면 별도(OFS) 행은 쓰지 않는다
+    assert samsung["fs_div"] == "CFS"
+    assert samsung["revenue"] == 300_870_903_000_000
+    assert samsung["net_income"] == 34_451_351_000_000
+    assert samsung["end"] == "2024-12-31"
+    # 주요계정에 없는 계정(기타수익)은 버린다
+    assert set(samsung) == {
+        "fs_div", "currency", "end", "current_assets", "total_assets", "revenue", "operating_income", "net_income",
+    }
+
+    june = records["00999999"]
+    assert june["fs_div"] == "OFS"
+    assert june["equity"] is None and june["revenue"] == 12_345
+    assert june["end"] == "2024-06-30"
+    # 응답에 없는 회사도 빈 record로 채운다
+    assert records["00000001"] == {}
+
+
+def test_parse_multi_no_data_and_errors():
+    assert fin.parse_multi({"status": "013", "message": "조회된 데이타가 없습니다."}, [SAMSUNG]) == {"00126380": {}}
+    with pytest.raises(http.UpstreamError) as err:
+        fin.parse_multi({"status": "020", "message": "요청 제한을 초과하였습니다."}, [SAMSUNG])
+    assert "020" in str(err.value)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2024.12.31 현재", "2024-12-31"),
+        ("2023.07.01 ~ 2024.06.30", "2024-06-30"),
+        ("2024. 3. 1", "2024-03-01"),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_term_end(value, expected):
+    assert fin.term_end(value) == expected
+
+
+def test_parse_amount_and_resolve_report():
+    assert fin.parse_amount("-1,234") == -1234
+    assert fin.parse_amount("-") is None
+    assert fin.resolve_report("H1") == "11012"
+    assert fin.resolve_report("11014") == "11014"
+    with pytest.raises(ValueError):
+        fin.resolve_report("q4")
+
+
+def test_candidate_periods_skip_unfinished_quarters():
+    periods = fin.candidate_periods(date(2025, 8, 14), max_years=2, max_quarters=2)
+    assert periods == [
+        ("2024", "11011"), ("2023", "11011"), ("2022", "11011"),
+        ("2025", "11012"), ("2025", "11013"), ("2024", "11014"), ("2024", "11012"),
+    ]
+
+
+def test_build_table_orders_by_actual_end_and_marks_nominal_ends():
+    periods = [("2024", "11011"), ("2023", "11011"), ("2024", "11014")]
+    records = {
+        ("00126380", ("2024", "11011")): {"fs_div": "CFS", "currency": "KRW", "end": "2024-12-31", "revenue": 3},
+        ("00126380", ("2023", "11011")): {"fs_div": "CFS", "currency": "KRW", "revenue": 2},
+        ("00126380", ("2024", "11014")): {},
+        # 6월 결산: 2024 사업연도 3분기는 2024-03-31에 끝난다
+        ("00999999", ("2024", "11011")): {"fs_div": "OFS", "currency": "KRW", "end": "2024-06-30", "revenue": 9},
+        ("00999999", ("2024", "11014")): {"fs_div": "OFS", "currency": "KRW", "end": "2024-03-31", "revenue": 7},
+    }
+    table = fin.build_table([SAMSUNG, JUNE_FY], records, periods)
+
+    assert table["stock_code"] == ["005930", "005930", "123456", "123456"]
+    assert table["period"] == ["FY", "FY", "FY", "Q3"]
+    assert table["end"] == ["2024-12-31", "2023-12-31", "2024-06-30", "2024-03-31"]
+    assert table["end_nominal"] == [False, True, False, False]
+    assert table["revenue"] == [3, 2, 9, 7]
+    assert len({len(v) for v in table.values()}) == 1
+
+
+def test_comparison_table_aligns_columns_by_fiscal_period():
+    table = {
+        "stock_code": ["005930", "005930", "123456"],
+        "corp_name": ["삼성전자", "삼성전자", "6월결산"],
+        "period": ["FY", "Q3", "FY"],
+        "fiscal_year": [2024, 2024, 2023],
+        **{m: [None, None, None] for m in fin.METRICS},
+    }
+    table["revenue"] = [3, 1, 9]
+    rows = fin.comparison_table(table)
+    assert len(rows) == 2 * len(fin.METRICS)
+    revenue = [r for r in rows if r["account"] == "revenue"]
+    assert list(revenue[0]) == ["stock_code", "corp_name", "account", "FY2023", "FY2024", "2024Q3"]
+    assert [r["FY2024"] for r in revenue] == [3, None]
+    assert [r["FY2023"] for r in revenue] == [None, 9]
+
+
+def test_multi_request_sends_corp_codes():
+    params = fin._multi_params([SAMSUNG, JUNE_FY], ("2024", "11011"), "key")
+    assert params["corp_code"] == "00126380,00999999"
+    assert (params["bsns_year"], params["reprt_code"]) == ("2024", "11011")
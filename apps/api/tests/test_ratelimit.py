@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app import ratelimit
+from app.ratelimit import RateLimiter
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = _Clock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", c)
+    return c
+
+
+def test_burst_is_free_then_slots_are_spaced(clock):
+    lim = RateLimiter("t", rate=10, burst=3)
+    assert [lim.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # 빈 bucket에서는 예약 순서대로 1/rate씩 밀린다
+    assert [round(lim.reserve(), 6) for _ in range(3)] == [0.1, 0.2, 0.3]
+    s = lim.stats()
+    assert (s["requests"], s["throttled"], s["throttled_seconds"]) == (6, 3, 0.6)
+
+
+def test_tokens_refill_over_time_up_to_burst(clock):
+    lim = RateLimiter("t", rate=2, burst=2)
+    lim.reserve()
+    lim.reserve()
+    clock.now += 10
+    assert [lim.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert lim.reserve() == pytest.approx(0.5)
+
+
+def test_block_delays_every_reservation(clock):
+    lim = RateLimiter("t", rate=100, burst=5)
+    lim.block(30)
+    assert lim.reserve() == pytest.approx(30.01)
+    # 더 짧은 block은 기존 시각을 당기지 않는다
+    lim.block(5)
+    assert lim.reserve() == pytest.approx(30.02)
+    clock.now += 60
+    assert lim.reserve() == 0.0
+    assert lim.stats()["blocked_seconds"] == 30
+
+
+def test_requests_queued_behind_block_stay_spaced(clock):
+    lim = RateLimiter("t", rate=10, burst=10)
+    lim.block(2.0)
+    waits = [lim.reserve() for _ in range(12)]
+    # block이 풀려도 한꺼번에 나가지 않고 1/rate 간격을 지킨다
+    assert waits == pytest.approx([2.0 + 0.1 * i for i in range(1, 13)])
+
+
+def test_block_keeps_reservations_already_past_it(clock):
+    lim = RateLimiter("t", rate=1, burst=1)
+    assert [lim.reserve() for _ in range(4)] == [0.0, 1.0, 2.0, 3.0]
+    lim.block(1.0)
+    assert lim.reserve() == pytest.approx(4.0)
+
+
+def test_note_retry_counts_retry_after_separately():
+    lim = RateLimiter("t", rate=1)
+    lim.note_retry(False)
+    lim.note_retry(True)
+    s = lim.stats()
+    assert (s["retries"], s["retry_after"]) == (2, 1)
+
+
+def test_rate_and_burst_have_floors():
+    lim = RateLimiter("t", rate=0, burst=0)
+    assert (lim.rate, lim.burst) == (0.1, 1.0)
+
+
+def test_aacquire_sleeps_for_reserved_wait(monkeypatch):
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", fake_sleep)
+    lim = RateLimiter("t", rate=1000, burst=1)
+    lim.block(2)
+    asyncio.run(lim.aacquire())
+    assert slept and slept[0] == pytest.approx(2, abs=0.01)
+
+
+def test_shared_window_waits_until_next_second(monkeypatch):
+    counts = iter([6, 3])
+    monkeypatch.setattr(ratelimit.cache, "incr", lambda key, ttl: next(counts))
+    slept = []
+    monkeypatch.setattr(ratelimit.time, "sleep", slept.append)
+    lim = RateLimiter("t", rate=5, burst=1, shared=True)
+    lim.acquire()
+    # 가득 찬 창(6 > 5)에서 한 번 기다리고, 다음 창(3)에서는 바로 진행한다
+    assert len(slept) == 1 and 0 < slept[0] <= 1
+    assert lim.stats()["throttled"] == 1
+
+
+def test_shared_backend_down_falls_back_to_process_bucket(monkeypatch):
+    monkeypatch.setattr(ratelimit.cache, "incr", lambda key, ttl: None)
+    monkeypatch.setattr(ratelimit.time, "sleep", lambda s: pytest.fail("should not wait"))
+    RateLimiter("t", rate=5, burst=1, shared=True).acquire()
+
+
+def test_limiter_registry_reuses_first_configuration(monkeypatch):
+    monkeypatch.setattr(ratelimit, "_limiters", {})
+    first = ratelimit.limiter("sec", rate=10, burst=2)
+    assert ratelimit.limiter("sec", rate=1) is first
+    assert first.rate == 10
+    assert list(ratelimit.stats()) == ["sec"]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import os
+import zipfile
+
+import pytest
+from conftest import fixture_path
+
+from app.services import sec_bulk
+
+
+@pytest.fixture
+def submissions_zip(tmp_path):
+    """tests/fixtures/submissions/*.json을 submissions.zip 형태로 묶는다."""
+    path = tmp_path / "submissions.zip"
+    src = fixture_path("submissions")
+    with zipfile.ZipFile(path, "w") as zf:
+        for name in sorted(os.listdir(src)):
+            zf.write(os.path.join(src, name), name)
+        zf.writestr("README.txt", "not json")
+    return str(path)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # 버퍼 내보내기·블록 복사 경계를 fixture 크기에서도 여러 번 지나가게
+    monkeypatch.setattr(sec_bulk, "SPOOL_ROWS", 2)
+    monkeypatch.setattr(sec_bulk, "COPY_ROWS", 3)
+
+
+def test_build_store_sorts_by_cik_then_newest(tmp_path, submissions_zip, small_chunks):
+    out = str(tmp_path / "store")
+    meta = sec_bulk.build_store(submissions_zip, out)
+
+    # 빈 filingDate 행과 forms 밖의 행(4)은 빠진다
+    assert meta["rows"] == 7 and meta["ciks"] == 2
+    assert meta["forms"] == ["10-K", "10-Q", "8-K"]
+    store = sec_bulk.BulkStore(out)
+    assert len(store) == 7
+
+    apple = store.columns(320193)
+    assert apple["filingDate"] == ["2024-05-03", "2024-05-02", "2023-11-03", "2003-01-15", "1994-01-26"]
+    assert apple["form"] == ["10-Q", "8-K", "10-K", "10-K", "10-Q"]
+    assert apple["accessionNumber"][0] == "0000320193-24-000069"
+    assert apple["primaryDocument"] == [
+        "aapl-20240330.htm", "aapl-20240502.htm", "aapl-20230930.htm", "a2099999z10-k.htm", "",
+    ]
+    assert "missing-date.htm" not in apple["primaryDocument"]
+
+    # 같은 날짜는 적재 순서를 유지한다
+    msft = store.columns("0000789019")
+    assert msft["form"] == ["10-Q", "8-K"]
+    assert store.columns(1) == {"form": [], "filingDate": [], "accessionNumber": [], "primaryDocument": []}
+
+
+def test_build_store_keeps_tickers_and_sic(tmp_path, submissions_zip):
+    out = str(tmp_path / "store")
+    sec_bulk.build_store(submissions_zip, out)
+    store = sec_bulk.BulkStore(out)
+    assert store.cik_for_ticker("aapl") == "320193"
+    assert store.sic_for(320193) == 3571
+    assert store.sic_for(1) is None
+    assert store.ciks_with_sic(7372).tolist() == [789019]
+
+
+def test_build_store_replaces_previous_store_and_cleans_up(tmp_path, submissions_zip):
+    out = str(tmp_path / "store")
+    sec_bulk.build_store(submissions_zip, out, forms=["10-K"])
+    meta = sec_bulk.build_store(submissions_zip, out)
+    with open(os.path.join(out, "meta.json"), encoding="utf-8") as f:
+        assert json.load(f)["rows"] == meta["rows"] == 7
+    # 임시 디렉터리, 이전 저장소, 적재용 .raw 파일이 남지 않는다
+    assert sorted(os.listdir(tmp_path)) == ["store", "submissions.zip"]
+    assert not [name for name in os.listdir(out) if name.endswith(".raw")]
+
+
+def test_build_store_from_empty_zip(tmp_path):
+    empty = tmp_path / "empty.zip"
+    zipfile.ZipFile(empty, "w").close()
+    out = str(tmp_path / "store")
+    meta = sec_bulk.build_store(str(empty), out)
+    assert (meta["rows"], meta["ciks"]) == (0, 0)
+    assert len(sec_bulk.BulkStore(out)) == 0
+
+
+def test_parse_dates_turns_bad_values_into_nat():
+    dates = sec_bulk._parse_dates(["2024-05-01", "", "2024-13-45", None])
+    assert str(dates[0]) == "2024-05-01"
+    assert [str(d) for d in dates[1:]] == ["NaT", "NaT", "NaT"]
+
+
+def test_build_store_drops_malformed_accessions(tmp_path):
+    recent = {
+        "accessionNumber": ["0000320193-24-000069", "bad", None, "0000320193-24-00006X"],
+        "filingDate": ["2024-05-03", "2024-05-02", "2024-05-01", "2024-04-30"],
+        "form": ["10-Q", "8-K", "8-K", "8-K"],
+        "primaryDocument": ["a.htm", "b.htm", "c.htm", "d.htm"],
+    }
+    path = tmp_path / "submissions.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("CIK0000320193.json", json.dumps({"cik": "320193", "filings": {"recent": recent, "files": []}}))
+    out = str(tmp_path / "store")
+    assert sec_bulk.build_store(str(path), out)["rows"] == 1
+    assert sec_bulk.BulkStore(out).columns(320193)["primaryDocument"] == ["a.htm"]
+
+
+def test_accession_round_trip():
+    value = sec_bulk._accession_to_int("0000320193-24-000069")
+    assert sec_bulk._accession_from_int(value) == "0000320193-24-000069"
+    assert sec_bulk._accession_to_int("0000320193-24-69") is None
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from conftest import read_fixture
+
+from app.services import sec_daily
+from app.services.sec import _merge_feed_page
+
+
+def test_parse_master_index_keeps_wanted_forms_by_cik():
+    index = sec_daily.parse_master_index(read_fixture("master.20240501.idx"))
+    assert index == {
+        "320193": [["8-K", "2024-05-01", "0000320193-24-000062"]],
+        "789019": [["10-Q", "2024-05-01", "0000950170-24-048288"]],
+        "1018724": [
+            ["10-Q", "2024-05-01", "0001018724-24-000083"],
+            ["8-K", "2024-05-01", "0001018724-24-000081"],
+        ],
+    }
+
+
+def test_parse_master_index_custom_forms():
+    index = sec_daily.parse_master_index(read_fixture("master.20240501.idx"), forms=["4"])
+    assert index == {"320193": [["4", "2024-05-01", "0000320193-24-000061"]]}
+
+
+def test_master_index_url_uses_calendar_quarter():
+    assert sec_daily.master_index_url(dt.date(2024, 5, 1)).endswith("/2024/QTR2/master.20240501.idx")
+    assert "/2023/QTR4/" in sec_daily.master_index_url(dt.date(2023, 12, 29))
+
+
+def test_parse_current_feed_reads_entries_in_feed_order():
+    rows = sec_daily.parse_current_feed(read_fixture("current_8k.atom"))
+    assert [r[:4] for r in rows] == [
+        ("320193", "8-K", "2024-05-02", "0000320193-24-000065"),
+        ("12345", "8-K/A", "2024-05-02", "0000012345-24-000003"),
+        ("54321", "8-K", "2024-05-01", "0000054321-24-000010"),
+    ]
+    updated = dt.datetime.fromisoformat("2024-05-02T16:05:12-04:00").timestamp()
+    assert rows[0][4] == updated
+    assert rows[0][4] > rows[1][4] > rows[2][4]
+
+
+def test_window_days_spans_the_last_24_hours():
+    now = dt.datetime(2024, 5, 2, 3, 0, tzinfo=dt.timezone.utc)
+    assert sec_daily.window_days(now) == [dt.date(2024, 5, 1), dt.date(2024, 5, 2)]
+
+
+def test_feed_index_filters_days():
+    entries = {"acc-1": ["320193", "8-K", "2024-05-02"], "acc-0": ["320193", "8-K", "2024-04-29"]}
+    assert sec_daily.feed_index(entries, [dt.date(2024, 5, 2)]) == {"320193": [["8-K", "2024-05-02", "acc-1"]]}
+
+
+def test_records_for_dedupes_and_prefers_primary_document():
+    indexes = [
+        sec_daily.parse_master_index(read_fixture("master.20240501.idx")),
+        {"1018724": [["8-K", "2024-05-01", "0001018724-24-000081"]]},
+    ]
+    primaries = sec_daily.primary_documents(
+        {"accessionNumber": ["0001018724-24-000083", "0001018724-24-000081"], "primaryDocument": ["amzn-10q.htm", ""]}
+    )
+    records = sec_daily.records_for("0001018724", indexes, primaries)
+
+    assert [r["url"] for r in records] == [
+        "https://www.sec.gov/Archives/edgar/data/1018724/000101872424000083/amzn-10q.htm",
+        "https://www.sec.gov/Archives/edgar/data/1018724/000101872424000081/0001018724-24-000081-index.htm",
+    ]
+    assert all(r["index_url"].endswith("-index.htm") for r in records)
+    assert {r["published_date"] for r in records} == {"2024-05-01"}
+
+
+def test_merge_feed_page_first_refresh_stops_at_window_start():
+    entries: dict = {}
+    newest, more = _merge_feed_page(entries, read_fixture("current_8k.atom"), "8-K", 0.0, "2024-05-02")
+    # 8-K/A는 건너뛰고, 구간 시작일 이전 항목에서 멈춘다
+    assert entries == {"0000320193-24-000065": ["320193", "8-K", "2024-05-02"]}
+    assert newest == dt.datetime.fromisoformat("2024-05-02T16:05:12-04:00").timestamp()
+    assert more is False
+
+
+def test_merge_feed_page_stops_at_last_seen_update():
+    last_seen = dt.datetime.fromisoformat("2024-05-02T16:00:00-04:00").timestamp()
+    entries: dict = {}
+    newest, more = _merge_feed_page(entries, read_fixture("current_8k.atom"), "8-K", last_seen, "2024-05-01")
+    assert list(entries) == ["0000320193-24-000065"]
+    assert newest > last_seen
+    assert more is False
+
+
+def test_merge_feed_page_asks_for_more_when_page_is_full(monkeypatch):
+    monkeypatch.setattr(sec_daily, "FEED_PAGE_SIZE", 3)
+    entries: dict = {}
+    _, more = _merge_feed_page(entries, read_fixture("current_8k.atom"), "8-K", 0.0, "2024-05-01")
+    assert more is True
+    assert list(entries) == ["0000320193-24-000065", "0000054321-24-000010"]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+from conftest import fixture_path
+
+from app.services import sec_sections
+from app.services.sec_sections import _chunks, _Sectionizer, extract_sections, mark_unchanged
+
+
+def _extract(keep_text: bool = True) -> list[dict]:
+    with open(fixture_path("10k_small.htm"), "rb") as f:
+        return extract_sections(f, keep_text=keep_text)
+
+
+def test_extract_sections_skips_toc_and_hidden_blocks():
+    sections = _extract()
+    assert [s["key"] for s in sections] == ["I-1", "I-1A", "II-7"]
+    assert [s["title"] for s in sections] == ["Business", "Risk Factors", "Management’s Discussion and Analysis"]
+    business = sections[0]["chunks"][0]
+    assert business.startswith("Company Background\nThe Company designs")
+    risk = sections[1]["chunks"][0]
+    assert risk == "The Company’s business can be affected by global economic conditions."
+    # script / ix:header 안의 "Item ..."는 섹션이 되지 않는다
+    assert "Properties" not in str(sections) and "EntityRegistrantName" not in str(sections)
+
+
+def test_extract_sections_is_independent_of_read_chunk(monkeypatch):
+    expected = _extract()
+    monkeypatch.setattr(sec_sections, "READ_CHUNK", 7)
+    assert _extract() == expected
+
+
+def test_multibyte_characters_split_across_reads(monkeypatch):
+    monkeypatch.setattr(sec_sections, "READ_CHUNK", 1)
+    html = "<p>Item 7. 경영진 분석</p><p>매출이 증가했다.</p>".encode("utf-8")
+    sections = extract_sections(io.BytesIO(html), keep_text=True)
+    assert sections[0]["title"] == "경영진 분석"
+    assert sections[0]["chunks"] == ["매출이 증가했다."]
+
+
+def test_without_text_only_hashes_are_returned():
+    sections = _extract(keep_text=False)
+    assert all("chunks" not in s for s in sections)
+    with_text = {s["key"]: s["sha256"] for s in _extract()}
+    assert {s["key"]: s["sha256"] for s in sections} == with_text
+
+
+def test_sectionizer_keeps_longest_occurrence_and_part_prefix():
+    s = _Sectionizer(keep_text=True)
+    for line in [
+        "Item 1. Business",
+        "short",
+        "PART I",
+        "Item 1. Business 3",
+        "a much longer body line",
+        "second line",
+        "Item 2. Properties",
+        "HQ",
+    ]:
+        s.on_line(line)
+    sections = s.sections()
+    assert [x["key"] for x in sections] == ["1", "I-1", "I-2"]
+    assert sections[1]["title"] == "Business"
+    assert sections[1]["chunks"] == ["a much longer body line\nsecond line"]
+
+
+def test_sectionizer_ignores_long_lines_as_headings():
+    s = _Sectionizer(keep_text=True)
+    s.on_line("Item 1. Business")
+    s.on_line("Item 5 " + "x" * sec_sections.HEADING_MAX_CHARS)
+    assert [x["key"] for x in s.sections()] == ["1"]
+
+
+def test_hidden_void_element_does_not_hide_the_rest():
+    html = b'<p>Item 1. Business</p><br style="display:none"><img style="display: none" src="x.gif"><p>Visible body</p>'
+    sections = extract_sections(io.BytesIO(html), keep_text=True)
+    assert sections[0]["chunks"] == ["Visible body"]
+
+
+def test_same_text_has_same_hash_regardless_of_markup():
+    a = extract_sections(io.BytesIO(b"<p>Item 1. Business</p><p>Alpha   beta</p>"))
+    b = extract_sections(io.BytesIO(b"<div>Item 1. Business<br>Alpha <b>beta</b></div>"))
+    assert a[0]["sha256"] == b[0]["sha256"]
+
+
+@pytest.mark.parametrize(
+    "lines, size, expected",
+    [
+        (["aaa", "bbb", "ccc"], 8, ["aaa\nbbb", "ccc"]),
+        (["x" * 10], 4, ["xxxx", "xxxx", "xx"]),
+        (["a", "y" * 5], 4, ["a", "yyyy", "y"]),
+    ],
+)
+def test_chunks_split_on_line_boundaries(lines, size, expected):
+    assert _chunks(lines, size) == expected
+
+
+def test_mark_unchanged_compares_with_previous_filing():
+    filings = [
+        {"sections": [{"key": "I-1", "sha256": "a"}, {"key": "I-1A", "sha256": "new"}, {"key": "II-9", "sha256": "z"}]},
+        {"sections": [{"key": "I-1", "sha256": "a"}, {"key": "I-1A", "sha256": "old"}]},
+        {"error": "download failed"},
+    ]
+    cached = filings[0]["sections"][0]
+    mark_unchanged(filings)
+    assert [s["unchanged"] for s in filings[0]["sections"]] == [True, False, None]
+    assert [s["unchanged"] for s in filings[1]["sections"]] == [None, None]
+    assert "sections" not in filings[2]
+    # 캐시에서 꺼낸 dict는 건드리지 않는다
+    assert "unchanged" not in cached
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.singleflight import AsyncSingleFlight, SingleFlight, async_single_flight, single_flight
+
+
+def test_single_flight_runs_once_for_concurrent_callers():
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def fn():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", fn))) for _ in range(5)]
+    threads[0].start()
+    started.wait()
+    for t in threads[1:]:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == [1]
+    assert results == ["value"] * 5
+
+
+def test_single_flight_shares_errors_and_forgets_key():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def boom():
+        started.set()
+        release.wait()
+        raise ValueError("upstream")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("k", boom)
+        except ValueError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call)
+    follower.start()
+    time.sleep(0.02)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert errors == ["upstream", "upstream"]
+    # 끝난 키는 다시 실행된다
+    assert flight.do("k", lambda: 1) == 1
+
+
+def test_single_flight_decorator_normalizes_defaults():
+    calls = []
+    gate = threading.Event()
+
+    @single_flight
+    def fetch(ticker, daily_only=False):
+        calls.append((ticker, daily_only))
+        gate.wait()
+        return ticker
+
+    t1 = threading.Thread(target=fetch, args=("AAPL",))
+    t1.start()
+    time.sleep(0.02)
+    t2 = threading.Thread(target=fetch, args=("AAPL",), kwargs={"daily_only": False})
+    t2.start()
+    time.sleep(0.02)
+    gate.set()
+    t1.join()
+    t2.join()
+
+    assert calls == [("AAPL", False)]
+
+
+def test_async_single_flight_coalesces():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return 42
+
+    async def main():
+        return await asyncio.gather(*(flight.do("k", fn) for _ in range(4)))
+
+    assert asyncio.run(main()) == [42] * 4
+    assert calls == [1]
+
+
+def test_async_single_flight_survives_a_cancelled_waiter():
+    flight = AsyncSingleFlight()
+    finished = []
+
+    async def fn():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+        return "ok"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("k", fn))
+        second = asyncio.ensure_future(flight.do("k", fn))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # shield 덕분에 공유 Task는 계속 돌고 남은 대기자는 결과를 받는다
+        return await second
+
+    assert asyncio.run(main()) == "ok"
+    assert finished == [1]
+
+
+def test_async_single_flight_keeps_running_when_every_waiter_is_cancelled():
+    flight = AsyncSingleFlight()
+    finished = []
+
+    async def fn():
+        await asyncio.sleep(0.03)
+        finished.append(1)
+        return "late"
+
+    async def main():
+        waiter = asyncio.ensure_future(flight.do("k", fn))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0.05)
+        # 끝난 Task는 잊히므로 새 호출은 다시 실행된다
+        return await flight.do("k", fn)
+
+    assert asyncio.run(main()) == "late"
+    assert finished == [1, 1]
+
+
+def test_async_single_flight_shares_errors():
+    flight = AsyncSingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("nope")
+
+    async def main():
+        return await asyncio.gather(flight.do("k", boom), flight.do("k", boom), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+
+
+def test_async_single_flight_decorator():
+    calls = []
+
+    @async_single_flight
+    async def fetch(query, max_results=5):
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return query.upper()
+
+    async def main():
+        return await asyncio.gather(fetch("a"), fetch("a", max_results=5), fetch("b"))
+
+    assert asyncio.run(main()) == ["A", "A", "B"]
+    assert calls == ["a", "b"]
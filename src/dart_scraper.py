@@ -4,15 +4,22 @@
 종목번호(6자리)로 최근 5년 사업보고서 + 최근 4분기 분기/반기보고서 목록을 수집.
 """
 import io
+import json
 import os
 import re
 import sys
+import tempfile
+import threading
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from xml.etree import ElementTree as ET
 
 import requests
 
+from src.utils import write_atomic
+
 DART_API_KEY = os.getenv("DART_API_KEY")
 if not DART_API_KEY:
     raise ValueError("DART_API_KEY 환경변수가 설정되지 않았습니다.")
@@ -25,65 +32,151 @@ if _root not in sys.path:
 DART_LIST_URL = "https://opendart.fss.or.kr/api/list.json"
 DART_CORPCODE_URL = "https://opendart.fss.or.kr/api/corpCode.xml"
 DART_VIEW_URL = "https://dart.fss.or.kr/dsaf001/main.do?rcpNo={rcp_no}"
+# corpCode 인덱스 갱신 주기(초)와 디스크 사본 경로 (API의 app.services.dart_corps와 같은 파일 형식/기본 경로)
+CORPS_REFRESH_SECONDS = float(os.getenv("DART_CORPS_REFRESH_SECONDS") or 24 * 60 * 60)
+CORPS_PATH = os.getenv("DART_CORPS_PATH") or os.path.join(tempfile.gettempdir(), "ac-research-dart-corps.json")
+CORPS_RETRY_SECONDS = 60
 
 # 사업보고서(연간), 반기/1·3분기(분기)
 ANNUAL_KEYWORDS = ("사업보고서",)
 QUARTERLY_KEYWORDS = ("반기보고서", "1분기보고서", "3분기보고서")
+# 공시목록 조회 창: (공시 상세유형, 기간(일)). 사업보고서 5년, 반기/분기 최근 4건이 들어갈 2년
+LIST_WINDOWS = (("A001", 365 * 5), ("A002", 365 * 2), ("A003", 365 * 2))
+LIST_WORKERS = 4
+
+# stock_code -> (corp_code, 회사명). 프로세스 단위로 한 번 받아 두고 O(1) 조회
+_corps_by_stock: dict[str, tuple[str, str]] = {}
+_corps_state: dict = {"rows": [], "checked_at": 0.0, "disk_loaded": False}
+_corps_lock = threading.Lock()
+
+
+def _set_corps(rows: list) -> None:
+    global _corps_by_stock
+    _corps_by_stock = {sc: (cc, name) for cc, name, sc, _ in rows if sc}
+    _corps_state["rows"] = rows
+
+
+def _load_corps_disk() -> None:
+    _corps_state["disk_loaded"] = True
+    if not CORPS_PATH or CORPS_PATH == "off":
+        return
+    try:
+        with open(CORPS_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+        _set_corps(data["rows"])
+        _corps_state["checked_at"] = float(data.get("checked_at") or 0)
+    except (OSError, ValueError, KeyError, TypeError):
+        return
+
+
+def _save_corps_disk() -> None:
+    if not CORPS_PATH or CORPS_PATH == "off":
+        return
+    data = {"checked_at": _corps_state["checked_at"], "rows": [list(r) for r in _corps_state["rows"]]}
+    try:
+        write_atomic(CORPS_PATH, json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    except OSError:
+        return
+
+
+def _parse_corp_zip(content: bytes) -> list:
+    """corpCode.xml zip -> [(corp_code, corp_name, stock_code, modify_date)]. iterparse로 <list>마다 읽고 버린다."""
+    rows = []
+    with zipfile.ZipFile(io.BytesIO(content), "r") as z:
+        names = z.namelist()
+        xml_name = next((n for n in names if n.lower().endswith(".xml")), names[0])
+        with z.open(xml_name) as f:
+            for _, elem in ET.iterparse(f, events=("end",)):
+                if elem.tag != "list":
+                    continue
+                corp_code = (elem.findtext("corp_code") or "").strip()
+                if corp_code:
+                    rows.append((
+                        corp_code,
+                        (elem.findtext("corp_name") or "").strip(),
+                        (elem.findtext("stock_code") or "").strip(),
+                        (elem.findtext("modify_date") or "").strip(),
+                    ))
+                elem.clear()
+    return rows
+
+
+def _refresh_corps() -> None:
+    """
+    corpCode 인덱스가 비었거나 CORPS_REFRESH_SECONDS가 지났을 때만 zip을 다시 받는다.
+    실패해도 기존 인덱스가 있으면 그대로 쓴다.
+    """
+    with _corps_lock:
+        if not _corps_state["disk_loaded"]:
+            _load_corps_disk()
+        if _corps_by_stock and time.time() - _corps_state["checked_at"] < CORPS_REFRESH_SECONDS:
+            return
+        try:
+            resp = requests.get(DART_CORPCODE_URL, params={"crtfc_key": DART_API_KEY}, timeout=60)
+            resp.raise_for_status()
+            _set_corps(_parse_corp_zip(resp.content))
+            _corps_state["checked_at"] = time.time()
+            _save_corps_disk()
+        except (requests.RequestException, ValueError, zipfile.BadZipFile, ET.ParseError):
+            if not _corps_by_stock:
+                raise
+            _corps_state["checked_at"] = time.time() - CORPS_REFRESH_SECONDS + CORPS_RETRY_SECONDS
 
 
 def _get_corp_code_from_stock_code(stock_code: str) -> tuple[str, str]:
-    """종목번호(6자리) -> (corp_code 8자리, corp_name). corpCode ZIP 다운로드 후 XML 파싱."""
+    """종목번호(6자리) -> (corp_code 8자리, corp_name). 로컬 corpCode 인덱스에서 O(1) 조회."""
     code = re.sub(r"\D", "", stock_code)
     if len(code) < 6:
         raise ValueError(f"종목번호는 6자리 이상이어야 합니다: {stock_code}")
     code = code.zfill(6)
 
-    resp = requests.get(DART_CORPCODE_URL, params={"crtfc_key": DART_API_KEY}, timeout=60)
-    resp.raise_for_status()
-    with zipfile.ZipFile(io.BytesIO(resp.content), "r") as z:
-        names = z.namelist()
-        xml_name = next((n for n in names if n.lower().endswith(".xml")), names[0])
-        with z.open(xml_name) as f:
-            tree = ET.parse(f)
-    root = tree.getroot()
-    for c in root.findall(".//list"):
-        sc = (c.findtext("stock_code") or "").strip()
-        if sc == code:
-            corp_code = (c.findtext("corp_code") or "").strip()
-            corp_name = (c.findtext("corp_name") or "").strip()
-            return corp_code, corp_name
-    raise ValueError(f"종목번호에 해당하는 회사를 찾을 수 없습니다: {stock_code}")
-
-
-def _fetch_list(corp_code: str, bgn_de: str, end_de: str) -> list[dict]:
-    """공시목록 조회 (list.json)."""
-    all_items = []
-    page_no = 1
-    while True:
-        r = requests.get(
-            DART_LIST_URL,
-            params={
-                "crtfc_key": DART_API_KEY,
-                "corp_code": corp_code,
-                "bgn_de": bgn_de,
-                "end_de": end_de,
-                "page_no": page_no,
-                "page_count": 100,
-            },
-            timeout=30,
-        )
-        r.raise_for_status()
-        data = r.json()
-        if data.get("status") != "000":
-            raise RuntimeError(data.get("message", "DART API 오류"))
-        lst = data.get("list") or []
-        if not lst:
-            break
-        all_items.extend(lst)
-        if len(lst) < 100:
-            break
-        page_no += 1
-    return all_items
+    _refresh_corps()
+    entry = _corps_by_stock.get(code)
+    if entry is None:
+        raise ValueError(f"종목번호에 해당하는 회사를 찾을 수 없습니다: {stock_code}")
+    return entry
+
+
+def _get_list_page(params: dict) -> tuple[list, int]:
+    """list.json 한 페이지 -> (항목, 전체 페이지 수). 조회 결과 없음(013)은 빈 목록."""
+    r = requests.get(DART_LIST_URL, params=params, timeout=30)
+    r.raise_for_status()
+    data = r.json()
+    if data.get("status") == "013":
+        return [], 0
+    if data.get("status") != "000":
+        raise RuntimeError(data.get("message", "DART API 오류"))
+    return data.get("list") or [], int(data.get("total_page") or 1)
+
+
+def _fetch_list(corp_code: str, end_date: datetime) -> list[dict]:
+    """
+    공시목록 조회 (list.json). LIST_WINDOWS의 상세유형별로 서버에서 걸러 받고,
+    창별 첫 페이지와 나머지 페이지를 각각 동시에 받는다.
+    """
+    end_de = end_date.strftime("%Y%m%d")
+    first_params = [
+        {
+            "crtfc_key": DART_API_KEY,
+            "corp_code": corp_code,
+            "bgn_de": (end_date - timedelta(days=days)).strftime("%Y%m%d"),
+            "end_de": end_de,
+            "pblntf_ty": detail_ty[0],
+            "pblntf_detail_ty": detail_ty,
+            "page_no": 1,
+            "page_count": 100,
+        }
+        for detail_ty, days in LIST_WINDOWS
+    ]
+    with ThreadPoolExecutor(max_workers=LIST_WORKERS) as pool:
+        firsts = list(pool.map(_get_list_page, first_params))
+        rest_params = [
+            {**params, "page_no": page_no}
+            for params, (_, total_page) in zip(first_params, firsts)
+            for page_no in range(2, total_page + 1)
+        ]
+        rest = list(pool.map(_get_list_page, rest_params))
+    return [item for items, _ in firsts + rest for item in items]
 
 
 def _parse_rcept_dt(dt_str: str) -> str:
@@ -100,11 +193,7 @@ def collect_dart_reports(stock_code: str) -> list[dict]:
     """
     corp_code, corp_name = _get_corp_code_from_stock_code(stock_code)
     end_date = datetime.now()
-    bgn_date = end_date - timedelta(days=365 * 5)
-    bgn_de = bgn_date.strftime("%Y%m%d")
-    end_de = end_date.strftime("%Y%m%d")
-
-    raw = _fetch_list(corp_code, bgn_de, end_de)
+    raw = _fetch_list(corp_code, end_date)
     results = []
 
     for item in raw:
@@ -3,31 +3,178 @@ SEC EDGAR 10-K 연간보고서 링크 수집.
 지난 5년간 10-K 원문 HTML 링크만 수집한다.
 """
 import datetime as dt
+import email.utils
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
 import requests
 
+from src.utils import write_atomic
+
 USER_AGENT = "Latilience Quant SEC scraper (contact: your-email@example.com)"
+COMPANY_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+# 티커 인덱스 갱신 주기(초)와 디스크 사본 경로 (API의 app.services.sec_tickers와 같은 파일 형식/기본 경로)
+TICKERS_REFRESH_SECONDS = float(os.getenv("SEC_TICKERS_REFRESH_SECONDS") or 24 * 60 * 60)
+TICKERS_PATH = os.getenv("SEC_TICKERS_PATH") or os.path.join(tempfile.gettempdir(), "ac-research-sec-tickers.json")
+TICKERS_RETRY_SECONDS = 60
+# SEC 공정 접근 한도(초당 10회)와 429/5xx 재시도. API(app.config)와 같은 환경변수를 쓴다
+SEC_MAX_REQUESTS_PER_SECOND = max(float(os.getenv("SEC_MAX_REQUESTS_PER_SECOND") or 10), 0.1)
+SEC_MAX_RETRIES = int(os.getenv("SEC_MAX_RETRIES") or 3)
+SEC_BACKOFF_BASE_SECONDS = float(os.getenv("SEC_BACKOFF_BASE_SECONDS") or 0.5)
+SEC_BACKOFF_MAX_SECONDS = float(os.getenv("SEC_BACKOFF_MAX_SECONDS") or 30)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# ticker -> (cik, 회사명). 프로세스 단위로 한 번 받아 두고 O(1) 조회
+_tickers: dict[str, tuple[str, str]] = {}
+_tickers_state: dict = {"etag": None, "last_modified": None, "checked_at": 0.0, "disk_loaded": False}
+_tickers_lock = threading.Lock()
+# 다음 요청을 보낼 수 있는 시각 (monotonic). 스레드가 여럿이어도 1/SEC_MAX_REQUESTS_PER_SECOND 간격을 지킨다
+_pace_lock = threading.Lock()
+_next_slot = 0.0
+
+
+def _pace() -> None:
+    global _next_slot
+    with _pace_lock:
+        now = time.monotonic()
+        slot = max(now, _next_slot)
+        _next_slot = slot + 1 / SEC_MAX_REQUESTS_PER_SECOND
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def _block(seconds: float) -> None:
+    """429면 이후 모든 요청을 seconds 뒤로 미룬다."""
+    global _next_slot
+    with _pace_lock:
+        _next_slot = max(_next_slot, time.monotonic() + seconds)
+
 
+def _retry_delay(attempt: int, headers) -> float:
+    """Retry-After(초 또는 HTTP-date)가 있으면 그 값, 없으면 jitter를 준 지수 backoff."""
+    value = (headers or {}).get("Retry-After")
+    if value:
+        try:
+            return min(max(0.0, float(value)), SEC_BACKOFF_MAX_SECONDS)
+        except ValueError:
+            try:
+                seconds = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+                return min(max(0.0, seconds), SEC_BACKOFF_MAX_SECONDS)
+            except (TypeError, ValueError):
+                pass
+    delay = min(SEC_BACKOFF_MAX_SECONDS, SEC_BACKOFF_BASE_SECONDS * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
 
-def _sec_get(url: str, host: str = "www.sec.gov") -> requests.Response:
+
+def _sec_get(url: str, host: str = "www.sec.gov", extra_headers: dict | None = None) -> requests.Response:
+    """요청마다 _pace로 간격을 두고, 429/5xx/연결 오류는 SEC_MAX_RETRIES번까지 backoff 후 재시도."""
     headers = {
         "User-Agent": USER_AGENT,
         "Accept-Encoding": "gzip, deflate",
         "Host": host,
+        **(extra_headers or {}),
     }
-    resp = requests.get(url, headers=headers, timeout=20)
-    resp.raise_for_status()
+    attempt = 0
+    while True:
+        _pace()
+        try:
+            resp = requests.get(url, headers=headers, timeout=20)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= SEC_MAX_RETRIES:
+                raise
+            delay = _retry_delay(attempt, None)
+        else:
+            if resp.status_code not in RETRY_STATUSES or attempt == SEC_MAX_RETRIES:
+                break
+            delay = _retry_delay(attempt, resp.headers)
+            if resp.status_code == 429:
+                _block(delay)
+        time.sleep(delay)
+        attempt += 1
+    if resp.status_code != 304:
+        resp.raise_for_status()
     return resp
 
 
+def _set_tickers(rows: list) -> None:
+    global _tickers
+    _tickers = {str(t).upper(): (str(int(cik)), name) for t, cik, name in rows}
+
+
+def _load_tickers_disk() -> None:
+    _tickers_state["disk_loaded"] = True
+    if not TICKERS_PATH or TICKERS_PATH == "off":
+        return
+    try:
+        with open(TICKERS_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+        _set_tickers(data["rows"])
+        _tickers_state.update(
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+            checked_at=float(data.get("checked_at") or 0),
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return
+
+
+def _save_tickers_disk() -> None:
+    if not TICKERS_PATH or TICKERS_PATH == "off":
+        return
+    data = {
+        "etag": _tickers_state["etag"],
+        "last_modified": _tickers_state["last_modified"],
+        "checked_at": _tickers_state["checked_at"],
+        "rows": [[t, cik, name] for t, (cik, name) in _tickers.items()],
+    }
+    try:
+        write_atomic(TICKERS_PATH, json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    except OSError:
+        return
+
+
+def _refresh_tickers() -> None:
+    """
+    company_tickers.json 인덱스가 비었거나 TICKERS_REFRESH_SECONDS가 지났을 때만
+    ETag/Last-Modified 조건부 GET으로 갱신. 실패해도 기존 인덱스가 있으면 그대로 쓴다.
+    """
+    with _tickers_lock:
+        if not _tickers_state["disk_loaded"]:
+            _load_tickers_disk()
+        if _tickers and time.time() - _tickers_state["checked_at"] < TICKERS_REFRESH_SECONDS:
+            return
+        conditional = {}
+        if _tickers and _tickers_state["etag"]:
+            conditional["If-None-Match"] = _tickers_state["etag"]
+        if _tickers and _tickers_state["last_modified"]:
+            conditional["If-Modified-Since"] = _tickers_state["last_modified"]
+        try:
+            resp = _sec_get(COMPANY_TICKERS_URL, host="www.sec.gov", extra_headers=conditional)
+            if resp.status_code != 304:
+                data = resp.json()
+                _set_tickers([(item["ticker"], item["cik_str"], item.get("title") or "") for item in data.values()])
+                _tickers_state.update(
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                )
+            _tickers_state["checked_at"] = time.time()
+            _save_tickers_disk()
+        except (requests.RequestException, ValueError):
+            if not _tickers:
+                raise
+            _tickers_state["checked_at"] = time.time() - TICKERS_REFRESH_SECONDS + TICKERS_RETRY_SECONDS
+
+
 def _get_cik_from_ticker(ticker: str) -> str:
-    url = "https://www.sec.gov/files/company_tickers.json"
-    resp = _sec_get(url, host="www.sec.gov")
-    data = resp.json()
-    t = ticker.upper()
-    for item in data.values():
-        if item["ticker"].upper() == t:
-            return str(item["cik_str"])
-    raise ValueError(f"CIK not found for ticker {ticker}")
+    _refresh_tickers()
+    entry = _tickers.get(ticker.strip().upper())
+    if entry is None:
+        raise ValueError(f"CIK not found for ticker {ticker}")
+    return entry[0]
 
 
 def _filing_records_from_recent(
@@ -66,24 +213,27 @@ def _filing_records_from_recent(
     return records
 
 
-def _get_recent_10k_filings(cik: str, years: int = 5) -> list[dict]:
-    """최근 years년 10-K만."""
+def _get_recent_filings_payload(cik: str) -> dict:
+    """submissions JSON의 filings.recent. 10-K/10-Q 선택에 같은 payload를 재사용한다."""
     padded_cik = cik.zfill(10)
     api_url = f"https://data.sec.gov/submissions/CIK{padded_cik}.json"
     resp = _sec_get(api_url, host="data.sec.gov")
     data = resp.json()
-    filings = data.get("filings", {}).get("recent", {})
+    return data.get("filings", {}).get("recent", {})
+
+
+def _get_recent_10k_filings(cik: str, years: int = 5, filings: dict | None = None) -> list[dict]:
+    """최근 years년 10-K만."""
+    if filings is None:
+        filings = _get_recent_filings_payload(cik)
     cutoff = dt.date.today() - dt.timedelta(days=365 * years)
     return _filing_records_from_recent(cik, filings, ["10-K"], cutoff, None)
 
 
-def _get_recent_10q_filings(cik: str, quarters: int = 4) -> list[dict]:
+def _get_recent_10q_filings(cik: str, quarters: int = 4, filings: dict | None = None) -> list[dict]:
     """최근 4분기 10-Q만."""
-    padded_cik = cik.zfill(10)
-    api_url = f"https://data.sec.gov/submissions/CIK{padded_cik}.json"
-    resp = _sec_get(api_url, host="data.sec.gov")
-    data = resp.json()
-    filings = data.get("filings", {}).get("recent", {})
+    if filings is None:
+        filings = _get_recent_filings_payload(cik)
     return _filing_records_from_recent(cik, filings, ["10-Q"], None, quarters)
 
 
@@ -94,7 +244,10 @@ def collect_sec_links(ticker: str) -> list[dict]:
     """
     t = ticker.upper()
     cik = _get_cik_from_ticker(ticker)
-    records = _get_recent_10k_filings(cik, years=5) + _get_recent_10q_filings(cik, quarters=4)
+    filings = _get_recent_filings_payload(cik)
+    records = _get_recent_10k_filings(cik, years=5, filings=filings) + _get_recent_10q_filings(
+        cik, quarters=4, filings=filings
+    )
     records.sort(key=lambda r: r["published_date"], reverse=True)
     for r in records:
         r["ticker"] = t
@@ -1,5 +1,6 @@
 import csv
 import os
+import threading
 
 
 def save_to_csv(rows: list[dict], path: str) -> None:
@@ -14,3 +15,22 @@ def save_to_csv(rows: list[dict], path: str) -> None:
         writer = csv.DictWriter(f, fieldnames=headers)
         writer.writeheader()
         writer.writerows(rows)
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Write data to path through a temp file + os.replace, so readers never see a partial file.
+    Same behaviour as apps/api app.utils.write_atomic (both write the shared SEC/DART index files).
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise